@@ -1,36 +1,49 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Union
 
-@dataclass
+@dataclass(frozen=True)
 class Scenario:
     name: str
     description: str
     coverage_m2: int
     image_path: str
+    # Log-distance RF model for wisizer.coverage: path-loss exponent and
+    # average wall/partition loss per metre of horizontal distance.
+    path_loss_exponent: float = 3.0
+    wall_loss_db_per_m: float = 0.8
 
 SCENARIOS: Dict[str, Scenario] = {
     "scenario_1": Scenario(
         name="Office 1",
         description="Open plan office",
         coverage_m2=240,
-        image_path="images/cenario_1.png"
+        image_path="images/cenario_1.png",
+        path_loss_exponent=3.0,
+        wall_loss_db_per_m=0.8
     ),
     "scenario_2": Scenario(
         name="Office 2",
         description=" Minimal walls",
         coverage_m2=180,
-        image_path="images/cenario_2.png"
+        image_path="images/cenario_2.png",
+        path_loss_exponent=3.0,
+        wall_loss_db_per_m=1.05
     ),
     "scenario_3": Scenario(
         name="Office 3",
         description=" Several rooms",
         coverage_m2=120,
-        image_path="images/cenario_3.png"
+        image_path="images/cenario_3.png",
+        path_loss_exponent=3.0,
+        wall_loss_db_per_m=1.6
     )
 }
 
-def get_scenario(scenario_type: str) -> Scenario:
+def get_scenario(scenario_type: Union[str, Scenario]) -> Scenario:
     """Retrieve scenario details based on the selected type.
     Returns the default scenario (scenario_1) if the key is not found.
+    A Scenario (e.g. one derived from a floor plan) is returned as is.
     """
+    if isinstance(scenario_type, Scenario):
+        return scenario_type
     return SCENARIOS.get(scenario_type, SCENARIOS["scenario_1"])
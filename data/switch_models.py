@@ -1,330 +1,27 @@
-SWITCH_MODELS = {
-    "Meraki MS130": {
-        "MS130-8P": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 8, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 120,
-            "Uplink": [
-                {"Ports": 2, "Speed": [1]}
-            ],
-            "Switching Capacity": 20,
-            "Stacking": "No",
-            "SKU": "MS130-8P-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-CMPT-xY", "Advanced": "LIC-MS130-CMPTA-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        },
-        "MS130-8X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 2, "Speed": [2.5]}, 
-                {"Ports": 6, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 120,
-            "Uplink": [
-                {"Ports": 2, "Speed": [10]}
-            ],
-            "Switching Capacity": 62,
-            "Stacking": "No",
-            "SKU": "MS130-8X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-CMPT-xY", "Advanced": "LIC-MS130-CMPTA-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        },
-        "MS130-12X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 4, "Speed": [2.5]}, 
-                {"Ports": 8, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 240,
-            "Uplink": [
-                {"Ports": 2, "Speed": [10]}
-            ],
-            "Switching Capacity": 76,
-            "Stacking": "No",
-            "SKU": "MS130-12X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-CMPT-xY", "Advanced": "LIC-MS130-CMPTA-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        },
-        "MS130-24P": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 24, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 370,
-            "Uplink": [
-                {"Ports": 4, "Speed": [1]}
-            ],
-            "Switching Capacity": 56,
-            "Stacking": "No",
-            "SKU": "MS130-24P-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-24-xY", "Advanced": "LIC-MS130-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        },
-        "MS130-24X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 6, "Speed": [2.5]}, 
-                {"Ports": 18, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 370,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 146,
-            "Stacking": "No",
-            "SKU": "MS130-24X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-24-xY", "Advanced": "LIC-MS130-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        },
-        "MS130-48X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 8, "Speed": [2.5]}, 
-                {"Ports": 40, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 740,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 200,
-            "Stacking": "No",
-            "SKU": "MS130-48X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS130-48-xY", "Advanced": "LIC-MS130-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS130_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS130_Series_Installation_Guide"
-        }
-    },
-    "Meraki MS150": {
-        "MS150-24P-4X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 24, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 370,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 128,
-            "Stacking": "Physical",
-            "SKU": "MS150-24P-4X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS150-24-xY", "Advanced": "LIC-MS150-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS150_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS150_Series_Installation_Guide"
-        },
-        "MS150-48LP-4X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 48, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 370,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 176,
-            "Stacking": "Physical",
-            "SKU": "MS150-48LP-4X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS150-48-xY", "Advanced": "LIC-MS150-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS150_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS150_Series_Installation_Guide"
-        },
-        "MS150-48FP-4X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 48, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 740,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 176,
-            "Stacking": "Physical",
-            "SKU": "MS150-48FP-4X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS150-48-xY", "Advanced": "LIC-MS150-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS150_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS150_Series_Installation_Guide"
-        },
-        "MS150-24MP-4X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 8, "Speed": [5]},
-                {"Ports": 16, "Speed": [1]}
-            ],
-            "PoE Type": "UPoE",
-            "PoE Budget": 370,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 192,
-            "Stacking": "Physical",
-            "SKU": "MS150-24MP-4X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS150-24-xY", "Advanced": "LIC-MS150-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS150_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS150_Series_Installation_Guide"
-        },
-        "MS150-48MP-4X": {
-            "Type": "L2",
-            "Access": [
-                {"Ports": 16, "Speed": [5]},
-                {"Ports": 32, "Speed": [1]}
-            ],
-            "PoE Type": "UPoE",
-            "PoE Budget": 740,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 304,
-            "Stacking": "Physical",
-            "SKU": "MS150-48MP-4X-HW",
-            "License": [
-                {"Enterprise": "LIC-MS150-48-xY", "Advanced": "LIC-MS150-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/MS150_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/MS150_Series_Installation_Guide"
-        },
-    },
-    "Cisco Catalyst C9300L-M": {
-        "C9300L-24P-4X": {
-            "Type": "L3",
-            "Access": [
-                {"Ports": 24, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 505,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 128,
-            "Stacking": "Physical",
-            "SKU": "C9300L-24P-4X-M",
-            "License": [
-                {"Enterprise": "LIC-C9300-24E-xY", "Advanced": "LIC-C9300-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/Catalyst_9300L-M_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/Catalyst_9300-M_Series_Installation_Guide"
-        },
-        "C9300L-24UXG-4X": {
-            "Type": "L3",
-            "Access": [
-                {"Ports": 8, "Speed": [1, 2.5, 5, 10]}, 
-                {"Ports": 16, "Speed": [1]}
-            ],
-            "PoE Type": "UPoE",
-            "PoE Budget": 880,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 272,
-            "Stacking": "Physical",
-            "SKU": "C9300L-24UXG-4X-M",
-            "License": [
-                {"Enterprise": "LIC-C9300-24E-xY", "Advanced": "LIC-C9300-24A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/Catalyst_9300L-M_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/Catalyst_9300-M_Series_Installation_Guide"
-        },
-        "C9300L-48P-4X": {
-            "Type": "L3",
-            "Access": [
-                {"Ports": 48, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 505,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 176,
-            "Stacking": "Physical",
-            "SKU": "C9300L-48P-4X-M",
-            "License": [
-                {"Enterprise": "LIC-C9300-48E-xY", "Advanced": "LIC-C9300-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/Catalyst_9300L-M_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/Catalyst_9300-M_Series_Installation_Guide"
-        },
-        "C9300L-48PF-4X": {
-            "Type": "L3",
-            "Access": [
-                {"Ports": 48, "Speed": [1]}
-            ],
-            "PoE Type": "PoE+",
-            "PoE Budget": 890,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 176,
-            "Stacking": "Physical",
-            "SKU": "C9300L-48PF-4X-M",
-            "License": [
-                {"Enterprise": "LIC-C9300-48E-xY", "Advanced": "LIC-C9300-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/Catalyst_9300L-M_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/Catalyst_9300-M_Series_Installation_Guide"
-        },
-        "C9300L-48UXG-4X": {
-            "Type": "L3",
-            "Access": [
-                {"Ports": 12, "Speed": [1, 2.5, 5, 10]}, 
-                {"Ports": 36, "Speed": [1]}
-            ],
-            "PoE Type": "UPoE",
-            "PoE Budget": 675,
-            "Uplink": [
-                {"Ports": 4, "Speed": [10]}
-            ],
-            "Switching Capacity": 392,
-            "Stacking": "Physical",
-            "SKU": "C9300L-48UXG-4X-M",
-            "License": [
-                {"Enterprise": "LIC-C9300-48E-xY", "Advanced": "LIC-C9300-48A-xY"}
-            ],
-            "Datasheet": "https://documentation.meraki.com/MS/MS_Overview_and_Specifications/Catalyst_9300L-M_Datasheet",
-            "Installation Guide": "https://documentation.meraki.com/MS/MS_Installation_Guides/Catalyst_9300-M_Series_Installation_Guide"
-        }
+from wisizer import catalog as _catalog
+from wisizer.catalog import current_catalog
+
+# The catalog itself lives in switch_models.json (or WISIZER_CATALOG_DIR); edit that file to add or change models.
+# SWITCH_MODELS, switch_index and SWITCH_MODELS_PATH are looked up on the live catalog at every access, so
+# they follow hot reloads. "from data.switch_models import SWITCH_MODELS" binds the version current at that
+# moment; read data.switch_models.SWITCH_MODELS (or current_catalog()) where a reload must be seen.
+
+def _index() -> dict:
+    return {
+        model: details
+        for family in current_catalog().switch_models.values()
+        for model, details in family.items()
     }
-}
 
-switch_index = {
-    model: details
-    for family in SWITCH_MODELS.values()
-    for model, details in family.items()
-}
+def __getattr__(name: str):
+    if name == "SWITCH_MODELS":
+        return current_catalog().switch_models
+    if name == "switch_index":
+        return _index()
+    if name == "SWITCH_MODELS_PATH":
+        return _catalog.STORE.switch_path
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_switch(model: str):
-    """Retrieve switch details using the pre-built index"""
-    return switch_index.get(model)
+    """Retrieve switch details from the current catalog"""
+    return _index().get(model)
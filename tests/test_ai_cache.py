@@ -0,0 +1,31 @@
+from wisizer.ai_cache import AICache
+from wisizer.prompt import build_ai_prompt
+
+PROMPT_INPUTS = dict(
+    wifi_generation="Wi-Fi 6", ap_model="MR36", switches_needed=1, switch_model="N/A", switch_type="",
+    uplink_ports=0, uplink_speed="", users=50, area=100.0, recommended_aps=2, total_high_speed_ports=0,
+    unused_ports=0, unused_high_speed_ports=0, total_poebudget=0, unused_power=0,
+)
+
+
+def test_key_follows_the_prompt_text(tmp_path, monkeypatch):
+    cache = AICache(str(tmp_path / "cache.sqlite3"), catalog_version="v1")
+    prompt = build_ai_prompt(**PROMPT_INPUTS)
+    assert cache.key(model="m", prompt=prompt) == cache.key(prompt=prompt, model="m")
+
+    monkeypatch.setattr("wisizer.prompt._INSTRUCTIONS", "Answer in one sentence.")
+    from wisizer.prompt import _prompt_prefix
+    _prompt_prefix.cache_clear()
+    try:
+        edited = build_ai_prompt(**PROMPT_INPUTS)
+    finally:
+        _prompt_prefix.cache_clear()
+    assert cache.key(model="m", prompt=edited) != cache.key(model="m", prompt=prompt)
+
+
+def test_put_then_get(tmp_path):
+    cache = AICache(str(tmp_path / "cache.sqlite3"), catalog_version="v1")
+    key = cache.key(model="m", prompt="p")
+    assert cache.get(key) is None
+    cache.put(key, "text")
+    assert cache.get(key) == "text"
@@ -0,0 +1,62 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from wisizer import api
+from wisizer.api import SizingHandler, SizingServer, size_sites
+from wisizer.cli import RESULT_FIELDS
+
+
+@pytest.fixture
+def server():
+    server = SizingServer(("127.0.0.1", 0), SizingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, path, payload):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    connection.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    status, body = response.status, json.loads(response.read())
+    connection.close()
+    return status, body
+
+
+def test_non_object_sites_get_the_full_result_schema():
+    result, = size_sites([42])
+    assert set(result) == set(RESULT_FIELDS) | {"bom", "mixed_switches"}
+    assert result["error"] == "not a JSON object"
+
+
+def test_infinite_area_is_a_422(server):
+    status, body = _post(server, "/v1/size", {"users": 10, "area": float("inf")})
+    assert status == 422
+    assert "finite" in body["error"]
+
+
+def test_unexpected_errors_are_answered_with_500(server, monkeypatch):
+    def broken(site):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "size_site", broken)
+    status, body = _post(server, "/v1/size", {"users": 10, "area": 100})
+    assert status == 500
+    assert body == {"error": "internal error"}
+
+
+def test_mixed_switches_cover_the_aps(server):
+    status, body = _post(server, "/v1/size", {"users": 300, "area": 2000, "wifi_generation": "Wi-Fi 7"})
+    assert status == 200
+    mixed = body["mixed_switches"]
+    assert mixed["switches_needed"] == sum(item["quantity"] for item in mixed["switches"])
+    assert mixed["switches_needed"] <= body["switches_needed"]
+    assert mixed["unused_ports"] >= 0
+
+    status, body = _post(server, "/v1/size", {"users": 300, "area": 2000, "include_switches": False})
+    assert body["mixed_switches"] is None
@@ -0,0 +1,86 @@
+import copy
+
+import numpy as np
+import pytest
+
+from wisizer import batch, engine
+from wisizer.batch import SCENARIO_KEYS, _codes, batch_tables, size_batch, size_switches_batch
+from wisizer.catalog import build_catalog, current_catalog
+from wisizer.engine import calculate_aps, calculate_switches
+
+
+def test_matches_the_scalar_engine():
+    rng = np.random.default_rng(7)
+    generations = batch_tables().generations
+    areas = rng.uniform(1, 5000, 500)
+    users = rng.integers(1, 2000, 500)
+    scenarios = rng.choice(SCENARIO_KEYS + ["bogus"], 500)
+    wifi = rng.choice(generations, 500)
+    result = size_batch(areas, users, scenarios, wifi)
+    switches = size_switches_batch(result.recommended_aps, result.model_index, result.tables)
+    for i in range(500):
+        aps, model, per_ap, uplink, info = calculate_aps(float(areas[i]), int(users[i]), scenarios[i], wifi[i])
+        assert (result.recommended_aps[i], result.ap_models[i], result.users_per_ap[i], result.ap_uplink[i]) == (
+            aps, model, per_ap, uplink)
+        option, needed, _, _ = calculate_switches(aps, info, uplink)
+        assert switches.switch_models[i] == (option[1] if option else "N/A")
+        assert switches.switches_needed[i] == (needed or 0)
+
+
+def test_codes_treat_out_of_range_integers_as_unknown():
+    keys = ["a", "b", "c"]
+    assert _codes([0, 2, 3, -1], keys, default=0).tolist() == [0, 2, 0, 0]
+    assert _codes(np.array(["c", "x"]), keys, default=1).tolist() == [2, 1]
+    with pytest.raises(KeyError):
+        _codes([3], keys)
+    with pytest.raises(KeyError):
+        _codes("x", keys)
+
+
+def test_tables_follow_catalog_reloads(monkeypatch):
+    monkeypatch.setattr(engine, "_sizing", engine._sizing)
+    monkeypatch.setattr(batch, "_tables", batch._tables)
+    before = batch_tables()
+    catalog = current_catalog()
+    ap_models = copy.deepcopy(catalog.ap_models)
+    generation = next(iter(ap_models))
+    model = next(iter(ap_models[generation]))
+    ap_models[generation][model]["Max Users"] = 9999
+    reloaded = build_catalog(ap_models, catalog.switch_models, catalog)
+    monkeypatch.setattr(engine, "current_catalog", lambda: reloaded)
+
+    after = batch_tables()
+    assert after is not before
+    assert after.max_users[after.model_keys.index((generation, model))] == 9999
+    assert batch_tables() is after
+
+
+@pytest.mark.parametrize("areas, users, message", [
+    ([100.0, float("nan")], [10, 10], "row 1: area must be a finite number"),
+    ([100.0, 0.0], [10, 10], "row 1: area must be positive"),
+    ([100.0, 100.0], [10, -3], "row 1: users must be positive"),
+    ([100.0, 100.0], [10.0, 10.5], "row 1: users must be a whole number"),
+    ([100.0, 100.0], [10.0, float("inf")], "row 1: users must be a finite number"),
+])
+def test_bad_rows_raise(areas, users, message):
+    with pytest.raises(ValueError, match=message):
+        size_batch(areas, users, "scenario_1", "Wi-Fi 6")
+
+
+def test_whole_float_users_match_integers():
+    as_float = size_batch([120.0, 900.0], [75.0, 300.0], "scenario_2", "Wi-Fi 7")
+    as_int = size_batch([120.0, 900.0], [75, 300], "scenario_2", "Wi-Fi 7")
+    assert as_float.recommended_aps.tolist() == as_int.recommended_aps.tolist()
+
+
+def test_models_without_capacity_raise(monkeypatch):
+    monkeypatch.setattr(engine, "_sizing", engine._sizing)
+    monkeypatch.setattr(batch, "_tables", batch._tables)
+    catalog = current_catalog()
+    ap_models = copy.deepcopy(catalog.ap_models)
+    for info in ap_models["Wi-Fi 6"].values():
+        info["Capacity"] = {"2.4GHz": 0, "5GHz": 0}
+    reloaded = build_catalog(ap_models, catalog.switch_models, catalog)
+    monkeypatch.setattr(engine, "current_catalog", lambda: reloaded)
+    with pytest.raises(ValueError, match="no 5/6 GHz capacity"):
+        size_batch([100.0], [10], "scenario_1", "Wi-Fi 6")
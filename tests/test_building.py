@@ -0,0 +1,101 @@
+import pytest
+
+from wisizer import building as building_module
+from wisizer.building import Building, DependencyGraph, Zone, design_ap
+from wisizer.engine import calculate_aps, current_sizing
+
+ZONES = [
+    Zone("Floor 1", "Open plan", 400, 60),
+    Zone("Floor 1", "Meeting rooms", 120, 30, "scenario_3"),
+    Zone("Floor 2", "Auditorium", 600, 350, "scenario_2", 4.0),
+]
+
+
+def _chain():
+    graph = DependencyGraph()
+    inputs = {"a": 1, "b": 10}
+    graph.define("a", lambda: inputs["a"])
+    graph.define("b", lambda: inputs["b"])
+    graph.define("sum", lambda: graph.get("a") + graph.get("b"), ("a", "b"))
+    graph.define("double", lambda: 2 * graph.get("sum"), ("sum",))
+    return graph, inputs
+
+
+def test_values_are_computed_once():
+    graph, _ = _chain()
+    assert graph.get("double") == 22
+    assert graph.evaluations == 4
+    assert graph.get("double") == 22
+    assert graph.evaluations == 4
+
+
+def test_invalidate_recomputes_only_downstream():
+    graph, inputs = _chain()
+    graph.get("double")
+    inputs["a"] = 5
+    graph.invalidate("a")
+    assert graph.get("double") == 30
+    assert graph.evaluations == 7  # a, sum and double; b is kept
+
+
+def test_redefine_drops_the_old_inputs():
+    graph, inputs = _chain()
+    graph.get("double")
+    graph.define("sum", lambda: graph.get("b"), ("b",))
+    assert graph.get("double") == 20
+    graph.invalidate("a")
+    evaluations = graph.evaluations
+    assert graph.get("double") == 20
+    assert graph.evaluations == evaluations
+
+
+def test_remove():
+    graph, _ = _chain()
+    graph.get("double")
+    graph.remove("sum")
+    assert "sum" not in graph
+    with pytest.raises(KeyError):
+        graph.get("double")
+
+
+def test_update_resizes_only_the_edited_zone(monkeypatch):
+    sized = []
+
+    def counting(area, users, scenario, *args, **kwargs):
+        sized.append((area, users, scenario))
+        return calculate_aps(area, users, scenario, *args, **kwargs)
+
+    monkeypatch.setattr(building_module, "calculate_aps", counting)
+    building = Building("Wi-Fi 6", zones=ZONES)
+    building.bom()
+    assert len(sized) == 3
+
+    sized.clear()
+    edited = ZONES[:2] + [Zone("Floor 2", "Auditorium", 600, 400, "scenario_2", 4.0)]
+    assert building.update(edited) == 1
+    building.bom()
+    assert sized == [(600, 400, "scenario_2")]
+    assert building.update(edited) == 0
+
+
+def test_totals_match_per_zone_sizing():
+    building = Building("Wi-Fi 7", zones=ZONES)
+    expected = [calculate_aps(zone.area, zone.users, zone.scenario, "Wi-Fi 7", zone.ceiling_height) for zone in ZONES]
+    totals = building.totals()
+    assert totals.recommended_aps == sum(result[0] for result in expected)
+    assert totals.users == sum(zone.users for zone in ZONES)
+    assert totals.zones == 3
+    assert building.floor_totals("Floor 1").recommended_aps == expected[0][0] + expected[1][0]
+    counts = {}
+    for aps, model, *_ in expected:
+        counts[model] = counts.get(model, 0) + aps
+    assert totals.ap_counts == counts
+
+
+def test_design_ap_is_the_most_demanding():
+    aps = current_sizing().catalog.aps["Wi-Fi 6E"]
+    # Port speed first (CW9166 needs 5 Gbps, CW9162 30 W at 2.5 Gbps), then PoE, then ports.
+    assert design_ap([aps["CW9162"], aps["CW9166"]]).name == "CW9166"
+    assert design_ap([aps["CW9166"], aps["CW9164"]]).name == "CW9166"
+    assert design_ap(aps.values()).name == "MR57"
+    assert design_ap([]) is None
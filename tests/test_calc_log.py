@@ -0,0 +1,48 @@
+import json
+import os
+import threading
+
+from wisizer.calc_log import CalculationLogger
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_log_does_not_touch_the_callers_entry(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    calc_log = CalculationLogger(path, flush_interval=0.05)
+    entry = {"users": 10}
+    calc_log.log(entry)
+    calc_log.close()
+    assert entry == {"users": 10}
+    assert _lines(path)[0]["users"] == 10 and "timestamp" in _lines(path)[0]
+
+
+def test_dropped_entries_are_counted_across_threads(tmp_path):
+    calc_log = CalculationLogger(str(tmp_path / "log.jsonl"), queue_size=1)
+    calc_log.close()  # stop the writer so the queue stays full
+    calc_log.log({})
+
+    def flood():
+        for _ in range(2000):
+            calc_log.log({})
+
+    threads = [threading.Thread(target=flood) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calc_log.dropped == 8000
+
+
+def test_no_backups_truncates_instead_of_growing(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    calc_log = CalculationLogger(path, max_bytes=200, backup_count=0, flush_interval=0.05)
+    for i in range(3):
+        calc_log._write([{"i": i, "pad": "x" * 150}])
+    calc_log.close()
+    assert os.path.getsize(path) < 400
+    assert [entry["i"] for entry in _lines(path)] == [2]
+    assert not os.path.exists(path + ".1")
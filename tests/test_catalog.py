@@ -0,0 +1,38 @@
+import json
+import os
+
+import data.ap_models
+import data.switch_models
+from wisizer import catalog
+from wisizer.catalog import AP_FILE, SWITCH_FILE, CatalogStore
+
+
+def _write(directory, ap_models, switch_models):
+    for name, payload in ((AP_FILE, ap_models), (SWITCH_FILE, switch_models)):
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+
+def test_compatibility_modules_follow_the_live_catalog(tmp_path, monkeypatch):
+    current = catalog.current_catalog()
+    ap_models = json.loads(json.dumps(current.ap_models))
+    switch_models = json.loads(json.dumps(current.switch_models))
+    _write(str(tmp_path), ap_models, switch_models)
+    store = CatalogStore(str(tmp_path), check_interval=0)
+    monkeypatch.setattr(catalog, "STORE", store)
+    assert data.ap_models.AP_MODELS_PATH == str(tmp_path / AP_FILE)
+    assert data.switch_models.SWITCH_MODELS_PATH == str(tmp_path / SWITCH_FILE)
+
+    generation = next(iter(ap_models))
+    model = next(iter(ap_models[generation]))
+    ap_models[generation][model]["SKU"] = "RELOADED-HW"
+    family = next(iter(switch_models))
+    switch = next(iter(switch_models[family]))
+    del switch_models[family][switch]
+    _write(str(tmp_path), ap_models, switch_models)
+    store.check()
+
+    assert data.ap_models.AP_MODELS[generation][model]["SKU"] == "RELOADED-HW"
+    assert data.ap_models.get_ap_model(model)["SKU"] == "RELOADED-HW"
+    assert switch not in data.switch_models.switch_index
+    assert data.switch_models.get_switch(switch) is None
@@ -0,0 +1,56 @@
+import numpy as np
+
+from wisizer.channels import _dsatur, _repair, plan_band, plan_channels
+
+
+def _graph(edges, n):
+    neighbours = [[] for _ in range(n)]
+    for a, b in edges:
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    return [np.array(sorted(near), dtype=np.intp) for near in neighbours]
+
+
+def _conflicts(neighbours, colour):
+    return sum(colour[i] == colour[j] for i, near in enumerate(neighbours) for j in near) // 2
+
+
+def test_dsatur_colours_a_wheel_without_conflicts():
+    # An odd cycle around a hub needs four colours.
+    neighbours = _graph([(i, (i + 1) % 5) for i in range(5)] + [(5, i) for i in range(5)], 6)
+    colour = _dsatur(neighbours, 4)
+    assert _conflicts(neighbours, colour) == 0
+    assert len(set(colour)) == 4
+
+
+def test_dsatur_spreads_isolated_aps_over_channels():
+    colour = _dsatur(_graph([], 6), 3)
+    assert sorted(colour) == [0, 0, 1, 1, 2, 2]
+
+
+def test_too_few_channels_leave_the_fewest_conflicts():
+    clique = _graph([(a, b) for a in range(4) for b in range(a + 1, 4)], 4)
+    colour = _dsatur(clique, 3)
+    _repair(clique, colour, 3)
+    assert _conflicts(clique, colour) == 1
+
+
+def test_repair_moves_aps_off_busy_channels():
+    path = _graph([(0, 1), (1, 2)], 3)
+    colour = [0, 0, 0]
+    _repair(path, colour, 2)
+    assert _conflicts(path, colour) == 0
+
+
+def test_plan_band_reports_co_channel_neighbours():
+    positions = np.array([(0.0, 0.0), (5.0, 0.0), (200.0, 0.0)])
+    plan = plan_band(positions, "5 GHz", 20, 20.0)
+    assert plan.channels[0] != plan.channels[1]
+    assert plan.co_channel == (0, 0, 0)
+    assert plan.conflicts == 0
+
+
+def test_no_aps_get_empty_plans():
+    plans = plan_channels([], "Wi-Fi 6E")
+    assert set(plans) == {"5 GHz", "6 GHz"}
+    assert all(plan.channels == () and plan.conflicts == 0 and plan.max_co_channel == 0 for plan in plans.values())
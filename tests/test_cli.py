@@ -0,0 +1,38 @@
+import io
+
+from wisizer.cli import RESULT_FIELDS, _read_rows, iter_sized, size_row
+
+
+def test_size_row_sizes_a_site():
+    result = size_row({"users": "10", "area": "100", "site": "HQ"})
+    assert result["error"] is None
+    assert result["site"] == "HQ"
+    assert result["recommended_aps"] >= 1
+
+
+def test_size_row_rejects_non_finite_numbers():
+    for row in ({"users": "10", "area": "inf"}, {"users": 10, "area": 1e999},
+                {"users": "nan", "area": "100"}, {"users": "10", "area": "100", "ceiling_height": "inf"}):
+        result = size_row(row)
+        assert "finite" in result["error"]
+        assert all(result[field] is None for field in RESULT_FIELDS if field != "error")
+
+
+def test_infinite_area_does_not_stop_the_batch():
+    rows = _read_rows(io.StringIO("users,area\n10,100\n10,inf\n10,200\n"), "csv")
+    errors = [row["error"] for row in iter_sized(rows)]
+    assert errors == [None, "area must be a finite number", None]
+
+
+def test_blank_include_switches_means_the_default():
+    rows = _read_rows(io.StringIO("users,area,scenario,wifi_generation,include_switches\n"
+                                  "10,100,scenario_2,Wi-Fi 7,\n10,100,scenario_2,Wi-Fi 7,no\n"), "csv")
+    blank, no = iter_sized(rows)
+    assert blank["switch_model"] is not None
+    assert no["switch_model"] is None
+    assert size_row({"users": 10, "area": 100, "include_switches": None})["switch_model"] is not None
+
+
+def test_fractional_users_are_rejected():
+    assert size_row({"users": "10.5", "area": "100"})["error"] == "users must be a whole number"
+    assert size_row({"users": 10.0, "area": 100})["error"] is None
@@ -0,0 +1,57 @@
+import itertools
+import random
+
+import numpy as np
+
+from wisizer.closets import Closet, _min_cost_assignment, assign_aps, cable_runs
+
+
+def _brute_force(runs, capacity):
+    """(most APs served, least cable for that many) over every assignment."""
+    best = None
+    for combo in itertools.product(*([-1] + near.tolist() for near, _ in runs)):
+        load = [0] * len(capacity)
+        served, cable = 0, 0.0
+        for closet, (near, run) in zip(combo, runs):
+            if closet < 0:
+                continue
+            load[closet] += 1
+            served += 1
+            cable += float(run[near == closet][0])
+        if all(l <= c for l, c in zip(load, capacity)):
+            key = (-served, round(cable, 6))
+            if best is None or key < best:
+                best = key
+    return best
+
+
+def test_assignment_matches_brute_force():
+    for seed in range(300):
+        rng = random.Random(seed)
+        aps, closets = rng.randint(1, 6), rng.randint(1, 3)
+        positions = [(rng.uniform(0, 150), rng.uniform(0, 60)) for _ in range(aps)]
+        spots = [Closet(str(i), rng.uniform(0, 150), rng.uniform(0, 60), max_aps=rng.choice([None, 1, 2]))
+                 for i in range(closets)]
+        assignment = assign_aps(positions, spots)
+        runs = cable_runs(np.array(positions), spots)
+        capacity = [c.max_aps if c.max_aps is not None else aps for c in spots]
+        got = (-(aps - len(assignment.unassigned)), round(assignment.total_run_m, 6))
+        assert got == _brute_force(runs, capacity), seed
+
+
+def test_full_closet_moves_an_ap_along():
+    # AP 0 can only reach closet 0, which AP 1 prefers; AP 1 has to take closet 1.
+    runs = [(np.array([0]), np.array([50.0])), (np.array([0, 1]), np.array([10.0, 20.0]))]
+    assert _min_cost_assignment(runs, [1, 1]) == [0, 1]
+
+
+def test_unreachable_aps_stay_unassigned():
+    assignment = assign_aps([(0, 0), (500, 0)], [Closet("IDF", 10, 0)])
+    assert assignment.closet_of == (0, -1)
+    assert assignment.run_m[1] == 0.0
+
+
+def test_no_aps_need_no_cable():
+    assignment = assign_aps([], [Closet("IDF", 0, 0)])
+    assert assignment.closet_of == () and assignment.total_run_m == 0
+    assert cable_runs([], [Closet("IDF", 0, 0)]) == []
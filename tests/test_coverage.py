@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from wisizer import coverage
+from wisizer.coverage import (
+    TARGET_RSSI_DBM, FloorGrid, best_lattice, coverage_fraction, required_aps, required_aps_for_grid, rssi_map,
+)
+
+
+def _linear_search(grid, ceiling_height, scenario_type):
+    for count in range(1, coverage.MAX_APS + 1):
+        if best_lattice(grid, count, ceiling_height, scenario_type)[1] >= coverage.COVERAGE_TARGET:
+            return count
+    return None
+
+
+def test_disc_coverage_matches_the_rssi_map():
+    rng = np.random.default_rng(0)
+    grid = FloorGrid.polygon([(0, 0), (40, 0), (40, 10), (12, 30), (0, 30)])
+    for scenario_type in ("scenario_1", "scenario_3"):
+        positions = rng.uniform(-5, 45, (6, 2)).astype(np.float32)
+        expected = np.count_nonzero(rssi_map(grid, positions, 3.0, scenario_type) >= TARGET_RSSI_DBM) / len(grid.cells)
+        assert coverage_fraction(grid, positions, 3.0, scenario_type) == expected
+
+
+@pytest.mark.parametrize("area, scenario_type, ceiling_height", [
+    (300, "scenario_1", 3.0), (1400, "scenario_3", 3.0), (1100, "scenario_3", 6.0), (4500, "scenario_2", 2.4),
+])
+def test_search_finds_the_fewest_aps(area, scenario_type, ceiling_height):
+    grid = FloorGrid.from_area(area)
+    assert required_aps_for_grid(grid, ceiling_height, scenario_type) == _linear_search(grid, ceiling_height, scenario_type)
+
+
+def test_sites_past_max_aps_get_a_clear_error(monkeypatch):
+    monkeypatch.setattr(coverage, "MAX_APS", 20)
+    coverage._required_aps.cache_clear()
+    try:
+        assert required_aps_for_grid(FloorGrid.from_area(20000), 3.0, "scenario_1") is None
+        with pytest.raises(ValueError, match="no layout of up to 20 APs"):
+            required_aps(20000, "scenario_1", 3.0)
+    finally:
+        coverage._required_aps.cache_clear()
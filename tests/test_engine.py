@@ -0,0 +1,128 @@
+import math
+from itertools import product
+
+import pytest
+
+from data.ap_models import AP_MODELS
+from data.scenarios import SCENARIOS, get_scenario
+from data.switch_models import SWITCH_MODELS
+from wisizer.engine import calculate_aps, calculate_switches
+
+# The app's sizing before it moved into wisizer.engine, minus the Streamlit calls.
+
+
+def baseline_calculate_aps(area, users, scenario_type, wifi_generation):
+    concurrency = 0.7
+    concurrent_users = users * concurrency
+    background_devices = concurrent_users * 2
+    throughput_per_user = 5
+    background_sync = 0.5
+
+    total_bandwidth = math.ceil((concurrent_users * throughput_per_user) + (background_devices * background_sync))
+
+    devices_5ghz = math.ceil((concurrent_users + background_devices) * 0.7)
+    coverage_m2 = get_scenario(scenario_type).coverage_m2
+
+    aps_coverage = math.ceil(area / coverage_m2)
+    users_ap = math.ceil(concurrent_users / aps_coverage)
+    candidates = []
+    for model, info in AP_MODELS[wifi_generation].items():
+        if aps_coverage > 5 and model == "MR28":
+            continue
+        max_users = info.get("Max Users", 0)
+        if max_users >= users_ap:
+            candidates.append((model, info, max_users))
+    if not candidates:
+        candidates = [(model, info, info.get("Max Users", 0)) for model, info in AP_MODELS[wifi_generation].items()
+                      if not (aps_coverage > 5 and model == "MR28")]
+        candidates.sort(key=lambda x: x[2], reverse=True)
+    else:
+        candidates.sort(key=lambda x: x[2])
+    selected_model, selected_info, selected_max_users = candidates[0]
+
+    capacity_24ghz = selected_info.get("Capacity", {}).get("2.4GHz", 0)
+    capacity_5ghz = selected_info.get("Capacity", {}).get("5GHz", 0)
+    capacity_6ghz = selected_info.get("Capacity", {}).get("6GHz", 0)
+    effective_capacity = capacity_5ghz + capacity_6ghz if capacity_6ghz > 0 else capacity_5ghz
+    factor = 0.35
+    aps_capacity = math.ceil(total_bandwidth / (effective_capacity * factor)) if effective_capacity > 0 else float('inf')
+    aps_density = math.ceil(devices_5ghz / selected_max_users)
+    recommended_aps = max(aps_coverage, aps_capacity, aps_density)
+    users_per_ap = math.ceil(users / recommended_aps)
+
+    ap_uplink = math.ceil(capacity_24ghz + capacity_5ghz + capacity_6ghz)
+    return recommended_aps, selected_model, users_per_ap, ap_uplink, selected_info
+
+
+def baseline_port_speed_above_capacity(ap_info, ap_uplink):
+    speeds = []
+    for item in ap_info.get("Port", []):
+        spd = item.get("Speed", [])
+        if isinstance(spd, list):
+            speeds.extend(spd)
+    if not speeds:
+        return 1
+    sorted_speeds = sorted(set(speeds))
+    for s in sorted_speeds:
+        if s > ap_uplink:
+            return s
+    return max(sorted_speeds)
+
+
+def baseline_calculate_switches(num_aps, ap_info, ap_uplink):
+    ap_power = ap_info.get("Power")
+    if not ap_power:
+        return None, None, None, None
+    ap_port_count = sum(item.get("Ports", 0) for item in ap_info.get("Port", []))
+    total_ap_connections = num_aps * ap_port_count
+    required_speed = baseline_port_speed_above_capacity(ap_info, ap_uplink=ap_uplink / 1000)
+    best_option = None
+    best_switches_needed = None
+    margin = 0.7
+    for family, switches in SWITCH_MODELS.items():
+        for model, info in switches.items():
+            effective_port_count = sum(group.get("Ports", 0) for group in info.get("Access", [])
+                                       if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed)
+            if effective_port_count <= 0:
+                continue
+            available_ports = math.floor(effective_port_count * margin)
+            poe_limit = math.floor((info.get("PoE Budget", 0) * margin) / ap_power)
+            available = min(available_ports, poe_limit)
+            if available <= 0:
+                continue
+            switches_needed = math.ceil(total_ap_connections / available)
+            if best_option is None or (best_switches_needed is not None and switches_needed < best_switches_needed):
+                best_option = (family, model, info)
+                best_switches_needed = switches_needed
+    if best_option is None:
+        return None, None, None, None
+    family, model, info = best_option
+    effective_port_count = sum(group.get("Ports", 0) for group in info.get("Access", [])
+                               if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed)
+    available_ports = math.floor(effective_port_count * margin)
+    poe_budget = info.get("PoE Budget", 0)
+    available = min(available_ports, math.floor((poe_budget * margin) / ap_power))
+    unused_ports = (available * best_switches_needed) - total_ap_connections
+    unused_power = best_switches_needed * (poe_budget * margin) - num_aps * ap_power
+    return best_option, best_switches_needed, unused_ports, unused_power
+
+
+AREAS = [1.0, 40.0, 99.5, 250.0, 1000.0, 1400.0, 3333.3, 12000.0]
+USERS = [1, 7, 30, 75, 200, 500, 1500, 5000]
+
+
+@pytest.mark.parametrize("scenario_type", list(SCENARIOS))
+@pytest.mark.parametrize("wifi_generation", list(AP_MODELS))
+def test_calculate_aps_matches_the_baseline(scenario_type, wifi_generation):
+    for area, users in product(AREAS, USERS):
+        assert calculate_aps(area, users, scenario_type, wifi_generation) == \
+            baseline_calculate_aps(area, users, scenario_type, wifi_generation), (area, users)
+
+
+@pytest.mark.parametrize("wifi_generation, ap_model",
+                         [(generation, model) for generation, models in AP_MODELS.items() for model in models])
+def test_calculate_switches_matches_the_baseline(wifi_generation, ap_model):
+    ap_info = AP_MODELS[wifi_generation][ap_model]
+    for num_aps, ap_uplink in product([0, 1, 2, 5, 13, 48, 100, 401], [500, 1200, 2600, 5000, 12000]):
+        assert calculate_switches(num_aps, ap_info, ap_uplink) == \
+            baseline_calculate_switches(num_aps, ap_info, ap_uplink), (num_aps, ap_uplink)
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from wisizer import floorplan
+from wisizer.coverage import FloorGrid, required_aps
+from wisizer.engine import calculate_aps
+from wisizer.floorplan import load_floor_plan, read_floor_plan
+
+
+def _l_shaped_plan(path):
+    """A 40 m x 40 m L: the top-right quarter is outside the walls, 5 cm per pixel."""
+    image = np.full((800, 800), 255, dtype=np.uint8)
+    image[:, :3] = 0
+    image[-3:, :] = 0
+    image[:3, :400] = 0
+    image[:400, 397:400] = 0
+    image[397:400, 400:] = 0
+    image[400:, -3:] = 0
+    Image.fromarray(image).save(path)
+
+
+def test_plan_grid_reaches_sizing(tmp_path):
+    path = str(tmp_path / "plan.png")
+    _l_shaped_plan(path)
+    plan = read_floor_plan(path, 40.0)
+    grid = plan.grid()
+    assert not grid.mask.all()
+    assert plan.area == pytest.approx(1200, rel=0.05)
+    aps = calculate_aps(plan.area, 50, plan.scenario, "Wi-Fi 6", 3.0, coverage="rf", floor=grid)[0]
+    assert aps == required_aps(plan.area, plan.scenario, 3.0, grid)
+
+
+def test_pillow_limit_is_left_alone(tmp_path):
+    default = Image.MAX_IMAGE_PIXELS
+    path = tmp_path / "huge.pgm"
+    path.write_bytes(b"P5 20000 10000 255\n")
+    with pytest.raises(ValueError, match="too large"):
+        read_floor_plan(str(path), 100.0)
+    assert Image.MAX_IMAGE_PIXELS == default
+
+
+def test_disk_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(floorplan, "_memory", floorplan.OrderedDict())
+    path = str(tmp_path / "plan.png")
+    _l_shaped_plan(path)
+    cache = str(tmp_path / "cache")
+    load_floor_plan(path, 40.0, directory=cache)
+    size = os.path.getsize(os.path.join(cache, os.listdir(cache)[0]))
+    monkeypatch.setattr(floorplan, "DISK_CACHE_BYTES", int(size * 2.5))
+    for width in (41.0, 42.0, 43.0):
+        load_floor_plan(path, width, directory=cache)
+    assert len(os.listdir(cache)) == 2
+    assert os.path.exists(os.path.join(cache, floorplan.plan_key(floorplan.content_hash(path), 43.0, 0.5) + ".npz"))
+
+
+def _saved(tmp_path, image, name, **options):
+    path = str(tmp_path / name)
+    image.save(path, **options)
+    return path
+
+
+@pytest.fixture
+def plan_image():
+    # Rows differ, so a strip read from the wrong place or upside down shows.
+    rng = np.random.default_rng(4)
+    grey = np.where(rng.random((120, 90)) < 0.1, 0, 255).astype(np.uint8)
+    grey[:, 40:43] = np.arange(120, dtype=np.uint8)[:, None]
+    return Image.fromarray(grey)
+
+
+@pytest.mark.parametrize("name, mode, options", [
+    ("plan.bmp", "L", {}),
+    ("plan_palette.bmp", "P", {}),
+    ("plan_rgb.bmp", "RGB", {}),
+    ("plan.pgm", "L", {}),
+    ("plan.tif", "L", {"compression": "raw"}),
+    ("plan.png", "L", {}),
+])
+def test_strips_decode_every_row(tmp_path, monkeypatch, plan_image, name, mode, options):
+    monkeypatch.setattr(floorplan, "STRIP_BYTES", 7 * 90)
+    if mode == "P":
+        # A coloured palette, so Pillow keeps the file paletted instead of reading it as greyscale.
+        grey = np.asarray(plan_image)
+        image = Image.fromarray(np.dstack((grey, grey // 2, grey))).quantize(16)
+    else:
+        image = plan_image.convert(mode)
+    path = _saved(tmp_path, image, name, **options)
+    expected = np.asarray(image.convert("L"))
+    with Image.open(path) as opened:
+        assert opened.mode == mode
+        strips = list(floorplan._strips(opened))
+    assert len(strips) > 1
+    assert [top for top, _ in strips] == list(np.cumsum([0] + [len(rows) for _, rows in strips[:-1]]))
+    assert np.array_equal(np.concatenate([rows for _, rows in strips]), expected)
+
+
+def test_formats_give_the_same_plan(tmp_path, monkeypatch):
+    monkeypatch.setattr(floorplan, "STRIP_BYTES", 4096)
+    path = str(tmp_path / "plan.png")
+    _l_shaped_plan(path)
+    reference = read_floor_plan(path, 40.0).attenuation
+    with Image.open(path) as image:
+        for name, options in (("plan.bmp", {}), ("plan.pgm", {}), ("plan.tif", {"compression": "raw"})):
+            copy = _saved(tmp_path, image, name, **options)
+            assert np.array_equal(read_floor_plan(copy, 40.0).attenuation, reference), name
+        jpeg = _saved(tmp_path, image, "plan.jpg", quality=95)
+    assert np.abs(read_floor_plan(jpeg, 40.0).attenuation - reference).max() < 1.0
@@ -0,0 +1,48 @@
+import threading
+from itertools import product
+
+from wisizer.engine import calculate_switches, current_sizing
+from wisizer.optimizer import _CoverTable, optimize_switches
+
+AP = current_sizing().catalog.aps["Wi-Fi 7"]["CW9172"]
+
+
+def test_zero_target_needs_no_switches():
+    assert _CoverTable((0, 0), (1.0, 1.0)).solve(0) == {}
+    assert _CoverTable((8, 24), (1.0, 2.0)).solve(0) == {}
+    plan = optimize_switches(0, AP, AP.uplink)
+    assert plan.items == () and plan.switches_needed == 0
+
+
+def test_cover_table_is_the_cheapest_multiset():
+    capacities, costs = (5, 12, 30), (3.0, 5.0, 11.0)
+    table = _CoverTable(capacities, costs)
+    for target in range(1, 70):
+        counts = table.solve(target)
+        best = min(
+            sum(q * c for q, c in zip(quantities, costs))
+            for quantities in product(range(15), range(7), range(4))
+            if sum(q * c for q, c in zip(quantities, capacities)) >= target
+        )
+        assert sum(costs[i] * q for i, q in counts.items()) == best
+
+
+def test_never_more_units_than_a_single_model():
+    for num_aps in (1, 20, 75, 300):
+        plan = optimize_switches(num_aps, AP, AP.uplink)
+        _, needed, _, _ = calculate_switches(num_aps, AP, AP.uplink)
+        assert plan.switches_needed <= needed
+        assert plan.unused_ports >= 0
+
+
+def test_concurrent_extends_match_a_serial_table():
+    capacities, costs = (5, 12, 30), (3.0, 5.0, 11.0)
+    serial = _CoverTable(capacities, costs)
+    serial.extend(5000)
+    shared = _CoverTable(capacities, costs)
+    threads = [threading.Thread(target=shared.solve, args=(target,)) for target in range(500, 5001, 500)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert shared.cost == serial.cost and shared.choice == serial.choice
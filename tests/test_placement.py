@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from wisizer.coverage import FloorGrid, best_lattice, coverage_fraction
+from wisizer.engine import calculate_aps
+from wisizer.placement import SpatialHash, place_aps, suggest_positions
+
+L_SHAPE = [(0, 0), (60, 0), (60, 20), (20, 20), (20, 50), (0, 50)]
+
+
+def test_spatial_hash_matches_brute_force():
+    rng = np.random.default_rng(5)
+    points = rng.uniform(-30, 70, (2000, 2))
+    index = SpatialHash(points, 7.5)
+    for x, y, radius in zip(rng.uniform(-50, 90, 200), rng.uniform(-50, 90, 200), rng.uniform(0, 25, 200)):
+        expected = np.flatnonzero((points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2 <= radius * radius)
+        assert np.array_equal(np.sort(index.query(x, y, radius)), expected)
+
+
+@pytest.mark.parametrize("grid", [FloorGrid.rectangle(60, 40), FloorGrid.polygon(L_SHAPE)], ids=["rectangle", "L"])
+@pytest.mark.parametrize("count", [2, 5, 9])
+def test_placement_beats_the_lattice_inside_the_floor(grid, count):
+    placement = place_aps(grid, count, 3.0, "scenario_3")
+    _, lattice = best_lattice(grid, count, 3.0, "scenario_3")
+    assert placement.coverage >= lattice
+    assert placement.coverage == coverage_fraction(grid, placement.positions, 3.0, "scenario_3")
+    assert len(placement.positions) == count
+    assert all(grid.contains(x, y) for x, y in placement.positions)
+
+
+def test_count_below_one_raises():
+    with pytest.raises(ValueError, match="at least 1"):
+        place_aps(FloorGrid.rectangle(20, 10), 0, 3.0, "scenario_1")
+
+
+def test_suggest_positions_places_the_sized_count():
+    placement = suggest_positions(120, "scenario_2", "Wi-Fi 6", area=800)
+    assert len(placement.positions) == calculate_aps(FloorGrid.from_area(800).area, 120, "scenario_2", "Wi-Fi 6")[0]
+    with pytest.raises(ValueError, match="area or vertices"):
+        suggest_positions(120, "scenario_2", "Wi-Fi 6")
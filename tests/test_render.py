@@ -0,0 +1,232 @@
+from itertools import product
+
+import pytest
+
+from data.ap_models import AP_MODELS
+from data.switch_models import SWITCH_MODELS
+from wisizer import render
+
+GLOBAL_BG_COLOR = "#F4F4F4"
+GLOBAL_TEXT_COLOR = "#27AE60"
+
+# The app's card markup before it was cached, as the strings it passed to st.markdown.
+
+
+def baseline_result_card(title, content_html, bg_color=GLOBAL_BG_COLOR):
+    return f"""
+    <div style="background-color: {bg_color}; padding: 20px; border-radius: 10px; margin-top: 20px">
+        <h2 style="color: {GLOBAL_TEXT_COLOR}; text-align: center;">{title}</h2>
+        {content_html}
+    </div>
+    """
+
+
+def baseline_ap_details(ap_info, ap_model):
+    ports = sum(item.get("Ports", 0) for item in ap_info.get("Port", []))
+    port_speed_list = []
+    for item in ap_info.get("Port", []):
+        speeds = item.get("Speed", [])
+        if speeds:
+            port_speed_list.extend(speeds)
+    speeds_str = "/".join(str(s) for s in port_speed_list) if port_speed_list else "N/A"
+    port_speeds_text = f"{ports} x {speeds_str} Gbps" if speeds_str != "N/A" else "N/A"
+    ap_table = f"""
+    <table style="width: 100%; border-collapse: collapse;">
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Antenna Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">Omnidirectional Indoor</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Wi-Fi Standard:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('Wi-Fi Standard')}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Spatial Streams:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('Spatial Streams')}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('PoE Type')}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Port Speed:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{port_speeds_text}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('SKU')}</td>
+      </tr>
+    </table>
+    <div style="text-align: center; margin-top: 20px;">
+        <a href="{ap_info.get('Datasheet')}" target="_blank" style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">Datasheet</a>
+        <a href="{ap_info.get('Installation Guide')}" target="_blank" style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Installation Guide</a>
+    </div>
+    """
+    return baseline_result_card(f"Recommended AP Model: <u>{ap_model}</u>", ap_table)
+
+
+def baseline_format_port_config(switch_info):
+    group_strings = []
+    for group in switch_info.get("Access", []):
+        ports = group.get("Ports")
+        speeds = group.get("Speed", [])
+        if ports is not None and speeds:
+            speeds_str = "/".join(str(s) for s in speeds)
+            group_strings.append(f"{ports} x {speeds_str} Gbps")
+    return " + ".join(group_strings)
+
+
+def baseline_switch_details(switch_option, switches_needed):
+    family, switch_model, switch_info = switch_option
+    port_config = baseline_format_port_config(switch_info)
+    uplink_list = switch_info.get("Uplink", [])
+    if uplink_list:
+        uplink_ports = sum(item.get("Ports", 0) for item in uplink_list)
+        uplink_speed = " / ".join("/".join(str(s) for s in item.get("Speed", [])) for item in uplink_list)
+    else:
+        uplink_ports = 0
+        uplink_speed = "N/A"
+    unit_str = "unit" if switches_needed == 1 else "units"
+    switch_table = f"""
+    <table style="width: 100%; border-collapse: collapse;">
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Access Ports:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{port_config}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Uplinks:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{uplink_ports} x {uplink_speed} Gbps</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('PoE Type')}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Budget:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('PoE Budget', 0)} W</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('SKU')}</td>
+      </tr>
+    </table>
+    <div style="text-align: center; margin-top: 20px;">
+        <a href="{switch_info.get('Datasheet')}" target="_blank" 
+           style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">
+           Datasheet
+        </a>
+        <a href="{switch_info.get('Installation Guide')}" target="_blank" 
+           style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
+           Installation Guide
+        </a>
+    </div>
+    """
+    details = f"""
+    <div style="margin-bottom: 20px;">
+      <p style="font-size: 20px; text-align: center;">
+        Based on your AP requirements, you will need <strong>{switches_needed}</strong> {unit_str}.
+      </p>
+    </div>
+    """
+    content = details + switch_table
+    return baseline_result_card(f"Recommended Access Switch: <u>{switch_model}</u>", content)
+
+
+def baseline_bom(recommended_aps, ap_info, switch_option, switches_needed):
+    ap_sku = ap_info.get("SKU", "N/A")
+    ap_line = f"""<tr style="text-align:center;">
+<td style="padding: 10px;">Access Point</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{recommended_aps}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{ap_sku}</td>
+</tr>"""
+    ap_license_line = ""
+    ap_license_list = ap_info.get("License", [])
+    if ap_license_list:
+        ap_license_options = ap_license_list[0]
+        ap_license_str = f"{ap_license_options.get('Enterprise','')} <i>or</i> {ap_license_options.get('Advanced','')}"
+        ap_license_line = f"""<tr style="text-align:center;">
+<td style="padding: 10px;">AP License</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{recommended_aps}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{ap_license_str}*</td>
+</tr>"""
+    switch_line = ""
+    switch_license_line = ""
+    if switch_option is not None:
+        _, switch_model, switch_info = switch_option
+        switch_sku = switch_info.get("SKU", "N/A")
+        switch_line = f"""<tr style="text-align:center;">
+<td style="padding: 10px;">PoE Access Switch</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{switches_needed}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{switch_sku}</td>
+</tr>"""
+        switch_license_list = switch_info.get("License", [])
+        if switch_license_list:
+            switch_license_options = switch_license_list[0]
+            switch_license_str = f"{switch_license_options.get('Enterprise','')} <i>or</i> {switch_license_options.get('Advanced','')}"
+            switch_license_line = f"""<tr style="text-align:center;">
+<td style="padding: 10px;">Switch License</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{switches_needed}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{switch_license_str}*</td>
+</tr>"""
+    bom_html = (
+f"""<table style="width: 100%; border-collapse: collapse;">
+<tr style="text-align:center;">
+<th style="padding: 10px;">Item</th>
+<th style="padding: 10px; border-left: 1px solid #ccc;">Quantity</th>
+<th style="padding: 10px; border-left: 1px solid #ccc;">Part Number</th>
+</tr>
+{ap_line}
+{ap_license_line}
+{switch_line}
+{switch_license_line}
+</table>
+<div style="text-align: center; margin-top: 10px; margin-bottom: 30px;">
+  <p style="font-size: 0.9rem; color: #555;">
+    *Choose the most appropriate license tier and duration (x = 1, 3, 5, 7, 10 years).<br>
+    <u>Ensure that all hardware is certified and approved for use at your location!</u>
+  </p>
+</div>
+<div style="text-align: center; margin-top: 10px;">
+  <a href="https://documentation.meraki.com/General_Administration/Licensing/Meraki_MR_License_Guide"
+     target="_blank"
+     style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px;
+            text-decoration: none; border-radius: 5px; margin-right: 10px;">
+    AP License Guide
+  </a>
+  <a href="https://documentation.meraki.com/General_Administration/Licensing/Subscription_-_MS_Licensing"
+     target="_blank"
+     style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px;
+            text-decoration: none; border-radius: 5px; margin-right: 10px;">
+    Switch License Guide
+  </a>
+</div>"""
+    )
+    return baseline_result_card("Bill of Materials (BoM)", bom_html)
+
+
+APS = [(generation, model) for generation, models in AP_MODELS.items() for model in models]
+SWITCHES = [(family, model) for family, models in SWITCH_MODELS.items() for model in models]
+QUANTITIES = [1, 2, 17]
+
+
+@pytest.mark.parametrize("wifi_generation, ap_model", APS)
+def test_ap_card_matches_the_baseline(wifi_generation, ap_model):
+    expected = baseline_ap_details(AP_MODELS[wifi_generation][ap_model], ap_model)
+    assert render.ap_card(wifi_generation, ap_model) == expected
+    assert render.ap_card(wifi_generation, ap_model) == expected  # cached
+
+
+@pytest.mark.parametrize("family, switch_model", SWITCHES)
+@pytest.mark.parametrize("quantity", QUANTITIES)
+def test_switch_card_matches_the_baseline(family, switch_model, quantity):
+    option = (family, switch_model, SWITCH_MODELS[family][switch_model])
+    assert render.switch_card(family, switch_model, quantity) == baseline_switch_details(option, quantity)
+
+
+@pytest.mark.parametrize("wifi_generation, ap_model", APS)
+def test_bom_card_matches_the_baseline(wifi_generation, ap_model):
+    ap_info = AP_MODELS[wifi_generation][ap_model]
+    for (family, switch_model), aps, switches in product(SWITCHES + [(None, None)], QUANTITIES, QUANTITIES):
+        option = (family, switch_model, SWITCH_MODELS[family][switch_model]) if family is not None else None
+        expected = baseline_bom(aps, ap_info, option, switches)
+        assert render.bom_card(wifi_generation, ap_model, aps, family, switch_model, switches) == expected
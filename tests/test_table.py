@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from wisizer import engine
+from wisizer.catalog import build_catalog, current_catalog
+from wisizer.engine import calculate_aps, calculate_switches
+from wisizer.table import SITE_DTYPE, SizingTable, build_switches, model_keys, table_paths
+
+
+def test_load_or_build_writes_the_table_once(tmp_path):
+    directory = str(tmp_path)
+    stale = os.path.join(directory, "sizing_sites-000000000000.npy")
+    open(stale, "wb").close()
+    assert SizingTable.load(directory=directory) is None
+
+    table = SizingTable.load_or_build(directory)
+    assert all(os.path.exists(path) for path in table_paths(directory, current_catalog().version))
+    assert not os.path.exists(stale)
+    assert SizingTable.load(directory=directory) is not None
+
+    expected = calculate_aps(120.0, 75, "scenario_2", "Wi-Fi 7")
+    assert table.aps(120, 75, "scenario_2", "Wi-Fi 7")[:4] == expected[:4]
+    assert table.aps(121, 75, "scenario_2", "Wi-Fi 7") is None
+    aps, model, _, uplink, info = expected
+    assert table.switches_for(aps, "Wi-Fi 7", model, uplink) == calculate_switches(aps, info, uplink)
+
+
+def test_load_or_build_keeps_the_table_in_memory_when_it_cannot_save(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    table = SizingTable.load_or_build(str(blocker / "tables"))
+    assert table.aps(40, 1, "scenario_1", "Wi-Fi 6") is not None
+
+
+def test_large_catalogs_fit_the_table(monkeypatch):
+    # Over 255 AP models and 127 switch models: more than one byte of index each.
+    catalog = current_catalog()
+    ap_models = {generation: {f"{model}-{copy}": info for copy in range(90) for model, info in models.items()}
+                 for generation, models in catalog.ap_models.items()}
+    switch_models = {f"{family} {copy}": models for copy in range(10) for family, models in catalog.switch_models.items()}
+    large = build_catalog(ap_models, switch_models, catalog)
+    monkeypatch.setattr(engine, "_sizing", engine._sizing)
+    monkeypatch.setattr(engine, "current_catalog", lambda: large)
+    keys = model_keys(large)
+    assert len(keys) > 255 and len(engine.current_sizing().switch_table.options) > 127
+
+    sites = np.zeros(1, dtype=SITE_DTYPE)
+    sites["recommended_aps"] = 3
+    sites["model_index"] = len(keys) - 1
+    assert sites["model_index"][0] == len(keys) - 1
+    table = SizingTable(large, sites, build_switches(large, sites))
+    generation, model = keys[-1]
+    ap = large.aps[generation][model]
+    assert table.switches_for(3, generation, model, ap.uplink) == calculate_switches(3, ap, ap.uplink)
+
+
+def test_tables_of_an_older_layout_are_rebuilt(tmp_path):
+    directory = str(tmp_path)
+    sites_path, switches_path = table_paths(directory, current_catalog().version)
+    np.save(sites_path, np.zeros(1, dtype=[("recommended_aps", "<u2"), ("model_index", "u1")]))
+    np.save(switches_path, np.zeros(1, dtype=[("switch_index", "i1")]))
+    assert SizingTable.load(directory=directory) is None
+    assert SizingTable.load_or_build(directory).aps(40, 1, "scenario_1", "Wi-Fi 6") is not None
@@ -1,31 +1,48 @@
 # -*- coding: utf-8 -*-
 
 import streamlit as st
-import math
-import pandas as pd
 import os
-import json
 import logging
-from typing import Optional, List
-from openai import OpenAI
-from PIL import Image
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Optional
 from dotenv import load_dotenv
-load_dotenv(override=True)
-import streamlit.components.v1 as components
 
 # Import scenarios, APs, and switches data modules
 from data.scenarios import SCENARIOS, get_scenario
-from data.ap_models import AP_MODELS
-from data.switch_models import SWITCH_MODELS
-
-# API Key for OpenAI
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    st.error("OpenAI integration problem.")
-    st.stop()
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+from wisizer import engine
+from wisizer import render as html
+from wisizer.ai_cache import AICache
+from wisizer.building import DEFAULT_CEILING_HEIGHT, Building, Zone
+from wisizer.calc_log import CalculationLogger
+from wisizer.prompt import build_ai_prompt
+from wisizer.catalog import current_catalog
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from wisizer.floorplan import FloorPlan
+    from wisizer.table import SizingTable
+
+# Streamlit re-executes this script on every interaction; anything built here
+# that doesn't depend on widget state is created once per process instead.
+@st.cache_resource
+def load_environment() -> bool:
+    load_dotenv(override=True)
+    return True
+
+@st.cache_resource
+def get_openai_api_key() -> Optional[str]:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logging.warning("OPENAI_API_KEY is not set; AI explanations are disabled.")
+    return api_key or None
+
+@st.cache_resource
+def get_openai_client() -> "OpenAI":
+    # openai is imported on the first AI request to keep it off the cold start.
+    from openai import OpenAI
+    return OpenAI(api_key=get_openai_api_key())
+
+load_environment()
 
 # Page Layout & Container Width
 st.set_page_config(
@@ -41,13 +58,19 @@ st.set_page_config(
 
 logging.basicConfig(level=logging.INFO)
 
+@st.cache_resource
+def get_calc_logger() -> CalculationLogger:
+    # One background writer per process; sessions only enqueue entries.
+    return CalculationLogger(os.getenv("WISIZER_LOG_PATH", "logs.jsonl"))
+
 def log_calculation(result: dict, ai_explanation: Optional[str] = None, switches_needed: Optional[int] = None,
                     switch_model: Optional[str] = None, source_ip: Optional[str] = "unknown") -> None:
     log_entry = {
-         "timestamp": pd.Timestamp.now(),
+         "timestamp": datetime.now().isoformat(timespec="milliseconds"),
          "users": result.get("users"),
          "area": result.get("area"),
          "ceiling_height": result.get("ceiling_height"),
+         "coverage": result.get("coverage"),
          "scenario_name": result.get("scenario_name"),
          "wifi_generation": result.get("wifi_generation"),
          "include_switches": result.get("include_switches"),
@@ -58,16 +81,13 @@ def log_calculation(result: dict, ai_explanation: Optional[str] = None, switches
          "ai_explanation": ai_explanation,
          "source_ip": source_ip
     }
-    df = pd.DataFrame([log_entry])
-    file_path = "logs.csv"
-    df.to_csv(file_path, mode="a", header=not os.path.exists(file_path), index=False, sep=";", lineterminator="\n")
+    get_calc_logger().log(log_entry)
 
 # Global Styling Constants
-GLOBAL_BG_COLOR = "#F4F4F4"
-GLOBAL_TEXT_COLOR = "#27AE60"
+GLOBAL_BG_COLOR = html.BG_COLOR
+GLOBAL_TEXT_COLOR = html.TEXT_COLOR
 
-st.markdown(
-    f"""
+GLOBAL_CSS = f"""
     <style>
     .block-container {{
         max-width: 1400px !important;
@@ -104,340 +124,222 @@ st.markdown(
         margin-top: 5px !important;
         margin-bottom: 5px !important;
     }}
+    img {{
+        border-radius: 0 !important;
+    }}
     </style>
-    """,
-    unsafe_allow_html=True
-)
+    """
+
+# Elements not re-emitted on a rerun are removed from the page, so the (constant) CSS is sent every run.
+st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
 
 # ------------------------------
 # Helper Functions
 # ------------------------------
 
-# Missing function added here
+# Card HTML is built and cached in wisizer.render; these only emit it.
 def render_result_card(title: str, content_html: str, bg_color: str = GLOBAL_BG_COLOR) -> None:
-    st.markdown(f"""
-    <div style="background-color: {bg_color}; padding: 20px; border-radius: 10px; margin-top: 20px">
-        <h2 style="color: {GLOBAL_TEXT_COLOR}; text-align: center;">{title}</h2>
-        {content_html}
-    </div>
-    """, unsafe_allow_html=True)
-
-def render_ap_details(ap_info: dict, ap_model: str):
-    ports = sum(item.get("Ports", 0) for item in ap_info.get("Port", []))
-    port_speed_list = []
-    for item in ap_info.get("Port", []):
-        speeds = item.get("Speed", [])
-        if speeds:
-            port_speed_list.extend(speeds)
-    speeds_str = "/".join(str(s) for s in port_speed_list) if port_speed_list else "N/A"
-    port_speeds_text = f"{ports} x {speeds_str} Gbps" if speeds_str != "N/A" else "N/A"
-    ap_table = f"""
-    <table style="width: 100%; border-collapse: collapse;">
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Antenna Type:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">Omnidirectional Indoor</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Wi-Fi Standard:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('Wi-Fi Standard')}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Spatial Streams:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('Spatial Streams')}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('PoE Type')}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Port Speed:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{port_speeds_text}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{ap_info.get('SKU')}</td>
-      </tr>
-    </table>
-    <div style="text-align: center; margin-top: 20px;">
-        <a href="{ap_info.get('Datasheet')}" target="_blank" style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">Datasheet</a>
-        <a href="{ap_info.get('Installation Guide')}" target="_blank" style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Installation Guide</a>
-    </div>
-    """
-    render_result_card(f"Recommended AP Model: <u>{ap_model}</u>", ap_table)
-
-def format_port_config(switch_info: dict) -> str:
-    group_strings = []
-    for group in switch_info.get("Access", []):
-        ports = group.get("Ports")
-        speeds = group.get("Speed", [])
-        if ports is not None and speeds:
-            speeds_str = "/".join(str(s) for s in speeds)
-            group_strings.append(f"{ports} x {speeds_str} Gbps")
-    return " + ".join(group_strings)
+    st.markdown(html.result_card(title, content_html, bg_color), unsafe_allow_html=True)
+
+def render_ap_details(wifi_generation: str, ap_model: str):
+    st.markdown(html.ap_card(wifi_generation, ap_model), unsafe_allow_html=True)
 
 def render_switch_details(switch_option, switches_needed):
     if not switch_option:
         return
-    family, switch_model, switch_info = switch_option
-    port_config = format_port_config(switch_info)
-    uplink_list = switch_info.get("Uplink", [])
-    if uplink_list:
-        uplink_ports = sum(item.get("Ports", 0) for item in uplink_list)
-        uplink_speed = " / ".join("/".join(str(s) for s in item.get("Speed", [])) for item in uplink_list)
-    else:
-        uplink_ports = 0
-        uplink_speed = "N/A"
-    unit_str = "unit" if switches_needed == 1 else "units"
-    switch_table = f"""
-    <table style="width: 100%; border-collapse: collapse;">
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Access Ports:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{port_config}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Uplinks:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{uplink_ports} x {uplink_speed} Gbps</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('PoE Type')}</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Budget:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('PoE Budget', 0)} W</td>
-      </tr>
-      <tr>
-        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
-        <td style="width: 70%; padding: 10px; text-align: left;">{switch_info.get('SKU')}</td>
-      </tr>
-    </table>
-    <div style="text-align: center; margin-top: 20px;">
-        <a href="{switch_info.get('Datasheet')}" target="_blank" 
-           style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">
-           Datasheet
-        </a>
-        <a href="{switch_info.get('Installation Guide')}" target="_blank" 
-           style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
-           Installation Guide
-        </a>
-    </div>
-    """
-    details = f"""
-    <div style="margin-bottom: 20px;">
-      <p style="font-size: 20px; text-align: center;">
-        Based on your AP requirements, you will need <strong>{switches_needed}</strong> {unit_str}.
-      </p>
-    </div>
-    """
-    content = details + switch_table
-    render_result_card(f"Recommended Access Switch: <u>{switch_model}</u>", content)
-
-def render_bom(recommended_aps, ap_info, switch_option, switches_needed):
-    ap_sku = ap_info.get("SKU", "N/A")
-    ap_line = f"""<tr style="text-align:center;">
-<td style="padding: 10px;">Access Point</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{recommended_aps}</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{ap_sku}</td>
-</tr>"""
-    ap_license_line = ""
-    ap_license_list = ap_info.get("License", [])
-    if ap_license_list:
-        ap_license_options = ap_license_list[0]
-        ap_license_str = f"{ap_license_options.get('Enterprise','')} <i>or</i> {ap_license_options.get('Advanced','')}"
-        ap_license_line = f"""<tr style="text-align:center;">
-<td style="padding: 10px;">AP License</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{recommended_aps}</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{ap_license_str}*</td>
-</tr>"""
-    switch_line = ""
-    switch_license_line = ""
-    if switch_option is not None:
-        _, switch_model, switch_info = switch_option
-        switch_sku = switch_info.get("SKU", "N/A")
-        switch_line = f"""<tr style="text-align:center;">
-<td style="padding: 10px;">PoE Access Switch</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{switches_needed}</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{switch_sku}</td>
-</tr>"""
-        switch_license_list = switch_info.get("License", [])
-        if switch_license_list:
-            switch_license_options = switch_license_list[0]
-            switch_license_str = f"{switch_license_options.get('Enterprise','')} <i>or</i> {switch_license_options.get('Advanced','')}"
-            switch_license_line = f"""<tr style="text-align:center;">
-<td style="padding: 10px;">Switch License</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{switches_needed}</td>
-<td style="padding: 10px; border-left: 1px solid #ccc;">{switch_license_str}*</td>
-</tr>"""
-    bom_html = (
-f"""<table style="width: 100%; border-collapse: collapse;">
-<tr style="text-align:center;">
-<th style="padding: 10px;">Item</th>
-<th style="padding: 10px; border-left: 1px solid #ccc;">Quantity</th>
-<th style="padding: 10px; border-left: 1px solid #ccc;">Part Number</th>
-</tr>
-{ap_line}
-{ap_license_line}
-{switch_line}
-{switch_license_line}
-</table>
-<div style="text-align: center; margin-top: 10px; margin-bottom: 30px;">
-  <p style="font-size: 0.9rem; color: #555;">
-    *Choose the most appropriate license tier and duration (x = 1, 3, 5, 7, 10 years).<br>
-    <u>Ensure that all hardware is certified and approved for use at your location!</u>
-  </p>
-</div>
-<div style="text-align: center; margin-top: 10px;">
-  <a href="https://documentation.meraki.com/General_Administration/Licensing/Meraki_MR_License_Guide"
-     target="_blank"
-     style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px;
-            text-decoration: none; border-radius: 5px; margin-right: 10px;">
-    AP License Guide
-  </a>
-  <a href="https://documentation.meraki.com/General_Administration/Licensing/Subscription_-_MS_Licensing"
-     target="_blank"
-     style="background-color: {GLOBAL_TEXT_COLOR}; color: white; padding: 10px 20px;
-            text-decoration: none; border-radius: 5px; margin-right: 10px;">
-    Switch License Guide
-  </a>
-</div>"""
-    )
-    render_result_card("Bill of Materials (BoM)", bom_html)
-
-@st.cache_data(show_spinner=False)
-def calculate_aps(area: float, users: int, scenario_type: str, wifi_generation: str, ceiling_height: float = 3.0):
-    concurrency = 0.7  # 70% occupancy
-    concurrent_users = users * concurrency
-    background_devices = concurrent_users * 2
-    throughput_per_user = 5  # Mbps
-    background_sync = 0.5  # Mbps
-
-    total_bandwidth = math.ceil((concurrent_users * throughput_per_user) + (background_devices * background_sync))
-    
-    devices_5ghz = math.ceil((concurrent_users + background_devices) * 0.7)
-    scenario_data = get_scenario(scenario_type)
-    coverage_m2 = scenario_data.coverage_m2
-    
-    aps_coverage = math.ceil(area / coverage_m2)
-    users_ap = math.ceil(concurrent_users / aps_coverage)
-    candidates = []
-    for model, info in AP_MODELS[wifi_generation].items():
-        if aps_coverage > 5 and model == "MR28":
-            continue
-        max_users = info.get("Max Users", 0)
-        if max_users >= users_ap:
-            candidates.append((model, info, max_users))
-    if not candidates:
-        candidates = [(model, info, info.get("Max Users", 0)) for model, info in AP_MODELS[wifi_generation].items() if not (aps_coverage > 5 and model == "MR28")]
-        candidates.sort(key=lambda x: x[2], reverse=True)
-        selected_candidate = candidates[0]
-    else:
-        candidates.sort(key=lambda x: x[2])
-        selected_candidate = candidates[0]
-    selected_model, selected_info, selected_max_users = selected_candidate
-
-    capacity_24ghz = selected_info.get("Capacity", {}).get("2.4GHz", 0)
-    capacity_5ghz = selected_info.get("Capacity", {}).get("5GHz", 0)
-    capacity_6ghz = selected_info.get("Capacity", {}).get("6GHz", 0)
-    effective_capacity = capacity_5ghz + capacity_6ghz if capacity_6ghz > 0 else capacity_5ghz
-    factor = 0.35  # factor to represent real-world data rate
-    aps_capacity = math.ceil(total_bandwidth / (effective_capacity * factor)) if effective_capacity > 0 else float('inf')
-    aps_density = math.ceil(devices_5ghz / selected_max_users)
-    recommended_aps = max(aps_coverage, aps_capacity, aps_density)
-    users_per_ap = math.ceil(users / recommended_aps)
-
-    ap_uplink = math.ceil(capacity_24ghz + capacity_5ghz + capacity_6ghz)
-    return recommended_aps, selected_model, users_per_ap, ap_uplink, selected_info
-
-def get_port_speed_above_capacity(ap_info: dict, ap_uplink: float) -> float:
-    speeds: List[float] = []
-    for item in ap_info.get("Port", []):
-        spd = item.get("Speed", [])
-        if isinstance(spd, list):
-            speeds.extend(spd)
-    if not speeds:
-        return 1
-    sorted_speeds = sorted(set(speeds))
-    for s in sorted_speeds:
-        if s > ap_uplink:
-            return s
-    return max(sorted_speeds)
-
-@st.cache_data(show_spinner=False)
-def calculate_switches(num_aps: int, ap_info: dict, ap_uplink: float):
-    ap_power = ap_info.get("Power")
-    if not ap_power:
+    family, switch_model, _ = switch_option
+    st.markdown(html.switch_card(family, switch_model, switches_needed), unsafe_allow_html=True)
+
+def render_bom(wifi_generation, ap_model, recommended_aps, switch_option, switches_needed):
+    family, switch_model = (switch_option[0], switch_option[1]) if switch_option is not None else (None, None)
+    st.markdown(html.bom_card(wifi_generation, ap_model, recommended_aps, family, switch_model, switches_needed), unsafe_allow_html=True)
+
+# Sizing caches are keyed on canonical inputs only: area quantized, ceiling
+# height only for the RF coverage model (the area model ignores it) and
+# catalog model IDs instead of the nested ap_info dict, so equivalent inputs
+# share one bounded entry. The
+# versions of the catalog parts a result reads are in the key too, so a
+# catalog reload only misses for the generations (or switches) it changed.
+SIZING_CACHE_MAX_ENTRIES = 10000
+SIZING_CACHE_TTL = "24h"
+
+@st.cache_data(show_spinner=False, max_entries=SIZING_CACHE_MAX_ENTRIES, ttl=SIZING_CACHE_TTL)
+def _cached_aps(area: float, users: int, scenario_type: str, wifi_generation: str, generation_version: str,
+                coverage: str = "area", ceiling_height: Optional[float] = None):
+    if coverage == "area":
+        return engine.calculate_aps(area, users, scenario_type, wifi_generation)
+    return engine.calculate_aps(area, users, scenario_type, wifi_generation, ceiling_height, coverage=coverage)
+
+@st.cache_data(show_spinner=False, max_entries=SIZING_CACHE_MAX_ENTRIES, ttl=SIZING_CACHE_TTL)
+def _cached_switches(num_aps: int, wifi_generation: str, ap_model: str, ap_uplink: float,
+                     generation_version: str, switch_version: str):
+    return engine.calculate_switches(num_aps, current_catalog().aps[wifi_generation][ap_model], ap_uplink)
+
+@st.cache_data(show_spinner=False, max_entries=SIZING_CACHE_MAX_ENTRIES, ttl=SIZING_CACHE_TTL)
+def mixed_switches(num_aps: int, wifi_generation: str, ap_model: str, ap_uplink: float,
+                   generation_version: str, switch_version: str):
+    from wisizer.optimizer import optimize_switches
+    return optimize_switches(num_aps, current_catalog().aps[wifi_generation][ap_model], ap_uplink)
+
+# Floor plans are not hashed by the caches below: ``plan_key`` (the image's
+# content hash, scale and resolution) stands in for the ``_plan`` argument.
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_plan_aps(plan_key: str, users: int, wifi_generation: str, generation_version: str,
+                     ceiling_height: float, _plan: "FloorPlan"):
+    return engine.calculate_aps(_plan.area, users, _plan.scenario, wifi_generation, ceiling_height,
+                                coverage="rf", floor=_plan.grid())
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def suggest_ap_positions(area: float, count: int, ceiling_height: float, scenario_type: str, wifi_generation: str,
+                         plan_key: Optional[str] = None, _plan: Optional["FloorPlan"] = None) -> dict:
+    # NumPy-based; imported on first use like the sizing table.
+    from wisizer.channels import plan_channels
+    from wisizer.coverage import FloorGrid
+    from wisizer.placement import place_aps
+    # An uploaded plan places APs on its footprint; otherwise a 1.5:1 rectangle of the area.
+    grid = _plan.grid() if _plan is not None else FloorGrid.from_area(area)
+    placement = place_aps(grid, count, ceiling_height, scenario_type)
+    plans = plan_channels(placement.positions, wifi_generation, ceiling_height, scenario_type)
+    positions = []
+    for i, (x, y) in enumerate(placement.coordinates()):
+        row = {"AP": i + 1, "x (m)": x, "y (m)": y}
+        row.update({f"{band} ({plan.width} MHz)": plan.channels[i] for band, plan in plans.items()})
+        positions.append(row)
+    return {
+        "positions": positions,
+        "co_channel_pairs": {band: plan.conflicts for band, plan in plans.items()},
+        "coverage": placement.coverage,
+        "radius": placement.radius,
+        "width": grid.width,
+        "depth": grid.depth,
+    }
+
+def ap_positions(results: dict) -> dict:
+    plan = results.get("floor_plan")
+    return suggest_ap_positions(engine.quantize_area(results["area"]), results["recommended_aps"],
+                                round(float(results["ceiling_height"]), 2), results["scenario_type"],
+                                results["wifi_generation"], plan.key if plan is not None else None, _plan=plan)
+
+FLOOR_PLAN_TYPES = ["png", "jpg", "jpeg", "bmp", "tif", "tiff", "pgm", "ppm"]
+
+def load_floor_plan(uploaded_file, width_m: float):
+    # Cached by image content hash inside wisizer.floorplan (memory and data/floorplans/).
+    from wisizer.floorplan import load_floor_plan as load
+    return load(uploaded_file, round(float(width_m), 2))
+
+@st.cache_resource(max_entries=2)
+def get_sizing_table(catalog_version: str) -> Optional["SizingTable"]:
+    # Loaded from data/tables/, or built there the first time a catalog version is seen.
+    # None (cached, so not retried on every rerun) sends lookups to the live engine.
+    from wisizer.table import SizingTable
+    try:
+        return SizingTable.load_or_build()
+    except Exception:
+        logging.exception("Could not load or build the sizing table for catalog %s", catalog_version)
+        return None
+
+def calculate_aps(area: float, users: int, scenario_type: str, wifi_generation: str, ceiling_height: float = 3.0,
+                  coverage: str = "area", floor_plan: Optional["FloorPlan"] = None):
+    catalog = current_catalog()
+    if floor_plan is not None:
+        return _cached_plan_aps(floor_plan.key, int(users), wifi_generation,
+                                catalog.generation_versions[wifi_generation], round(float(ceiling_height), 2),
+                                _plan=floor_plan)
+    if coverage != "area":
+        return _cached_aps(engine.quantize_area(area), int(users), scenario_type, wifi_generation,
+                           catalog.generation_versions[wifi_generation], coverage, round(float(ceiling_height), 2))
+    table = get_sizing_table(catalog.version)
+    result = table.aps(area, users, scenario_type, wifi_generation) if table is not None else None
+    if result is not None:
+        return result
+    return _cached_aps(engine.quantize_area(area), int(users), scenario_type, wifi_generation,
+                       catalog.generation_versions[wifi_generation])
+
+def calculate_switches(num_aps: int, wifi_generation: str, ap_model: str, ap_uplink: float):
+    catalog = current_catalog()
+    if not catalog.aps[wifi_generation][ap_model].power:
         st.warning("AP model doesn't have a valid Power value.")
-        return None, None, None, None
-    ap_port_count = sum(item.get("Ports", 0) for item in ap_info.get("Port", []))
-    total_ap_connections = num_aps * ap_port_count
-    required_speed = get_port_speed_above_capacity(ap_info, ap_uplink=ap_uplink / 1000)
-    best_option = None
-    best_switches_needed = None
-    margin = 0.7  # 70% available after margin
-    for family, switches in SWITCH_MODELS.items():
-        for model, info in switches.items():
-            effective_port_count = sum(group.get("Ports", 0) for group in info.get("Access", []) if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed)
-            if effective_port_count <= 0:
-                continue
-            available_ports = math.floor(effective_port_count * margin)
-            poe_budget = info.get("PoE Budget", 0)
-            poe_limit = math.floor((poe_budget * margin) / ap_power)
-            available = min(available_ports, poe_limit)
-            if available <= 0:
-                continue
-            switches_needed = math.ceil(total_ap_connections / available)
-            if best_option is None or (best_switches_needed is not None and switches_needed < best_switches_needed):
-                best_option = (family, model, info)
-                best_switches_needed = switches_needed
-    if best_option is None:
-        return None, None, None, None
-    family, model, info = best_option
-    effective_port_count = sum(group.get("Ports", 0) for group in info.get("Access", []) if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed)
-    available_ports = math.floor(effective_port_count * margin)
-    poe_budget = info.get("PoE Budget", 0)
-    poe_limit = math.floor((poe_budget * margin) / ap_power)
-    available = min(available_ports, poe_limit)
-    unused_ports = (available * best_switches_needed) - total_ap_connections
-    total_power_available = best_switches_needed * (poe_budget * margin)
-    used_power = num_aps * ap_power
-    unused_power = total_power_available - used_power
-    return best_option, best_switches_needed, unused_ports, unused_power
-
-@st.cache_data(show_spinner=False)
-def generate_ai_reasoning(wifi_generation: str, ap_model: str, switches_needed: int, switch_model: str, switch_type: str, uplink_ports: int, uplink_speed: str, users: int, area: float, recommended_aps: int, total_high_speed_ports: int, unused_ports: int, unused_high_speed_ports: int, total_poebudget: int, unused_power: int) -> str:
-    ap_generation_dict = AP_MODELS[wifi_generation]
-    dict_str = json.dumps(ap_generation_dict, indent=2)
-    switch_text = ""
-    if switch_model != "N/A":
-        switch_text = f"""
-To add more context, for the access layer, we're suggesting {switches_needed} unit(s) of switch model {switch_model}. This is a {switch_type} capable model and has {uplink_ports} uplinks ports at {uplink_speed} Gbps.
-- Explain why {switches_needed} unit(s) of switch model {switch_model} was chosen. Mention whether it is an L2 or L3 switch, detail its uplink port configuration (number and speeds), and specify that after applying a 30% growth margin, there are {unused_ports} unused ports and {unused_power} W of unused PoE budget to connect other devices or future growth.
-"""
-    prompt = f"""
-You're a Cisco Networking Expert helping to explain a Meraki wireless network to a partner.
-For context, the given scenario is a traditional office environment. We're recommending {recommended_aps} APs model {ap_model} to support {users} users in an area of {area} m².
-Follow these instructions strictly to answer:
-Provide a concise, direct, and technical explanation without any conversational language or follow-up questions.
-Don't mention that an certain AP "can support up to XX users" and its capacity (Mbps).
-Don't need to explain the scenario requirements, like "supporting 50 users in a 100 m2 area", the user already knows that.
-Don't present redundant information.
-- Explain why the AP model {ap_model} was selected, mention if it's for a low or high user density, emphasize its hardware features such as spatial streams, port configuration, and PoE type.
-{switch_text}
-- Finish with a very brief and direct conclusion without being redundant and compare the AP model with an upper or down (if the case) AP model.
-For your comparison, below is the list of available AP models:
-{dict_str}
-"""
+    table = get_sizing_table(catalog.version)
+    result = table.switches_for(num_aps, wifi_generation, ap_model, ap_uplink) if table is not None else None
+    if result is not None:
+        return result
+    return _cached_switches(int(num_aps), wifi_generation, ap_model, ap_uplink,
+                            catalog.generation_versions[wifi_generation], catalog.switch_version)
+
+AI_MODEL = "gpt-4o-mini"
+AI_ERROR_MESSAGE = "An error occurred while generating the explanation. Please try again."
+
+@st.cache_resource
+def get_ai_cache() -> AICache:
+    # Persistent and shared across processes/replicas on the same volume.
+    return AICache.from_env()
+
+def stream_ai_reasoning(**prompt_inputs) -> Iterator[str]:
+    """Yield the explanation as tokens arrive; takes the build_ai_prompt arguments.
+
+    Completed explanations are cached on disk, so a repeated scenario is yielded whole.
+    """
+    cache = get_ai_cache()
+    prompt = build_ai_prompt(**prompt_inputs)
+    # Keyed on the prompt text itself, so edits to the instructions or template miss the old entries.
+    cache_key = cache.key(model=AI_MODEL, prompt=prompt)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    parts = []
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt.strip()}],
+        stream = get_openai_client().chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=300,
-            temperature=0.4
+            temperature=0.4,
+            stream=True
         )
-        return response.choices[0].message.content.strip()
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
     except Exception as e:
         logging.error("Error generating AI reasoning: %s", e)
-        return "An error occurred while generating the explanation. Please try again."
+        yield AI_ERROR_MESSAGE
+        return
+    text = "".join(parts).strip()
+    if not text:
+        # An empty answer is not cached, so the next request asks again.
+        logging.warning("AI reasoning stream returned no text")
+        yield AI_ERROR_MESSAGE
+        return
+    try:
+        cache.put(cache_key, text)
+    except Exception as e:
+        logging.warning("Could not cache AI reasoning: %s", e)
+
+def generate_ai_reasoning(**prompt_inputs) -> str:
+    """Blocking variant of stream_ai_reasoning for callers that need the whole text."""
+    return "".join(stream_ai_reasoning(**prompt_inputs)).strip()
+
+# Conversion helper functions
+def ft_to_m(feet: float) -> float:
+    return feet * 0.3048
+
+def ft2_to_m2(ft2: float) -> float:
+    return ft2 * 0.092903
+
+@st.cache_resource
+def load_scenario_images() -> dict:
+    # Scenario illustrations read from disk once per process; None if missing.
+    images = {}
+    for key, data in SCENARIOS.items():
+        try:
+            with open(data.image_path, "rb") as f:
+                images[key] = f.read()
+        except OSError:
+            images[key] = None
+    return images
 
 def get_current_scenario_key(results: dict) -> str:
     return (
@@ -451,18 +353,317 @@ def get_current_scenario_key(results: dict) -> str:
         f"{results['area']}"
     )
 
+def summarize_switches(results: dict) -> dict:
+    """Switch recommendation plus the figures shared by the switch card, BoM and AI prompt."""
+    summary = {
+        "switch_option": None,
+        "switches_needed": 0,
+        "switch_model": "N/A",
+        "total_high_speed_ports": 0,
+        "unused_high_speed_ports": 0,
+        "total_poebudget": 0,
+        "unused_power": 0,
+        "unused_ports": 0,
+        "switch_type": "N/A",
+        "uplink_ports": 0,
+        "uplink_speed": "N/A"
+    }
+    if not results.get("include_switches", False):
+        return summary
+    switch_option, switches_needed, unused_ports, unused_power = calculate_switches(
+        results["recommended_aps"],
+        results["wifi_generation"],
+        results["ap_model"],
+        results["ap_uplink"]
+    )
+    if switch_option is None:
+        return summary
+    family, switch_model, _ = switch_option
+    catalog = current_catalog()
+    ap = catalog.aps[results["wifi_generation"]][results["ap_model"]]
+    switch = catalog.switches[family][switch_model]
+    required_speed = ap.port_speed_above(results["ap_uplink"] / 1000)
+    total_high_speed_ports = switch.ports_at(required_speed) * switches_needed
+    ap_ports_required = results["recommended_aps"] * ap.total_ports
+    total_poebudget = switches_needed * switch.poe_budget
+    used_power = results["recommended_aps"] * (ap.power or 0)
+    summary.update({
+        "switch_option": switch_option,
+        "switches_needed": switches_needed,
+        "switch_model": switch_model,
+        "total_high_speed_ports": total_high_speed_ports,
+        "unused_high_speed_ports": total_high_speed_ports - ap_ports_required,
+        "total_poebudget": total_poebudget,
+        "unused_power": total_poebudget - used_power,
+        "unused_ports": unused_ports,
+        "switch_type": switch.type if switch.type is not None else "N/A"
+    })
+    if switch.uplinks:
+        summary["uplink_ports"] = switch.uplink_ports
+        summary["uplink_speed"] = " / ".join("/".join(str(s) for s in group.speeds) for group in switch.uplinks)
+    return summary
+
+# Result panels are fragments: a widget inside one (e.g. the AI button) reruns
+# only that panel with the inputs it was given, not the whole page.
+@st.fragment
+def render_sizing_panel(results: dict) -> None:
+    ap_summary = f"""
+    <div style="display: flex; justify-content: space-around;">
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">🏢 Quantity</h3>
+            <p style="font-size: 22px; font-weight: bold;">{results['recommended_aps']} AP{'s' if results['recommended_aps'] != 1 else ''}</p>
+        </div>
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">👥 Users/AP</h3>
+            <p style="font-size: 22px; font-weight: bold;">{results['users_per_ap']}</p>
+        </div>
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">📡 Estimated Capacity</h3>
+            <p style="font-size: 22px; font-weight: bold;">{results['ap_uplink']} Mbps</p>
+        </div>
+    </div>
+    """
+    render_result_card("Wireless Sizing Results", ap_summary.strip())
+    if results.get("floor_plan") is not None:
+        st.caption(f"Sized from the uploaded floor plan: {results['floor_plan'].scenario.description}.")
+    render_ap_details(results["wifi_generation"], results["ap_model"])
+    if st.toggle("Suggest AP positions", key="show_ap_positions",
+                 help="Place the APs on the uploaded floor plan, or else a 1.5:1 rectangle of the entered area, "
+                      "to maximize coverage at -67 dBm, and plan their channels."):
+        placement = ap_positions(results)
+        co_channel = ", ".join(f"{band}: {pairs}" for band, pairs in placement["co_channel_pairs"].items())
+        st.caption(f"Coverage at -67 dBm: {placement['coverage']:.0%} of the floor "
+                   f"({placement['width']:.1f} m x {placement['depth']:.1f} m, service radius {placement['radius']:.1f} m). "
+                   f"Co-channel AP pairs: {co_channel}.")
+        st.scatter_chart(placement["positions"], x="x (m)", y="y (m)")
+        st.dataframe(placement["positions"], use_container_width=True)
+
+def render_closet_split(results: dict) -> None:
+    # NumPy-based; imported on first use like the placement.
+    from wisizer.closets import MAX_RUN_M, Closet, assign_aps, closet_switches
+    placement = ap_positions(results)
+    rows = st.data_editor(
+        [{"Closet": "IDF 1", "x (m)": round(placement["width"] / 2, 1), "y (m)": 0.0, "Max APs": None}],
+        num_rows="dynamic",
+        use_container_width=True,
+        key="closets",
+        column_config={
+            "x (m)": st.column_config.NumberColumn(step=1.0),
+            "y (m)": st.column_config.NumberColumn(step=1.0),
+            "Max APs": st.column_config.NumberColumn(min_value=1, step=1),
+        },
+    )
+    closets = [
+        Closet(str(row["Closet"]), float(row["x (m)"]), float(row["y (m)"]),
+               max_aps=int(row["Max APs"]) if row.get("Max APs") not in (None, "") else None)
+        for row in rows
+        if row.get("Closet") not in (None, "") and row.get("x (m)") is not None and row.get("y (m)") is not None
+    ]
+    if not closets:
+        st.info("Add at least one closet with a name and position.")
+        return
+    positions = [(row["x (m)"], row["y (m)"]) for row in placement["positions"]]
+    assignment = assign_aps(positions, closets)
+    ap = current_catalog().aps[results["wifi_generation"]][results["ap_model"]]
+    st.dataframe(
+        [
+            {
+                "Closet": split.closet.name,
+                "APs": split.aps,
+                "Longest run (m)": round(split.longest_run_m, 1),
+                "Switch": split.switch_option[1] if split.switch_option is not None else "N/A",
+                "Switches": split.switches_needed or 0,
+            }
+            for split in closet_switches(assignment, closets, ap, results["ap_uplink"])
+        ],
+        use_container_width=True,
+    )
+    if assignment.unassigned:
+        st.warning(f"{len(assignment.unassigned)} AP(s) are beyond {MAX_RUN_M:.0f} m of cable from every closet "
+                   "with room left; add a closet nearer to them.")
+
+def render_mixed_switches(results: dict, switches: dict) -> None:
+    catalog = current_catalog()
+    plan = mixed_switches(results["recommended_aps"], results["wifi_generation"], results["ap_model"],
+                          results["ap_uplink"], catalog.generation_versions[results["wifi_generation"]],
+                          catalog.switch_version)
+    if plan is None:
+        st.info("No switch combination can serve these APs.")
+        return
+    st.dataframe(
+        [{"Family": family, "Switch": model, "Quantity": quantity} for (family, model, _), quantity in plan.items],
+        use_container_width=True,
+    )
+    st.caption(f"{plan.switches_needed} switch{'es' if plan.switches_needed != 1 else ''} with "
+               f"{plan.unused_ports} spare AP port(s) and {plan.unused_power:.0f} W of spare PoE, against "
+               f"{switches['switches_needed']} x {switches['switch_model']} with {switches['unused_ports']} spare port(s).")
+
+@st.fragment
+def render_switching_panel(results: dict, switches: dict) -> None:
+    if switches["switch_option"] is not None:
+        render_switch_details(switches["switch_option"], switches["switches_needed"])
+        if st.toggle("Split across telecom closets", key="closet_mode",
+                     help="Assign the suggested AP positions to closets within copper reach, "
+                          "with the least cable, and size the switches of each closet."):
+            render_closet_split(results)
+        if st.toggle("Mix switch models", key="mixed_switches",
+                     help="The fewest switches, then the fewest rated ports, when models may be combined "
+                          "(e.g. one 48-port plus one 12-port instead of two 48-ports)."):
+            render_mixed_switches(results, switches)
+    render_bom(results["wifi_generation"], results["ap_model"], results["recommended_aps"], switches["switch_option"], switches["switches_needed"])
+
+@st.fragment
+def render_ai_panel(results: dict, switches: dict) -> None:
+    with st.expander("AI Reasoning"):
+        if get_openai_api_key() is None and "ai_reasoning" not in st.session_state:
+            st.info("AI explanations are not available: no OpenAI API key is configured.")
+        elif "ai_reasoning" not in st.session_state:
+            if st.button("Generate AI Explanation", key="ai_reasoning_btn"):
+                reasoning_text = st.write_stream(stream_ai_reasoning(
+                    wifi_generation=results["wifi_generation"],
+                    ap_model=results["ap_model"],
+                    switches_needed=switches["switches_needed"],
+                    switch_model=switches["switch_model"],
+                    switch_type=switches["switch_type"],
+                    uplink_ports=switches["uplink_ports"],
+                    uplink_speed=switches["uplink_speed"],
+                    users=results["users"],
+                    area=results["area"],
+                    recommended_aps=results["recommended_aps"],
+                    total_high_speed_ports=switches["total_high_speed_ports"],
+                    unused_ports=switches["unused_ports"],
+                    unused_high_speed_ports=switches["unused_high_speed_ports"],
+                    total_poebudget=switches["total_poebudget"],
+                    unused_power=switches["unused_power"]
+                ))
+                reasoning_text = reasoning_text.strip() if isinstance(reasoning_text, str) else AI_ERROR_MESSAGE
+                st.session_state["ai_reasoning"] = reasoning_text
+
+                log_calculation(
+                    results,
+                    ai_explanation=reasoning_text,
+                    switches_needed=switches["switches_needed"],
+                    switch_model=switches["switch_model"],
+                    source_ip="unknown"
+                )
+
+        else:
+            st.info("Explanation already generated for this scenario. Recalculate to generate a new explanation.")
+            # The generating run already showed the text via write_stream.
+            st.markdown(f"<div style='margin-bottom:20px; text-align:left;'>{st.session_state.ai_reasoning}</div>", unsafe_allow_html=True)
+
+SCENARIO_KEYS_BY_NAME = {data.name: key for key, data in SCENARIOS.items()}
+DEFAULT_BUILDING_ZONES = [
+    {"Floor": "Floor 1", "Zone": "Open plan", "Scenario": SCENARIOS["scenario_1"].name, "Area (m²)": 400.0, "Users": 60, "Ceiling (m)": 3.0},
+    {"Floor": "Floor 1", "Zone": "Meeting rooms", "Scenario": SCENARIOS["scenario_3"].name, "Area (m²)": 120.0, "Users": 30, "Ceiling (m)": 3.0},
+]
+
+def zones_from_rows(rows: list) -> tuple:
+    """Zones from the editor rows, plus a message per row that was skipped."""
+    zones, problems, seen = [], [], set()
+    for i, row in enumerate(rows, start=1):
+        values = [row.get(column) for column in ("Floor", "Zone", "Scenario", "Area (m²)", "Users")]
+        if any(value is None or value == "" for value in values):
+            continue  # still being typed
+        floor, name, scenario_name, area, users = values
+        key = (str(floor).strip(), str(name).strip())
+        if key in seen:
+            problems.append(f"Row {i}: duplicate zone {key[0]} / {key[1]}.")
+            continue
+        try:
+            ceiling = row.get("Ceiling (m)")
+            zones.append(Zone(key[0], key[1], float(area), int(users), SCENARIO_KEYS_BY_NAME.get(scenario_name, scenario_name),
+                              float(ceiling) if ceiling not in (None, "") else DEFAULT_CEILING_HEIGHT))
+        except ValueError as e:
+            problems.append(f"Row {i}: {e}")
+            continue
+        seen.add(key)
+    return zones, problems
+
+# Editing the zone table reruns only this panel; the Building in session state
+# re-sizes just the zones that changed and the totals that depend on them.
+@st.fragment
+def render_building_panel(wifi_generation: str, include_switches: bool, coverage: str) -> None:
+    building = st.session_state.get("building")
+    if building is None:
+        building = st.session_state["building"] = Building(wifi_generation, include_switches, coverage=coverage)
+    building.wifi_generation = wifi_generation
+    building.include_switches = include_switches
+    building.coverage = coverage
+
+    rows = st.data_editor(
+        DEFAULT_BUILDING_ZONES,
+        num_rows="dynamic",
+        use_container_width=True,
+        key="building_zones",
+        column_config={
+            "Scenario": st.column_config.SelectboxColumn(options=list(SCENARIO_KEYS_BY_NAME), required=True),
+            "Area (m²)": st.column_config.NumberColumn(min_value=1.0, step=10.0),
+            "Users": st.column_config.NumberColumn(min_value=1, step=1),
+            "Ceiling (m)": st.column_config.NumberColumn(min_value=2.2, max_value=5.2, step=0.2, format="%.1f"),
+        },
+    )
+    zones, problems = zones_from_rows(rows)
+    for problem in problems:
+        st.warning(problem)
+    building.update(zones)
+    if not zones:
+        st.info("Add at least one zone with floor, name, scenario, area and users.")
+        return
+
+    results = []
+    for floor, name in building.zone_keys():
+        try:
+            results.append(building.zone_result(floor, name))
+        except ValueError as e:
+            # e.g. the RF model needs more APs than it searches; the totals need every zone.
+            st.warning(f"Zone {floor} / {name} cannot be sized: {e}")
+    st.dataframe(
+        [
+            {
+                "Floor": result.zone.floor,
+                "Zone": result.zone.name,
+                "APs": result.recommended_aps,
+                "AP Model": result.ap_model,
+                "Users/AP": result.users_per_ap,
+            }
+            for result in results
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    if len(results) < len(building.zone_keys()):
+        return
+    totals = building.totals()
+    floors = building.floors()
+    summary = f"""
+    <div style="display: flex; justify-content: space-around;">
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">🏢 Quantity</h3>
+            <p style="font-size: 22px; font-weight: bold;">{totals.recommended_aps} AP{'s' if totals.recommended_aps != 1 else ''}</p>
+        </div>
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">🗺️ Zones</h3>
+            <p style="font-size: 22px; font-weight: bold;">{totals.zones} on {len(floors)} floor{'s' if len(floors) != 1 else ''}</p>
+        </div>
+        <div style="text-align: center;">
+            <h3 style="color: {GLOBAL_TEXT_COLOR};">👥 Users</h3>
+            <p style="font-size: 22px; font-weight: bold;">{totals.users}</p>
+        </div>
+    </div>
+    """
+    render_result_card("Building Sizing Results", summary.strip())
+    switch_option, switches_needed, _, _ = building.switches()
+    if include_switches and switch_option is None:
+        st.warning("No access switch in the catalog can serve these APs.")
+    if switch_option is not None:
+        render_switch_details(switch_option, switches_needed)
+    st.markdown(html.bom_lines_card(building.bom()), unsafe_allow_html=True)
+
 # ------------------------------
 # Main Application
 # ------------------------------
 def main():
-    st.markdown("""
-    <style>
-        img {
-            border-radius: 0 !important;
-        }
-    </style>
-    """, unsafe_allow_html=True) 
-
     with st.sidebar:
         st.image("images/meraki_logo.png", width=105)
         scenario_type = st.selectbox(
@@ -508,13 +709,6 @@ def main():
             area_input = st.number_input(area_label, min_value=area_min, max_value=area_max, step=area_step, value=area_default)
             ceiling_input = st.number_input(ceiling_label, min_value=ceiling_min, max_value=ceiling_max, step=ceiling_step, value=ceiling_default, format="%.1f")
             
-        # Conversion helper functions
-        def ft_to_m(feet: float) -> float:
-            return feet * 0.3048
-
-        def ft2_to_m2(ft2: float) -> float:
-            return ft2 * 0.092903
-
         if unit == "ft":
             area_m2 = ft2_to_m2(area_input)
             ceiling_m = ft_to_m(ceiling_input)
@@ -523,6 +717,18 @@ def main():
             ceiling_m = ceiling_input
 
         include_switches = st.checkbox("Include PoE Access Switch", value=True, key="include_switches")
+        rf_coverage = st.checkbox("RF coverage model", value=False, key="rf_coverage",
+                                  help="Size coverage on a signal-strength grid that accounts for ceiling height, "
+                                       "instead of a fixed area per AP.")
+        coverage = "rf" if rf_coverage else "area"
+        floor_plan_file = st.file_uploader("Floor plan (optional)", type=FLOOR_PLAN_TYPES, key="floor_plan",
+                                           help="Walls are read from the plan and replace the scenario and area; "
+                                                "sizing then uses the RF coverage model.")
+        plan_width_input = None
+        if floor_plan_file is not None:
+            plan_width_input = st.number_input(f"Plan width ({unit})", min_value=1.0, max_value=3000.0,
+                                               value=100.0 if unit == "ft" else 30.0, step=1.0, key="plan_width",
+                                               help="Real-world width of the whole image, the plan's scale reference.")
 
         space, sub = st.columns([1.8, 1], gap="small", vertical_alignment="top")
         with sub:
@@ -536,11 +742,12 @@ def main():
 
     st.subheader("Scenarios:")
     cols = st.columns(len(SCENARIOS))
+    scenario_images = load_scenario_images()
     for col, (scenario, data) in zip(cols, SCENARIOS.items()):
         with col:
-            try:
-                st.image(data.image_path, use_container_width=True)
-            except Exception:
+            if scenario_images.get(scenario) is not None:
+                st.image(scenario_images[scenario], use_container_width=True)
+            else:
                 st.write("Image not found.")
             st.markdown(
                 f"""
@@ -551,20 +758,42 @@ def main():
                 unsafe_allow_html=True
             )
 
+    floor_plan = None
+    if submitted and floor_plan_file is not None:
+        try:
+            with st.spinner("Reading floor plan..."):
+                floor_plan = load_floor_plan(floor_plan_file, ft_to_m(plan_width_input) if unit == "ft" else plan_width_input)
+        except (OSError, ValueError) as e:
+            st.warning(f"Could not read the floor plan: {e}")
+            submitted = False
+        else:
+            area_m2 = floor_plan.area
+            scenario_type = floor_plan.scenario
+            coverage = "rf"
+
+    sized = None
     if submitted:
         if area_m2 <= 0:
             st.warning("Please enter a valid area value.")
         elif users <= 0:
             st.warning("Please enter a valid number of users.")
         else:
-            recommended_aps, ap_model, users_per_ap, ap_uplink, ap_info = calculate_aps(
-                area=area_m2,
-                users=users,
-                scenario_type=scenario_type,
-                wifi_generation=wifi_generation,
-                ceiling_height=ceiling_m
-            )
-            scenario_name = SCENARIOS[scenario_type].name
+            try:
+                sized = calculate_aps(
+                    area=area_m2,
+                    users=users,
+                    scenario_type=scenario_type,
+                    wifi_generation=wifi_generation,
+                    ceiling_height=ceiling_m,
+                    coverage=coverage,
+                    floor_plan=floor_plan
+                )
+            except ValueError as e:
+                # The RF model gives up on sites needing more than coverage.MAX_APS APs.
+                st.warning(f"Could not size this site: {e}")
+        if sized is not None:
+            recommended_aps, ap_model, users_per_ap, ap_uplink, ap_info = sized
+            scenario_name = get_scenario(scenario_type).name
 
             if not include_switches:
                 switches_needed = 0
@@ -580,10 +809,13 @@ def main():
                 "ap_uplink": ap_uplink,
                 "ap_info": ap_info,
                 "scenario_name": scenario_name,
+                "scenario_type": scenario_type,
                 "wifi_generation": wifi_generation,
                 "users": users,
                 "area": area_m2,
                 "ceiling_height": ceiling_m,
+                "coverage": coverage,
+                "floor_plan": floor_plan,
                 "include_switches": include_switches
             }
             st.session_state.pop("ai_reasoning", None)
@@ -600,76 +832,9 @@ def main():
 
         st.divider()        
         
-        ap_summary = f"""
-        <div style="display: flex; justify-content: space-around;">
-            <div style="text-align: center;">
-                <h3 style="color: {GLOBAL_TEXT_COLOR};">🏢 Quantity</h3>
-                <p style="font-size: 22px; font-weight: bold;">{results['recommended_aps']} AP{'s' if results['recommended_aps'] != 1 else ''}</p>
-            </div>
-            <div style="text-align: center;">
-                <h3 style="color: {GLOBAL_TEXT_COLOR};">👥 Users/AP</h3>
-                <p style="font-size: 22px; font-weight: bold;">{results['users_per_ap']}</p>
-            </div>
-            <div style="text-align: center;">
-                <h3 style="color: {GLOBAL_TEXT_COLOR};">📡 Estimated Capacity</h3>
-                <p style="font-size: 22px; font-weight: bold;">{results['ap_uplink']} Mbps</p>
-            </div>
-        </div>
-        """
-        render_result_card("Wireless Sizing Results", ap_summary.strip())
-        render_ap_details(results["ap_info"], results["ap_model"])
-
-        switch_option = None
-        switches_needed = 0
-        switch_model = "N/A"
-        total_high_speed_ports = 0
-        unused_high_speed_ports = 0
-        total_poebudget = 0
-        unused_power = 0
-        unused_ports = 0
-        switch_type = "N/A"
-        uplink_ports = 0
-        uplink_speed = "N/A"
-
-        if st.session_state.calc_results.get("include_switches", False):
-            switch_option, switches_needed, unused_ports, unused_power = calculate_switches(
-                st.session_state.calc_results["recommended_aps"],
-                st.session_state.calc_results["ap_info"],
-                st.session_state.calc_results["ap_uplink"]
-            )
-            if switch_option is not None:
-                family, switch_model, switch_info = switch_option
-                required_speed = get_port_speed_above_capacity(results["ap_info"], ap_uplink=results["ap_uplink"] / 1000)
-                high_speed_ports = sum(
-                    group.get("Ports", 0)
-                    for group in switch_info.get("Access", [])
-                    if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed
-                )
-                total_high_speed_ports = high_speed_ports * switches_needed
-                ap_ports_required = results["recommended_aps"] * sum(item.get("Ports", 0) for item in results["ap_info"].get("Port", []))
-                unused_high_speed_ports = total_high_speed_ports - ap_ports_required
-
-                total_poebudget = switches_needed * switch_info.get("PoE Budget", 0)
-                used_power = results["recommended_aps"] * results["ap_info"].get("Power", 0)
-                unused_power = total_poebudget - used_power
-                switch_type = switch_info.get("Type", "N/A")
-                
-                uplink_list = switch_info.get("Uplink", [])
-                if uplink_list:
-                    uplink_ports = sum(item.get("Ports", 0) for item in uplink_list)
-                    uplink_speed = " / ".join("/".join(str(s) for s in item.get("Speed", [])) for item in uplink_list)
-                else:
-                    uplink_ports = 0
-                    uplink_speed = "N/A"
-
-                render_switch_details(switch_option, switches_needed)
-            else:
-                switch_option = None
-                switches_needed = 0
-                switch_type = "N/A"
-                uplink_ports = 0
-                uplink_speed = "N/A"
-        render_bom(results["recommended_aps"], results["ap_info"], switch_option, switches_needed)
+        switches = summarize_switches(results)
+        render_sizing_panel(results)
+        render_switching_panel(results, switches)
 
         st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
 
@@ -678,41 +843,7 @@ def main():
             st.session_state["scenario_key"] = current_key
             st.session_state.pop("ai_reasoning", None)
 
-        with st.expander("AI Reasoning"):
-            if "ai_reasoning" not in st.session_state:
-                if st.button("Generate AI Explanation", key="ai_reasoning_btn"):
-                    reasoning_text = generate_ai_reasoning(
-                        wifi_generation=results["wifi_generation"],
-                        ap_model=results["ap_model"],
-                        switches_needed=switches_needed,
-                        switch_model=switch_model,
-                        switch_type=switch_type,
-                        uplink_ports=uplink_ports,
-                        uplink_speed=uplink_speed,
-                        users=results["users"],
-                        area=results["area"],
-                        recommended_aps=results["recommended_aps"],
-                        total_high_speed_ports=total_high_speed_ports,
-                        unused_ports=unused_ports,
-                        unused_high_speed_ports=unused_high_speed_ports,
-                        total_poebudget=total_poebudget,
-                        unused_power=unused_power
-                    )
-                    st.session_state["ai_reasoning"] = reasoning_text
-
-                    log_calculation(
-                        st.session_state.calc_results,
-                        ai_explanation=reasoning_text,
-                        switches_needed=switches_needed,
-                        switch_model=switch_model,
-                        source_ip="unknown"
-                    )
-
-            else:
-                st.info("Explanation already generated for this scenario. Recalculate to generate a new explanation.")
-
-            if "ai_reasoning" in st.session_state:
-                st.markdown(f"<div style='margin-bottom:20px; text-align:left;'>{st.session_state.ai_reasoning}</div>", unsafe_allow_html=True)
+        render_ai_panel(results, switches)
 
         if (
             results["area"] > 1000
@@ -735,6 +866,9 @@ def main():
                 "</div>",
                 unsafe_allow_html=True
             )
+    with st.expander("Multi-zone building"):
+        render_building_panel(wifi_generation, include_switches, coverage)
+
     st.divider()
     st.markdown(
         f"""
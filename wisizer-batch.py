@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Command-line entry point for portfolio sizing; see ``wisizer/cli.py``."""
+
+import sys
+
+from wisizer.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
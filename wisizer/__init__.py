@@ -0,0 +1 @@
+"""Headless Wi-Sizer package: sizing logic usable outside of the Streamlit app."""
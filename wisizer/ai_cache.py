@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Disk-backed cache for AI explanations, shared by every process on the host.
+
+Entries live in SQLite (WAL mode, so readers never block the writer) keyed by
+a hash of the prompt, the LLM model and the catalog version. The app keys on
+the full prompt text, so a change to the instructions or the template is a
+new key. Entries
+expire after a TTL and the least recently used ones are evicted beyond
+``max_entries``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from wisizer.catalog import current_catalog
+
+DEFAULT_PATH = "ai_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+# A hit refreshes its LRU timestamp at most this often, so hot keys don't
+# turn every read into a write.
+TOUCH_INTERVAL_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS explanations (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS explanations_accessed_at ON explanations (accessed_at);
+"""
+
+
+class AICache:
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, catalog_version: Optional[str] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.catalog_version = catalog_version  # None: follow the live catalog
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> "AICache":
+        """Configure from WISIZER_AI_CACHE_PATH / _MAX_ENTRIES / _TTL_SECONDS."""
+        return cls(
+            path=os.getenv("WISIZER_AI_CACHE_PATH", DEFAULT_PATH),
+            max_entries=int(os.getenv("WISIZER_AI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            ttl_seconds=float(os.getenv("WISIZER_AI_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads; one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def key(self, **inputs) -> str:
+        """Canonical key: same inputs (in any order) and catalog -> same key."""
+        canonical = json.dumps(
+            {"catalog_version": self.catalog_version or current_catalog().version, "inputs": inputs},
+            sort_keys=True, separators=(",", ":"), default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT text, created_at, accessed_at FROM explanations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        text, created_at, accessed_at = row
+        if now - created_at > self.ttl_seconds:
+            conn.execute("DELETE FROM explanations WHERE key = ? AND created_at = ?", (key, created_at))
+            return None
+        if now - accessed_at > TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE explanations SET accessed_at = ? WHERE key = ?", (now, key))
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO explanations (key, text, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, text, now, now),
+            )
+            conn.execute("DELETE FROM explanations WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM explanations WHERE key IN ("
+                " SELECT key FROM explanations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
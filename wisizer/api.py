@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Headless sizing API: the app's sizing and BoM as JSON over HTTP.
+
+    python -m wisizer.api --port 8000 --workers 4
+
+    GET  /health           {"status": "ok", "catalog_version": ...}
+    POST /v1/size          one site -> the sized site with its BoM
+    POST /v1/size/batch    {"sites": [...]} -> {"results": [...]} in input order
+
+A site takes the batch CLI's row fields (users and area in m², optional
+ceiling_height, scenario, wifi_generation, include_switches, coverage) and comes back
+with its result fields plus ``bom`` and ``mixed_switches``, the cheapest mix
+of switch models from ``wisizer.optimizer`` next to the single-model
+recommendation (None without switches). Bad input is reported per site in
+``error``; a single site with an error is answered with 422.
+
+Connections are HTTP/1.1 keep-alive. ``--workers`` forks that many server
+processes on one listening socket after the catalog is compiled, so they
+share it copy-on-write and the kernel spreads connections across them; each
+process serves its connections on threads. Catalog reloads are picked up by
+every worker on its own.
+
+    python -m wisizer.loadgen --url http://127.0.0.1:8000    # latency percentiles
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from wisizer.bom import bom_lines
+from wisizer.catalog import current_catalog
+from wisizer.cli import DEFAULT_WIFI_GENERATION, RESULT_FIELDS, size_row
+from wisizer.engine import current_sizing
+from wisizer.optimizer import optimize_switches
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SITES = 10000
+KEEPALIVE_TIMEOUT = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def mixed_switches(num_aps: int, wifi_generation: str, ap_model: str, ap_uplink: float) -> Optional[dict]:
+    """``optimize_switches`` as JSON: the models, their quantities and the spare ports and PoE."""
+    plan = optimize_switches(num_aps, current_sizing().catalog.aps[wifi_generation][ap_model], ap_uplink)
+    if plan is None:
+        return None
+    return {
+        "switches": [{"family": family, "model": model, "quantity": quantity}
+                     for (family, model, _), quantity in plan.items],
+        "switches_needed": plan.switches_needed,
+        "unused_ports": plan.unused_ports,
+        "unused_power": plan.unused_power,
+    }
+
+
+def size_site(site: dict) -> dict:
+    """``size_row`` plus the bill of materials and the mixed switch plan, None when they do not apply."""
+    result = size_row(site)
+    result["bom"] = None
+    result["mixed_switches"] = None
+    if result["error"] is None:
+        wifi_generation = str(site.get("wifi_generation") or "").strip() or DEFAULT_WIFI_GENERATION
+        lines = bom_lines(wifi_generation, result["ap_model"], result["recommended_aps"],
+                          result["switch_family"], result["switch_model"], result["switches_needed"] or 0)
+        result["bom"] = [asdict(line) for line in lines]
+        if result["switch_model"] is not None:
+            result["mixed_switches"] = mixed_switches(result["recommended_aps"], wifi_generation,
+                                                      result["ap_model"], result["ap_uplink"])
+    return result
+
+
+def _not_an_object() -> dict:
+    result = {field: None for field in RESULT_FIELDS}
+    result.update({"error": "not a JSON object", "bom": None, "mixed_switches": None})
+    return result
+
+
+def size_sites(sites: List[dict]) -> List[dict]:
+    return [size_site(site) if isinstance(site, dict) else _not_an_object() for site in sites]
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SizingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive unless the client asks to close
+    server_version = "wisizer-api"
+    disable_nagle_algorithm = True
+    timeout = KEEPALIVE_TIMEOUT  # idle connections are dropped after this
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "catalog_version": current_catalog().version})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        try:
+            # Read the body even for unknown paths so the next request on the
+            # connection starts at the right byte.
+            body = self._read_json()
+            if self.path == "/v1/size":
+                if not isinstance(body, dict):
+                    raise _RequestError(400, "expected a JSON object")
+                result = size_site(body)
+                self._send(200 if result["error"] is None else 422, result)
+            elif self.path == "/v1/size/batch":
+                sites = body.get("sites") if isinstance(body, dict) else None
+                if not isinstance(sites, list):
+                    raise _RequestError(400, 'expected {"sites": [...]}')
+                if len(sites) > MAX_BATCH_SITES:
+                    raise _RequestError(413, f"at most {MAX_BATCH_SITES} sites per request")
+                self._send(200, {"results": size_sites(sites)})
+            else:
+                raise _RequestError(404, "not found")
+        except _RequestError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception:
+            # A bug must still get an answer rather than a dropped connection.
+            logger.exception("Error serving %s", self.path)
+            self.close_connection = True
+            self._send(500, {"error": "internal error"})
+
+    def _read_json(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            raise _RequestError(411, "Content-Length required")
+        try:
+            length = int(length)
+        except ValueError:
+            self.close_connection = True
+            raise _RequestError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise _RequestError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError as e:
+            raise _RequestError(400, f"invalid JSON: {e}")
+
+    def _send(self, status: int, payload) -> None:
+        body = _dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class SizingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 1) -> None:
+    """Serve until interrupted; ``workers`` > 1 forks processes sharing the socket (POSIX only)."""
+    server = SizingServer((host, port), SizingHandler)
+    current_sizing()  # compile before forking so workers share it
+    logger.info("Sizing API on http://%s:%d with %d worker(s), catalog %s",
+                host, server.server_address[1], workers, current_catalog().version)
+    if workers <= 1 or not hasattr(os, "fork"):
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        children.append(pid)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except (KeyboardInterrupt, SystemExit):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            os.waitpid(pid, 0)
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m wisizer.api", description="Serve the sizing engine as JSON over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Bill of materials for one sized site or building.
+
+Shared by the BoM cards (HTML) and the sizing API (JSON) so both list the same
+items, quantities and part numbers.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from wisizer.catalog import APModel, SwitchModel, current_catalog
+
+# Display order; the single-site card keeps a row slot for each.
+ITEMS = ("Access Point", "AP License", "PoE Access Switch", "Switch License")
+
+
+@dataclass(frozen=True)
+class BomLine:
+    item: str
+    quantity: int
+    part_numbers: Tuple[str, ...]  # a license line lists the tiers to choose from; empty if the SKU is unknown
+    license: bool = False
+
+
+def _part_lines(item: str, license_item: str, quantity: int, model: Union[APModel, SwitchModel]) -> List[BomLine]:
+    lines = [BomLine(item, quantity, () if model.sku is None else (model.sku,))]
+    if model.license is not None:
+        lines.append(BomLine(license_item, quantity, model.license, license=True))
+    return lines
+
+
+def _switch_lines(family: Optional[str], switch_model: Optional[str], switches_needed: int) -> List[BomLine]:
+    if switch_model is None:
+        return []
+    switch = current_catalog().switches[family][switch_model]
+    return _part_lines("PoE Access Switch", "Switch License", switches_needed, switch)
+
+
+def bom_lines(wifi_generation: str, ap_model: str, recommended_aps: int,
+              family: Optional[str] = None, switch_model: Optional[str] = None,
+              switches_needed: int = 0) -> List[BomLine]:
+    """BoM lines in ``ITEMS`` order; the switch lines are left out when ``switch_model`` is None."""
+    ap = current_catalog().aps[wifi_generation][ap_model]
+    return _part_lines("Access Point", "AP License", recommended_aps, ap) + _switch_lines(family, switch_model, switches_needed)
+
+
+def merge_lines(lines: Iterable[BomLine]) -> List[BomLine]:
+    """Sum quantities of identical parts and order the result by ``ITEMS``."""
+    merged: Dict[Tuple[str, Tuple[str, ...]], BomLine] = {}
+    for line in lines:
+        key = (line.item, line.part_numbers)
+        previous = merged.get(key)
+        merged[key] = line if previous is None else replace(previous, quantity=previous.quantity + line.quantity)
+    return sorted(merged.values(), key=lambda line: ITEMS.index(line.item))
+
+
+def building_bom_lines(wifi_generation: str, ap_counts: Dict[str, int],
+                       family: Optional[str] = None, switch_model: Optional[str] = None,
+                       switches_needed: int = 0) -> List[BomLine]:
+    """BoM for several AP models (``{model: quantity}``) on one switch recommendation."""
+    models = current_catalog().aps[wifi_generation]
+    lines = [
+        line
+        for ap_model, quantity in ap_counts.items()
+        for line in _part_lines("Access Point", "AP License", quantity, models[ap_model])
+    ]
+    return merge_lines(lines + _switch_lines(family, switch_model, switches_needed))
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""Multi-floor, multi-zone buildings.
+
+A building is a set of floors, each with zones of their own scenario (open
+plan next to meeting rooms, say). Every zone is sized with ``calculate_aps``;
+the AP totals then feed one ``calculate_switches`` and one bill of materials
+for the whole building.
+
+Results live in a small dependency graph: zone -> floor totals -> building
+totals -> switches -> BoM. Editing a zone marks only that zone and the nodes
+downstream of it stale, and they are recomputed on the next read, so a
+40-zone campus re-sizes one zone and a handful of sums per edit.
+
+With telecom closets and zone centroids, ``closet_switches`` splits the APs
+across closets within copper reach and sizes the switches of each.
+
+    python -m wisizer.building    # full build vs one-zone edit on a 40-zone campus
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from data.scenarios import SCENARIOS
+from wisizer.bom import BomLine, building_bom_lines
+from wisizer.catalog import APModel
+from wisizer.engine import calculate_aps, calculate_switches, current_sizing
+
+if TYPE_CHECKING:
+    from wisizer.closets import Assignment, Closet, ClosetSwitches
+
+DEFAULT_SCENARIO = "scenario_1"
+DEFAULT_WIFI_GENERATION = "Wi-Fi 6"
+DEFAULT_CEILING_HEIGHT = 3.0
+
+_MISSING = object()
+
+
+class DependencyGraph:
+    """Values computed on demand, each from the nodes it declares as inputs.
+
+    ``invalidate`` drops a node's value and everything downstream of it;
+    ``get`` recomputes only dropped values. ``evaluations`` counts compute
+    calls.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[Hashable, Tuple[Callable[[], Any], Tuple[Hashable, ...]]] = {}
+        self._dependents: Dict[Hashable, Set[Hashable]] = defaultdict(set)
+        self._values: Dict[Hashable, Any] = {}
+        self.evaluations = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._nodes
+
+    def define(self, key: Hashable, compute: Callable[[], Any], inputs: Iterable[Hashable] = ()) -> None:
+        """Add or replace a node; ``compute`` reads its inputs through ``get``."""
+        self._unlink(key)
+        inputs = tuple(inputs)
+        self._nodes[key] = (compute, inputs)
+        for source in inputs:
+            self._dependents[source].add(key)
+        self.invalidate(key)
+
+    def remove(self, key: Hashable) -> None:
+        self.invalidate(key)
+        self._unlink(key)
+        self._nodes.pop(key, None)
+
+    def _unlink(self, key: Hashable) -> None:
+        node = self._nodes.get(key)
+        if node is not None:
+            for source in node[1]:
+                self._dependents[source].discard(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        stack = [key]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            self._values.pop(node, None)
+            stack.extend(self._dependents.get(node, ()))
+
+    def get(self, key: Hashable) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            compute, _ = self._nodes[key]
+            value = self._values[key] = compute()
+            self.evaluations += 1
+        return value
+
+
+@dataclass(frozen=True)
+class Zone:
+    floor: str
+    name: str
+    area: float  # m²
+    users: int
+    scenario: str = DEFAULT_SCENARIO
+    ceiling_height: float = DEFAULT_CEILING_HEIGHT
+
+    def __post_init__(self):
+        if self.area <= 0:
+            raise ValueError(f"{self.floor}/{self.name}: area must be positive")
+        if self.users <= 0:
+            raise ValueError(f"{self.floor}/{self.name}: users must be positive")
+        if self.scenario not in SCENARIOS:
+            raise ValueError(f"{self.floor}/{self.name}: unknown scenario {self.scenario!r}")
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.floor, self.name
+
+
+@dataclass(frozen=True)
+class ZoneResult:
+    zone: Zone
+    recommended_aps: int
+    ap_model: str
+    users_per_ap: int
+    ap_uplink: float
+
+
+@dataclass(frozen=True)
+class Totals:
+    """AP and demand totals of a floor or of the whole building."""
+    zones: int
+    users: int
+    area: float
+    recommended_aps: int
+    ap_counts: Dict[str, int]  # AP model -> quantity, first-seen order
+
+
+def _sum_totals(parts: Iterable[Totals]) -> Totals:
+    zones = users = recommended_aps = 0
+    area = 0.0
+    ap_counts: Dict[str, int] = {}
+    for part in parts:
+        zones += part.zones
+        users += part.users
+        area += part.area
+        recommended_aps += part.recommended_aps
+        for model, quantity in part.ap_counts.items():
+            ap_counts[model] = ap_counts.get(model, 0) + quantity
+    return Totals(zones, users, area, recommended_aps, ap_counts)
+
+
+def _zone_totals(result: ZoneResult) -> Totals:
+    return Totals(1, result.zone.users, result.zone.area, result.recommended_aps, {result.ap_model: result.recommended_aps})
+
+
+def design_ap(aps: Iterable[APModel]) -> Optional[APModel]:
+    """The most demanding AP of a mixed building: fastest port needed, then most PoE, then most ports.
+
+    Sizing every AP as this one keeps a single switch recommendation on the
+    safe side of port speed, port count and PoE budget.
+    """
+    return max(aps, key=lambda ap: (ap.port_speed_above(ap.uplink / 1000), ap.power or 0, ap.total_ports), default=None)
+
+
+class Building:
+    """Zones by floor, with incrementally maintained sizing results."""
+
+    def __init__(self, wifi_generation: str = DEFAULT_WIFI_GENERATION, include_switches: bool = True,
+                 zones: Iterable[Zone] = (), coverage: str = "area"):
+        self._wifi_generation = wifi_generation
+        self._include_switches = include_switches
+        self._coverage = coverage
+        self._floors: Dict[str, Dict[str, Zone]] = {}
+        self._sizing = current_sizing()
+        self.graph = DependencyGraph()
+        self.graph.define("building", self._building_totals)
+        self.graph.define("switches", self._switches, ["building"])
+        self.graph.define("bom", self._bom, ["building", "switches"])
+        for zone in zones:
+            self.set_zone(zone)
+
+    # -- editing ------------------------------------------------------------
+
+    @property
+    def wifi_generation(self) -> str:
+        return self._wifi_generation
+
+    @wifi_generation.setter
+    def wifi_generation(self, value: str) -> None:
+        if value != self._wifi_generation:
+            self._wifi_generation = value
+            self._invalidate_zones()
+
+    @property
+    def coverage(self) -> str:
+        """Coverage model passed to ``calculate_aps`` for every zone."""
+        return self._coverage
+
+    @coverage.setter
+    def coverage(self, value: str) -> None:
+        if value != self._coverage:
+            self._coverage = value
+            self._invalidate_zones()
+
+    @property
+    def include_switches(self) -> bool:
+        return self._include_switches
+
+    @include_switches.setter
+    def include_switches(self, value: bool) -> None:
+        if value != self._include_switches:
+            self._include_switches = value
+            self.graph.invalidate("switches")
+
+    def set_zone(self, zone: Zone) -> None:
+        """Add ``zone`` or replace the zone with the same floor and name; unchanged zones are a no-op."""
+        zones = self._floors.get(zone.floor)
+        if zones is None:
+            zones = self._floors[zone.floor] = {}
+            self._define_building()
+        previous = zones.get(zone.name)
+        if previous == zone:
+            return
+        zones[zone.name] = zone
+        self.graph.define(("zone",) + zone.key, lambda: self._size_zone(zone))
+        if previous is None:
+            self._define_floor(zone.floor)
+
+    def remove_zone(self, floor: str, name: str) -> None:
+        zones = self._floors.get(floor, {})
+        if zones.pop(name, None) is None:
+            return
+        self.graph.remove(("zone", floor, name))
+        if zones:
+            self._define_floor(floor)
+        else:
+            del self._floors[floor]
+            self.graph.remove(("floor", floor))
+            self._define_building()
+
+    def update(self, zones: Iterable[Zone]) -> int:
+        """Make the building hold exactly ``zones``; returns how many zones were added, changed or removed."""
+        wanted = {zone.key: zone for zone in zones}
+        changed = 0
+        for key in [key for key in self.zone_keys() if key not in wanted]:
+            self.remove_zone(*key)
+            changed += 1
+        for key, zone in wanted.items():
+            if self._floors.get(zone.floor, {}).get(zone.name) != zone:
+                self.set_zone(zone)
+                changed += 1
+        return changed
+
+    def _define_floor(self, floor: str) -> None:
+        inputs = [("zone", floor, name) for name in self._floors[floor]]
+        self.graph.define(("floor", floor), lambda: _sum_totals(_zone_totals(self.graph.get(key)) for key in inputs), inputs)
+
+    def _define_building(self) -> None:
+        self.graph.define("building", self._building_totals, [("floor", floor) for floor in self._floors])
+
+    def _invalidate_zones(self) -> None:
+        for floor, zones in self._floors.items():
+            for name in zones:
+                self.graph.invalidate(("zone", floor, name))
+
+    def _check_catalog(self) -> None:
+        # A catalog reload can change every zone's model and the switch pick.
+        sizing = current_sizing()
+        if sizing is not self._sizing:
+            self._sizing = sizing
+            self._invalidate_zones()
+            self.graph.invalidate("switches")
+
+    # -- nodes --------------------------------------------------------------
+
+    def _size_zone(self, zone: Zone) -> ZoneResult:
+        recommended_aps, ap_model, users_per_ap, ap_uplink, _ = calculate_aps(
+            zone.area, zone.users, zone.scenario, self._wifi_generation, zone.ceiling_height, coverage=self._coverage
+        )
+        return ZoneResult(zone, recommended_aps, ap_model, users_per_ap, ap_uplink)
+
+    def _building_totals(self) -> Totals:
+        return _sum_totals(self.graph.get(("floor", floor)) for floor in self._floors)
+
+    def _switches(self) -> Tuple[Optional[tuple], Optional[int], Optional[int], Optional[float]]:
+        if not self._include_switches:
+            return None, None, None, None
+        totals = self.graph.get("building")
+        models = self._sizing.catalog.aps[self._wifi_generation]
+        ap = design_ap(models[model] for model in totals.ap_counts)
+        if ap is None:
+            return None, None, None, None
+        return calculate_switches(totals.recommended_aps, ap, ap.uplink)
+
+    def _bom(self) -> List[BomLine]:
+        totals = self.graph.get("building")
+        switch_option, switches_needed, _, _ = self.graph.get("switches")
+        family, switch_model = (switch_option[0], switch_option[1]) if switch_option is not None else (None, None)
+        return building_bom_lines(self._wifi_generation, totals.ap_counts, family, switch_model, switches_needed or 0)
+
+    # -- results ------------------------------------------------------------
+
+    def floors(self) -> List[str]:
+        return list(self._floors)
+
+    def zone_keys(self) -> List[Tuple[str, str]]:
+        return [(floor, name) for floor, zones in self._floors.items() for name in zones]
+
+    def zone_result(self, floor: str, name: str) -> ZoneResult:
+        self._check_catalog()
+        return self.graph.get(("zone", floor, name))
+
+    def zone_results(self) -> List[ZoneResult]:
+        self._check_catalog()
+        return [self.graph.get(("zone",) + key) for key in self.zone_keys()]
+
+    def floor_totals(self, floor: str) -> Totals:
+        self._check_catalog()
+        return self.graph.get(("floor", floor))
+
+    def totals(self) -> Totals:
+        self._check_catalog()
+        return self.graph.get("building")
+
+    def switches(self) -> Tuple[Optional[tuple], Optional[int], Optional[int], Optional[float]]:
+        """``calculate_switches`` for all of the building's APs as one pool (see ``design_ap``)."""
+        self._check_catalog()
+        return self.graph.get("switches")
+
+    def bom(self) -> List[BomLine]:
+        self._check_catalog()
+        return self.graph.get("bom")
+
+    def closet_switches(self, closets: Sequence["Closet"], centroids: Dict[Tuple[str, str], Tuple[float, float]]
+                        ) -> Tuple["Assignment", List["ClosetSwitches"]]:
+        """Switches per telecom closet instead of one pool (see ``wisizer.closets``).
+
+        Each zone's APs are placed at its centroid, keyed by zone key, in metres.
+        A closet's ``floor`` is its floor's index in ``floors()``. Zones without
+        a centroid are left out.
+        """
+        # NumPy-based; imported only when closets are used.
+        from wisizer.closets import assign_aps, closet_switches
+        self._check_catalog()
+        floor_index = {floor: i for i, floor in enumerate(self._floors)}
+        points, counts, models = [], [], set()
+        for result in self.zone_results():
+            centroid = centroids.get(result.zone.key)
+            if centroid is not None:
+                points.append((centroid[0], centroid[1], floor_index[result.zone.floor]))
+                counts.append(result.recommended_aps)
+                models.add(result.ap_model)
+        assignment = assign_aps(points, closets, counts)
+        catalog_models = self._sizing.catalog.aps[self._wifi_generation]
+        ap = design_ap(catalog_models[model] for model in models)
+        if ap is None:
+            return assignment, []
+        return assignment, closet_switches(assignment, closets, ap, ap.uplink)
+
+
+def _benchmark(floors: int = 4, zones_per_floor: int = 10, edits: int = 2000) -> None:
+    from timeit import timeit
+
+    scenarios = list(SCENARIOS)
+    zones = [
+        Zone(f"Floor {f + 1}", f"Zone {z + 1}", area=80.0 + 37 * z, users=10 + 7 * z + f, scenario=scenarios[z % len(scenarios)])
+        for f in range(floors)
+        for z in range(zones_per_floor)
+    ]
+
+    def full() -> None:
+        building = Building("Wi-Fi 6", zones=zones)
+        building.bom()
+
+    building = Building("Wi-Fi 6", zones=zones)
+    building.bom()
+    before = building.graph.evaluations
+    step = [len(zones) - 1]
+
+    def edit() -> None:
+        step[0] += 1
+        zone = zones[step[0] % len(zones)]
+        # Each visit to a zone flips its user count, so every edit is a real change.
+        building.set_zone(Zone(zone.floor, zone.name, zone.area, zone.users + (step[0] // len(zones)) % 2, zone.scenario))
+        building.bom()
+
+    full_ms = timeit(full, number=200) / 200 * 1000
+    edit_ms = timeit(edit, number=edits) / edits * 1000
+    per_edit = (building.graph.evaluations - before) / edits
+    print(f"{len(zones)} zones: full build {full_ms:.3f} ms, one-zone edit {edit_ms:.3f} ms "
+          f"({per_edit:.1f} of {len(zones) + floors + 3} nodes recomputed)")
+
+
+if __name__ == "__main__":
+    _benchmark()
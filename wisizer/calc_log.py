@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Calculation log that never blocks the caller on disk I/O.
+
+``CalculationLogger.log`` only puts the entry on a bounded queue. A daemon
+thread drains it in batches and appends JSON lines to the log file while
+holding an exclusive file lock, so several app processes can share one file
+without interleaving partial lines. The file is rotated by size; with
+``backup_count=0`` it is truncated instead.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_PATH = "logs.jsonl"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+logger = logging.getLogger(__name__)
+
+
+class _FileLock:
+    """Exclusive inter-process lock on a sidecar ``.lock`` file."""
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+
+class CalculationLogger:
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT, queue_size: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=queue_size)
+        self._lock = _FileLock(path)
+        self._thread = threading.Thread(target=self._run, name="calc-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, entry: dict) -> None:
+        """Queue a copy of ``entry``; if the writer has fallen behind, drop it rather than wait."""
+        entry = dict(entry)
+        entry.setdefault("timestamp", datetime.now().isoformat(timespec="milliseconds"))
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Sessions log from their own threads.
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush what is queued and stop the writer thread."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[dict] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error("Could not write %d calculation log entries: %s", len(batch), e)
+
+    def _write(self, batch: List[dict]) -> None:
+        data = "".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in batch)
+        with self._lock:
+            self._rotate_if_needed()
+            # Opened per batch so every process follows a rotation immediately.
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+
+    def _rotate_if_needed(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self.max_bytes:
+            return
+        if self.backup_count <= 0:
+            # No backups to keep: start over rather than grow without bound.
+            open(self.path, "w").close()
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""AP and switch catalogs: loading, validation, compiled model objects.
+
+The catalogs are read from ``data/ap_models.json`` and
+``data/switch_models.json`` (or ``WISIZER_CATALOG_DIR``), validated, and
+compiled into frozen, slotted objects with the derived numbers the sizing math
+needs (total ports, sorted port speeds, effective capacity, access ports per
+speed), so hot paths read attributes instead of walking nested dicts. Each
+object keeps the catalog entry it came from in ``info``, and ``calculate_aps``
+still returns those dicts.
+
+``current_catalog()`` is the live version. Edits to the files are picked up by
+running processes without a restart, and every version carries content
+hashes that callers put into their cache keys.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+AP_FILE = "ap_models.json"
+SWITCH_FILE = "switch_models.json"
+CHECK_INTERVAL_SECONDS = 2.0
+
+REQUIRED_AP_FIELDS = ("Port", "Capacity", "Max Users", "SKU")
+REQUIRED_SWITCH_FIELDS = ("Access", "PoE Budget", "SKU")
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogError(ValueError):
+    """A catalog entry is missing a field or has one of the wrong type."""
+
+
+@dataclass(frozen=True)
+class PortGroup:
+    __slots__ = ("ports", "speeds")
+    ports: Optional[int]
+    speeds: Tuple[float, ...]  # as listed in the catalog
+
+
+@dataclass(frozen=True)
+class APModel:
+    __slots__ = (
+        "generation", "name", "standard", "spatial_streams", "poe_type", "power", "max_users",
+        "capacity_24ghz", "capacity_5ghz", "capacity_6ghz", "effective_capacity", "uplink",
+        "ports", "total_ports", "port_speeds", "sku", "license", "datasheet", "installation_guide", "info",
+    )
+    generation: str
+    name: str
+    standard: Optional[str]
+    spatial_streams: Optional[str]
+    poe_type: Optional[str]
+    power: Optional[float]
+    max_users: int
+    capacity_24ghz: float
+    capacity_5ghz: float
+    capacity_6ghz: float
+    effective_capacity: float  # 5 GHz plus 6 GHz when the model has a 6 GHz radio
+    uplink: int  # Mbps, all radios
+    ports: Tuple[PortGroup, ...]
+    total_ports: int
+    port_speeds: Tuple[float, ...]  # distinct, ascending
+    sku: Optional[str]
+    license: Optional[Tuple[str, str]]  # (Enterprise, Advanced)
+    datasheet: Optional[str]
+    installation_guide: Optional[str]
+    info: dict
+
+    def port_speed_above(self, ap_uplink: float) -> float:
+        """Slowest port speed above ``ap_uplink`` (Gbps), else the fastest; 1 with no port data."""
+        if not self.port_speeds:
+            return 1
+        for speed in self.port_speeds:
+            if speed > ap_uplink:
+                return speed
+        return self.port_speeds[-1]
+
+
+@dataclass(frozen=True)
+class SwitchModel:
+    __slots__ = (
+        "family", "name", "type", "poe_type", "poe_budget", "access", "uplinks",
+        "uplink_ports", "rated_ports", "sku", "license", "datasheet", "installation_guide", "info",
+    )
+    family: str
+    name: str
+    type: Optional[str]
+    poe_type: Optional[str]
+    poe_budget: float
+    access: Tuple[PortGroup, ...]
+    uplinks: Tuple[PortGroup, ...]
+    uplink_ports: int
+    rated_ports: int  # access ports at any speed
+    sku: Optional[str]
+    license: Optional[Tuple[str, str]]
+    datasheet: Optional[str]
+    installation_guide: Optional[str]
+    info: dict
+
+    def ports_at(self, speed: float) -> int:
+        """Access ports whose fastest speed reaches ``speed``."""
+        return sum(group.ports or 0 for group in self.access if group.speeds and max(group.speeds) >= speed)
+
+
+def _number(value, where: str, field: str, default=0):
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise CatalogError(f"{where}: {field} must be a non-negative number, got {value!r}")
+    return value
+
+
+def _port_groups(groups, where: str, field: str) -> Tuple[PortGroup, ...]:
+    if groups is None:
+        return ()
+    if not isinstance(groups, list):
+        raise CatalogError(f"{where}: {field} must be a list")
+    compiled = []
+    for group in groups:
+        if not isinstance(group, dict):
+            raise CatalogError(f"{where}: {field} entries must be objects")
+        ports = group.get("Ports")
+        if ports is not None and (isinstance(ports, bool) or not isinstance(ports, int) or ports < 0):
+            raise CatalogError(f"{where}: {field} Ports must be a non-negative integer, got {ports!r}")
+        speeds = group.get("Speed", [])
+        if not isinstance(speeds, list):
+            # The sizing math has always ignored non-list speeds.
+            speeds = []
+        compiled.append(PortGroup(ports, tuple(_number(s, where, f"{field} Speed") for s in speeds)))
+    return tuple(compiled)
+
+
+def _license(info: dict, where: str) -> Optional[Tuple[str, str]]:
+    licenses = info.get("License", [])
+    if not licenses:
+        return None
+    if not isinstance(licenses, list) or not isinstance(licenses[0], dict):
+        raise CatalogError(f"{where}: License must be a list of objects")
+    return licenses[0].get("Enterprise", ""), licenses[0].get("Advanced", "")
+
+
+def _text(info: dict, key: str, where: str) -> Optional[str]:
+    value = info.get(key)
+    if value is not None and not isinstance(value, str):
+        raise CatalogError(f"{where}: {key} must be a string, got {value!r}")
+    return value
+
+
+def compile_ap(generation: str, name: str, info: dict) -> APModel:
+    where = f"AP_MODELS[{generation!r}][{name!r}]"
+    if not isinstance(info, dict):
+        raise CatalogError(f"{where} must be an object")
+    capacity = info.get("Capacity", {})
+    if not isinstance(capacity, dict):
+        raise CatalogError(f"{where}: Capacity must be an object")
+    capacity_24ghz = _number(capacity.get("2.4GHz"), where, "Capacity 2.4GHz")
+    capacity_5ghz = _number(capacity.get("5GHz"), where, "Capacity 5GHz")
+    capacity_6ghz = _number(capacity.get("6GHz"), where, "Capacity 6GHz")
+    max_users = _number(info.get("Max Users"), where, "Max Users")
+    if not isinstance(max_users, int):
+        raise CatalogError(f"{where}: Max Users must be an integer, got {max_users!r}")
+    ports = _port_groups(info.get("Port", []), where, "Port")
+    return APModel(
+        generation=generation,
+        name=name,
+        standard=_text(info, "Wi-Fi Standard", where),
+        spatial_streams=_text(info, "Spatial Streams", where),
+        poe_type=_text(info, "PoE Type", where),
+        power=_number(info.get("Power"), where, "Power", default=None),
+        max_users=max_users,
+        capacity_24ghz=capacity_24ghz,
+        capacity_5ghz=capacity_5ghz,
+        capacity_6ghz=capacity_6ghz,
+        effective_capacity=capacity_5ghz + capacity_6ghz if capacity_6ghz > 0 else capacity_5ghz,
+        uplink=math.ceil(capacity_24ghz + capacity_5ghz + capacity_6ghz),
+        ports=ports,
+        total_ports=sum(group.ports or 0 for group in ports),
+        port_speeds=tuple(sorted({speed for group in ports for speed in group.speeds})),
+        sku=_text(info, "SKU", where),
+        license=_license(info, where),
+        datasheet=_text(info, "Datasheet", where),
+        installation_guide=_text(info, "Installation Guide", where),
+        info=info,
+    )
+
+
+def compile_switch(family: str, name: str, info: dict) -> SwitchModel:
+    where = f"SWITCH_MODELS[{family!r}][{name!r}]"
+    if not isinstance(info, dict):
+        raise CatalogError(f"{where} must be an object")
+    access = _port_groups(info.get("Access", []), where, "Access")
+    uplinks = _port_groups(info.get("Uplink", []), where, "Uplink")
+    return SwitchModel(
+        family=family,
+        name=name,
+        type=_text(info, "Type", where),
+        poe_type=_text(info, "PoE Type", where),
+        poe_budget=_number(info.get("PoE Budget"), where, "PoE Budget"),
+        access=access,
+        uplinks=uplinks,
+        uplink_ports=sum(group.ports or 0 for group in uplinks),
+        rated_ports=sum(group.ports or 0 for group in access),
+        sku=_text(info, "SKU", where),
+        license=_license(info, where),
+        datasheet=_text(info, "Datasheet", where),
+        installation_guide=_text(info, "Installation Guide", where),
+        info=info,
+    )
+
+
+def catalog_version(*catalogs: dict) -> str:
+    """Short content hash of catalog dicts; changes whenever any model changes."""
+    canonical = json.dumps(catalogs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def _check_shape(catalog, name: str, required: Tuple[str, ...]) -> None:
+    """``{group: {model: {field: ...}}}`` with every ``required`` field present."""
+    if not isinstance(catalog, dict):
+        raise CatalogError(f"{name} must be an object of groups")
+    for group, entries in catalog.items():
+        if not isinstance(entries, dict) or not entries:
+            raise CatalogError(f"{name}[{group!r}] must be a non-empty object of models")
+        for model, info in entries.items():
+            if not isinstance(info, dict):
+                raise CatalogError(f"{name}[{group!r}][{model!r}] must be an object")
+            missing = [field for field in required if field not in info]
+            if missing:
+                raise CatalogError(f"{name}[{group!r}][{model!r}]: missing {', '.join(missing)}")
+
+
+@dataclass(frozen=True, eq=False)
+class Catalog:
+    """One compiled, internally consistent version of both catalogs.
+
+    ``generation_versions`` and ``switch_version`` hash each part on its own,
+    so caches that depend on one generation survive changes elsewhere.
+    """
+    ap_models: Dict[str, Dict[str, dict]]
+    switch_models: Dict[str, Dict[str, dict]]
+    aps: Dict[str, Dict[str, APModel]]  # generation -> model
+    switches: Dict[str, Dict[str, SwitchModel]]  # family -> model
+    version: str
+    generation_versions: Dict[str, str]
+    switch_version: str
+    _by_info: Dict[int, APModel] = field(repr=False)
+
+    def as_ap(self, ap: Union[APModel, dict]) -> APModel:
+        """The compiled model for a catalog dict (or any AP dict, compiled on the fly)."""
+        if isinstance(ap, APModel):
+            return ap
+        compiled = self._by_info.get(id(ap))
+        if compiled is None or compiled.info is not ap:
+            compiled = compile_ap("", "", ap)
+        return compiled
+
+
+def build_catalog(ap_models: dict, switch_models: dict, previous: Optional[Catalog] = None) -> Catalog:
+    """Validate and compile both catalogs.
+
+    Generations (and the switch catalog) whose content hash matches
+    ``previous`` keep their compiled objects and dicts as they were.
+    """
+    _check_shape(ap_models, "AP_MODELS", REQUIRED_AP_FIELDS)
+    _check_shape(switch_models, "SWITCH_MODELS", REQUIRED_SWITCH_FIELDS)
+    models: Dict[str, Dict[str, dict]] = {}
+    aps: Dict[str, Dict[str, APModel]] = {}
+    generation_versions: Dict[str, str] = {}
+    for generation, entries in ap_models.items():
+        version = catalog_version(entries)
+        if previous is not None and previous.generation_versions.get(generation) == version:
+            models[generation], aps[generation] = previous.ap_models[generation], previous.aps[generation]
+        else:
+            models[generation] = entries
+            aps[generation] = {name: compile_ap(generation, name, info) for name, info in entries.items()}
+        generation_versions[generation] = version
+
+    switch_version = catalog_version(switch_models)
+    if previous is not None and previous.switch_version == switch_version:
+        switch_models, switches = previous.switch_models, previous.switches
+    else:
+        switches = {
+            family: {name: compile_switch(family, name, info) for name, info in entries.items()}
+            for family, entries in switch_models.items()
+        }
+    return Catalog(
+        ap_models=models,
+        switch_models=switch_models,
+        aps=aps,
+        switches=switches,
+        version=catalog_version(models, switch_models),
+        generation_versions=generation_versions,
+        switch_version=switch_version,
+        _by_info={id(ap.info): ap for entries in aps.values() for ap in entries.values()},
+    )
+
+
+class CatalogStore:
+    """The current catalog, reloaded when its JSON files change.
+
+    ``current`` stats the files at most every ``check_interval`` seconds and
+    only reads them when size or mtime moved; a rewrite with identical bytes
+    keeps the current catalog. A new catalog is compiled off to the side and
+    swapped in with one reference assignment, so readers always see a whole
+    version. Files that fail to parse or validate are logged and the last
+    good catalog stays in service.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.ap_path = os.path.join(directory, AP_FILE)
+        self.switch_path = os.path.join(directory, SWITCH_FILE)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._digest = None
+        self._next_check = 0.0
+        self._catalog: Optional[Catalog] = None
+        # The first load has nothing to fall back to, so errors propagate.
+        self._load(self._stat())
+
+    @classmethod
+    def from_env(cls) -> "CatalogStore":
+        return cls(
+            directory=os.getenv("WISIZER_CATALOG_DIR", DEFAULT_DIR),
+            check_interval=float(os.getenv("WISIZER_CATALOG_CHECK_SECONDS", CHECK_INTERVAL_SECONDS)),
+        )
+
+    def current(self) -> Catalog:
+        if time.monotonic() >= self._next_check:
+            self.check()
+        return self._catalog
+
+    def check(self) -> None:
+        """Reload now if the files changed; another thread already checking wins."""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = self._stat()
+            if stamp != self._stamp:
+                self._load(stamp)
+        except (OSError, ValueError) as e:
+            logger.error("Catalog reload failed, keeping version %s: %s", self._catalog.version, e)
+        finally:
+            self._lock.release()
+
+    def _stat(self) -> Tuple[Tuple[int, int], ...]:
+        return tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, (self.ap_path, self.switch_path)))
+
+    def _load(self, stamp) -> None:
+        # Recorded first so a broken file is reported once, not on every check.
+        self._stamp = stamp
+        with open(self.ap_path, "rb") as f:
+            ap_bytes = f.read()
+        with open(self.switch_path, "rb") as f:
+            switch_bytes = f.read()
+        digest = hashlib.sha256(ap_bytes + b"\0" + switch_bytes).digest()
+        if digest == self._digest:
+            return
+        catalog = build_catalog(json.loads(ap_bytes), json.loads(switch_bytes), previous=self._catalog)
+        self._digest = digest
+        if self._catalog is not None:
+            if catalog.version == self._catalog.version:
+                return  # reformatted, same content
+            logger.info("Catalog reloaded: version %s -> %s", self._catalog.version, catalog.version)
+        self._catalog = catalog
+
+
+STORE = CatalogStore.from_env()
+
+
+def current_catalog() -> Catalog:
+    return STORE.current()
+
+
+def as_ap(ap: Union[APModel, dict]) -> APModel:
+    return current_catalog().as_ap(ap)
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Channel plans for placed APs.
+
+Two APs interfere when they are within the overlap radius of each other:
+by default, the distance at which the RF model of ``wisizer.coverage``
+drops to the -82 dBm clear-channel threshold. Neighbours are found with the
+``SpatialHash`` from ``wisizer.placement``, so building the interference
+graph costs one radius query per AP instead of comparing every pair.
+
+Each band is planned on its own: 5 GHz for every generation, plus 6 GHz for
+Wi-Fi 6E and 7. Channels are coloured DSATUR-style: the next AP is the one
+whose neighbours already use the most distinct channels, ties going to the
+most neighbours. It takes the channel fewest neighbours use. A repair pass
+then moves any AP still sharing a channel with a neighbour to the
+channel least used around it, until nothing improves.
+
+    python -m wisizer.channels    # 5,000-AP campus
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from wisizer.coverage import service_radius
+from wisizer.placement import SpatialHash
+
+CCA_THRESHOLD_DBM = -82.0  # a co-channel AP heard above this defers transmissions
+FLOOR_HEIGHT_M = 4.0  # vertical spacing when positions carry a floor index
+MAX_REPAIR_PASSES = 10
+
+GENERATION_BANDS = {
+    "Wi-Fi 6": ("5 GHz",),
+    "Wi-Fi 6E": ("5 GHz", "6 GHz"),
+    "Wi-Fi 7": ("5 GHz", "6 GHz"),
+}
+DEFAULT_WIDTHS = {"5 GHz": 20, "6 GHz": 80}
+
+# 20 MHz channels in contiguous blocks; wider channels bond aligned runs
+# inside one block and are named by their centre channel.
+_BLOCKS = {
+    "5 GHz": (tuple(range(36, 65, 4)), tuple(range(100, 145, 4)), tuple(range(149, 166, 4))),
+    "6 GHz": (tuple(range(1, 234, 4)),),
+}
+_DFS_5GHZ = frozenset(range(52, 145, 4))
+
+
+def band_channels(band: str, width: int = 20, include_dfs: bool = True) -> Tuple[int, ...]:
+    """Channel numbers usable at ``width`` MHz in ``band``."""
+    if width not in (20, 40, 80):
+        raise ValueError(f"unsupported channel width: {width} MHz")
+    if band not in _BLOCKS:
+        raise ValueError(f"unknown band: {band!r}")
+    size = width // 20
+    channels = []
+    for block in _BLOCKS[band]:
+        for start in range(0, len(block) - size + 1, size):
+            bonded = block[start:start + size]
+            if band == "5 GHz" and not include_dfs and _DFS_5GHZ.intersection(bonded):
+                continue
+            channels.append(sum(bonded) // size)
+    return tuple(channels)
+
+
+def interference_graph(positions: np.ndarray, radius: float) -> List[np.ndarray]:
+    """Neighbour indices of every AP within ``radius``.
+
+    ``positions`` is (n, 2) in metres, or (n, 3) with a floor index as the
+    third column, in which case distance includes ``FLOOR_HEIGHT_M`` per floor.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 0:
+        return []
+    flat = positions[:, :2]
+    z = positions[:, 2] * FLOOR_HEIGHT_M if positions.shape[1] > 2 else None
+    index = SpatialHash(flat, radius)
+    neighbours = []
+    for i, (x, y) in enumerate(flat):
+        near = index.query(x, y, radius)
+        if z is not None:
+            horizontal2 = (flat[near, 0] - x) ** 2 + (flat[near, 1] - y) ** 2
+            near = near[horizontal2 + (z[near] - z[i]) ** 2 <= radius * radius]
+        neighbours.append(near[near != i])
+    return neighbours
+
+
+@dataclass(frozen=True)
+class ChannelPlan:
+    band: str
+    width: int
+    channels: Tuple[int, ...]  # per AP, in input order
+    co_channel: Tuple[int, ...]  # per AP, neighbours on the same channel
+
+    @property
+    def conflicts(self) -> int:
+        """Interfering AP pairs sharing a channel."""
+        return sum(self.co_channel) // 2
+
+    @property
+    def max_co_channel(self) -> int:
+        return max(self.co_channel, default=0)
+
+
+def _dsatur(neighbours: List[np.ndarray], k: int) -> List[int]:
+    n = len(neighbours)
+    colour = [-1] * n
+    seen: List[set] = [set() for _ in range(n)]  # distinct neighbour channels
+    used = [0] * k  # APs per channel, to balance ties
+    heap = [(0, -len(neighbours[i]), i) for i in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        saturation, _, i = heapq.heappop(heap)
+        if colour[i] >= 0 or -saturation != len(seen[i]):
+            continue  # stale entry
+        counts = [0] * k
+        for j in neighbours[i]:
+            if colour[j] >= 0:
+                counts[colour[j]] += 1
+        c = min(range(k), key=lambda c: (counts[c], used[c]))
+        colour[i] = c
+        used[c] += 1
+        for j in neighbours[i]:
+            if colour[j] < 0 and c not in seen[j]:
+                seen[j].add(c)
+                heapq.heappush(heap, (-len(seen[j]), -len(neighbours[j]), j))
+    return colour
+
+
+def _repair(neighbours: List[np.ndarray], colour: List[int], k: int) -> None:
+    colours = np.array(colour)
+    for _ in range(MAX_REPAIR_PASSES):
+        changed = False
+        for i, near in enumerate(neighbours):
+            if len(near) == 0:
+                continue
+            counts = np.bincount(colours[near], minlength=k)
+            best = int(np.argmin(counts))
+            if counts[best] < counts[colours[i]]:
+                colours[i] = best
+                changed = True
+        if not changed:
+            break
+    colour[:] = colours.tolist()
+
+
+def plan_band(positions: np.ndarray, band: str, width: int, radius: float, include_dfs: bool = True,
+              neighbours: Optional[List[np.ndarray]] = None) -> ChannelPlan:
+    channels = band_channels(band, width, include_dfs)
+    if neighbours is None:
+        neighbours = interference_graph(positions, radius)
+    colour = _dsatur(neighbours, len(channels))
+    _repair(neighbours, colour, len(channels))
+    colours = np.array(colour, dtype=np.intp)
+    co_channel = tuple(int(np.count_nonzero(colours[near] == colours[i])) for i, near in enumerate(neighbours))
+    return ChannelPlan(band, width, tuple(channels[c] for c in colour), co_channel)
+
+
+def plan_channels(positions: Sequence, wifi_generation: str, ceiling_height: float = 3.0,
+                  scenario_type: str = "scenario_1", widths: Optional[Dict[str, int]] = None,
+                  overlap_radius: Optional[float] = None, include_dfs: bool = True) -> Dict[str, ChannelPlan]:
+    """One plan per band of ``wifi_generation``; ``widths`` maps band to MHz (default ``DEFAULT_WIDTHS``)."""
+    if wifi_generation not in GENERATION_BANDS:
+        raise ValueError(f"unknown Wi-Fi generation: {wifi_generation!r}")
+    positions = np.asarray(positions, dtype=np.float64)
+    # reshape(0, -1) is ambiguous, so no APs become an empty (0, 2) array.
+    positions = positions.reshape(len(positions), -1) if len(positions) else np.empty((0, 2))
+    if overlap_radius is None:
+        overlap_radius = service_radius(ceiling_height, scenario_type, CCA_THRESHOLD_DBM)
+    widths = {**DEFAULT_WIDTHS, **(widths or {})}
+    neighbours = interference_graph(positions, overlap_radius)
+    return {
+        band: plan_band(positions, band, widths[band], overlap_radius, include_dfs, neighbours)
+        for band in GENERATION_BANDS[wifi_generation]
+    }
+
+
+def _benchmark(aps: int = 5000) -> None:
+    from time import perf_counter
+
+    rng = np.random.default_rng(7)
+    # A campus: 10 buildings of 5 floors, ~100 APs per floor on 150 m² each.
+    per_floor = aps // 50
+    side = (per_floor * 150) ** 0.5
+    positions = np.vstack([
+        np.column_stack((rng.uniform(0, side, per_floor) + (b % 5) * side * 1.5,
+                         rng.uniform(0, side, per_floor) + (b // 5) * side * 1.5,
+                         np.full(per_floor, f)))
+        for b in range(10) for f in range(5)
+    ])
+    radius = service_radius(3.0, "scenario_1", CCA_THRESHOLD_DBM)
+    start = perf_counter()
+    neighbours = interference_graph(positions, radius)
+    graph_s = perf_counter() - start
+    degree = np.mean([len(near) for near in neighbours])
+    print(f"{len(positions)} APs, overlap radius {radius:.1f} m: graph {graph_s:.2f} s, mean degree {degree:.1f}")
+    for band, width in (("5 GHz", 20), ("5 GHz", 40), ("5 GHz", 80), ("6 GHz", 80)):
+        start = perf_counter()
+        plan = plan_band(positions, band, width, radius, neighbours=neighbours)
+        print(f"  {band} {width} MHz ({len(band_channels(band, width))} channels): {perf_counter() - start:.2f} s, "
+              f"{plan.conflicts} co-channel pairs, max {plan.max_co_channel} per AP")
+
+
+if __name__ == "__main__":
+    _benchmark()
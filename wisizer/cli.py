@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Portfolio sizing from the command line.
+
+Reads site rows from CSV or NDJSON (a file or stdin), sizes each one with the
+engine and streams results out in input order:
+
+    python wisizer-batch.py sites.csv --workers 4 > sized.ndjson
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from wisizer.engine import calculate_aps, calculate_switches
+
+DEFAULT_SCENARIO = "scenario_1"
+DEFAULT_WIFI_GENERATION = "Wi-Fi 6"
+DEFAULT_CEILING_HEIGHT = 3.0
+DEFAULT_COVERAGE = "area"
+
+RESULT_FIELDS = [
+    "recommended_aps",
+    "ap_model",
+    "users_per_ap",
+    "ap_uplink",
+    "switch_family",
+    "switch_model",
+    "switches_needed",
+    "unused_ports",
+    "unused_power",
+    "error",
+]
+
+# Set by the NDJSON reader on lines it could not parse.
+_PARSE_ERROR = "__parse_error__"
+
+_TRUE = {"1", "true", "yes", "y", "t", "on"}
+_FALSE = {"0", "false", "no", "n", "f", "off"}
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = "" if value is None else str(value).strip().lower()
+    if not text:
+        return True  # blank, like a missing column: the default
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"invalid include_switches value: {value!r}")
+
+
+def _value(row: dict, key: str, default=None, required: bool = False):
+    value = row.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ValueError(f"missing {key}")
+        return default
+    return value
+
+
+def _finite(row: dict, key: str, default=None) -> float:
+    value = float(_value(row, key, default, required=default is None))
+    if not math.isfinite(value):
+        raise ValueError(f"{key} must be a finite number")
+    return value
+
+
+def _whole(row: dict, key: str) -> int:
+    value = _finite(row, key)
+    if value != int(value):
+        raise ValueError(f"{key} must be a whole number")
+    return int(value)
+
+
+def size_row(row: dict) -> dict:
+    """Size one site row; failures are reported in the ``error`` field."""
+    result: Dict[str, object] = dict(row)
+    result.update({field: None for field in RESULT_FIELDS})
+    if _PARSE_ERROR in result:
+        result["error"] = result.pop(_PARSE_ERROR)
+        return result
+    try:
+        users = _whole(row, "users")
+        area = _finite(row, "area")
+        ceiling_height = _finite(row, "ceiling_height", DEFAULT_CEILING_HEIGHT)
+        scenario = str(_value(row, "scenario", DEFAULT_SCENARIO)).strip()
+        wifi_generation = str(_value(row, "wifi_generation", DEFAULT_WIFI_GENERATION)).strip()
+        include_switches = _parse_bool(row.get("include_switches"))
+        coverage = str(_value(row, "coverage", DEFAULT_COVERAGE)).strip()
+        if area <= 0:
+            raise ValueError("area must be positive")
+        if users <= 0:
+            raise ValueError("users must be positive")
+
+        recommended_aps, ap_model, users_per_ap, ap_uplink, ap_info = calculate_aps(
+            area, users, scenario, wifi_generation, ceiling_height, coverage=coverage
+        )
+        result.update({
+            "recommended_aps": recommended_aps,
+            "ap_model": ap_model,
+            "users_per_ap": users_per_ap,
+            "ap_uplink": ap_uplink,
+        })
+        if include_switches:
+            switch_option, switches_needed, unused_ports, unused_power = calculate_switches(
+                recommended_aps, ap_info, ap_uplink
+            )
+            if switch_option is not None:
+                family, switch_model, _ = switch_option
+                result.update({
+                    "switch_family": family,
+                    "switch_model": switch_model,
+                    "switches_needed": switches_needed,
+                    "unused_ports": unused_ports,
+                    "unused_power": unused_power,
+                })
+    except KeyError as e:
+        result["error"] = f"unknown value: {e.args[0]}"
+    except (TypeError, ValueError, OverflowError) as e:
+        result["error"] = str(e) or type(e).__name__
+    return result
+
+
+def size_chunk(rows: List[dict]) -> List[dict]:
+    return [size_row(row) for row in rows]
+
+
+def _read_rows(stream: TextIO, fmt: str) -> Iterator[dict]:
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = {_PARSE_ERROR: f"line {line_number}: {e.msg}"}
+        yield row if isinstance(row, dict) else {_PARSE_ERROR: f"line {line_number}: not a JSON object"}
+
+
+def _detect_format(stream: TextIO, path: str) -> str:
+    lowered = path.lower()
+    if lowered.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    if lowered.endswith(".csv"):
+        return "csv"
+    # Stdin or an unknown extension: sniff the first character without consuming it.
+    head = stream.buffer.peek(1)[:1] if hasattr(stream, "buffer") else b""
+    return "ndjson" if head == b"{" else "csv"
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_sized(rows: Iterable[dict], workers: int = 1, chunk_size: int = 256) -> Iterator[dict]:
+    """Yield sized rows in input order, keeping only a bounded window in flight."""
+    chunks = _chunks(rows, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from size_chunk(chunk)
+        return
+    # Executor.map would drain the whole input up front; a window of futures
+    # keeps memory flat while still overlapping work across processes.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(size_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _Writer:
+    def __init__(self, stream: TextIO, fmt: str):
+        self.stream = stream
+        self.fmt = fmt
+        self.csv_writer: Optional[csv.DictWriter] = None
+
+    def write(self, row: dict) -> None:
+        if self.fmt == "ndjson":
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+        if self.csv_writer is None:
+            fieldnames = [key for key in row if key not in RESULT_FIELDS] + RESULT_FIELDS
+            self.csv_writer = csv.DictWriter(self.stream, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+            self.csv_writer.writeheader()
+        self.csv_writer.writerow(row)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="wisizer-batch",
+        description="Size sites from a CSV or NDJSON file. Rows need users and area (m²); "
+                    "ceiling_height, scenario, wifi_generation, include_switches and coverage (area or rf) are optional.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout (default)")
+    parser.add_argument("--input-format", choices=["csv", "ndjson"], help="default: from extension or content")
+    parser.add_argument("--output-format", choices=["csv", "ndjson"], default="ndjson")
+    parser.add_argument("--workers", type=int, default=1, help="processes to size chunks in parallel")
+    parser.add_argument("--chunk-size", type=int, default=256, help="rows per unit of work")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+
+    if args.input == "-":
+        source = sys.stdin
+    else:
+        source = open(args.input, newline="", encoding="utf-8-sig")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        fmt = args.input_format or _detect_format(source, args.input if args.input != "-" else "")
+        writer = _Writer(sink, args.output_format)
+        for chunk in _chunks(iter_sized(_read_rows(source, fmt), args.workers, args.chunk_size), args.chunk_size):
+            for row in chunk:
+                writer.write(row)
+            sink.flush()
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head); nothing left to report.
+        sys.stderr.close()
+        return 0
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
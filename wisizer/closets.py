@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""AP-to-closet cabling: which telecom closet serves each AP.
+
+Copper Ethernet runs are limited to a 100 m channel, 10 m of which goes to
+patch cords, so the permanent link from a closet to an AP is at most
+``MAX_RUN_M``. A run is estimated as the Manhattan distance (trays follow
+corridors), plus ``FLOOR_HEIGHT_M`` of riser per floor between the AP and
+the closet, plus a service loop.
+
+Closets may cap the APs they take (``max_aps``: rack space, power, ports).
+The assignment minimizes total cable under those caps: a min-cost flow from
+the APs to the closets, solved by successive shortest paths. APs are added
+one at a time. The search for an augmenting path runs on a graph of closets
+only. Moving an AP from closet a to closet b costs the change in its run,
+and the cheapest such move for each (a, b) is kept in a lazy heap. With
+Dijkstra potentials keeping the costs non-negative, each AP costs a search
+over the closets, not over every AP. APs that no closet can take are left
+unassigned, and the solver serves as many APs as it can before it
+minimizes cable. Candidate closets of an AP come from
+the ``SpatialHash`` of ``wisizer.placement``, queried at the run limit.
+
+Each closet's APs then go through ``calculate_switches`` as a pool of their
+own.
+
+    python -m wisizer.closets    # 2,000 APs and 30 closets
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from wisizer.catalog import APModel
+from wisizer.channels import FLOOR_HEIGHT_M
+from wisizer.engine import calculate_switches
+from wisizer.placement import SpatialHash
+
+CHANNEL_LIMIT_M = 100.0  # 1000BASE-T / 802.3bt channel
+PATCH_CORDS_M = 10.0  # closet and outlet cords, outside the permanent link
+MAX_RUN_M = CHANNEL_LIMIT_M - PATCH_CORDS_M
+SERVICE_LOOP_M = 3.0  # slack left at both ends of a run
+
+
+@dataclass(frozen=True)
+class Closet:
+    name: str
+    x: float  # metres, in the coordinates of the AP positions
+    y: float
+    floor: int = 0
+    max_aps: Optional[int] = None  # None for no limit
+
+
+@dataclass(frozen=True)
+class Assignment:
+    closet_of: Tuple[int, ...]  # per AP: index into the closets, or -1 when none can serve it
+    run_m: Tuple[float, ...]  # per AP: estimated cable run, 0 when unassigned
+
+    @property
+    def unassigned(self) -> Tuple[int, ...]:
+        return tuple(i for i, closet in enumerate(self.closet_of) if closet < 0)
+
+    @property
+    def total_run_m(self) -> float:
+        return sum(self.run_m)
+
+    def aps_of(self, closet: int) -> Tuple[int, ...]:
+        return tuple(i for i, c in enumerate(self.closet_of) if c == closet)
+
+
+@dataclass(frozen=True)
+class ClosetSwitches:
+    closet: Closet
+    aps: int
+    longest_run_m: float
+    switch_option: Optional[tuple]  # (family, model, details) as from calculate_switches
+    switches_needed: Optional[int]
+    unused_ports: Optional[int]
+    unused_power: Optional[float]
+
+
+def _as_points(positions: Sequence) -> np.ndarray:
+    positions = np.asarray(positions, dtype=np.float64)
+    # reshape(0, -1) is ambiguous, so no APs become an empty (0, 2) array.
+    return positions.reshape(len(positions), -1) if len(positions) else np.empty((0, 2))
+
+
+def cable_runs(positions: np.ndarray, closets: Sequence[Closet], max_run_m: float = MAX_RUN_M
+               ) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Per AP, the closets within ``max_run_m`` of cable and those run lengths.
+
+    ``positions`` is (n, 2) in metres, or (n, 3) with a floor index as the
+    third column.
+    """
+    positions = _as_points(positions)
+    if len(positions) == 0 or not closets:
+        return [(np.empty(0, dtype=np.intp), np.empty(0)) for _ in range(len(positions))]
+    spots = np.array([(c.x, c.y) for c in closets], dtype=np.float64)
+    closet_floors = np.array([c.floor for c in closets], dtype=np.float64)
+    ap_floors = positions[:, 2] if positions.shape[1] > 2 else np.zeros(len(positions))
+    # Straight-line distance never exceeds the Manhattan run, so the disc query keeps every candidate.
+    index = SpatialHash(spots, max_run_m)
+    runs = []
+    for (x, y), floor in zip(positions[:, :2], ap_floors):
+        near = index.query(x, y, max_run_m)
+        run = (np.abs(spots[near, 0] - x) + np.abs(spots[near, 1] - y)
+               + np.abs(closet_floors[near] - floor) * FLOOR_HEIGHT_M + SERVICE_LOOP_M)
+        fits = run <= max_run_m
+        runs.append((near[fits], run[fits]))
+    return runs
+
+
+def _min_cost_assignment(runs: List[Tuple[np.ndarray, np.ndarray]], capacity: List[int]) -> List[int]:
+    # An extra last closet stands for "unassigned": it takes any AP, at a cost above
+    # any chain of moves between real closets, so the fewest APs end up there and
+    # the order they are added in does not matter.
+    k = len(capacity) + 1
+    unassigned = len(capacity)
+    capacity = list(capacity) + [len(runs)]
+    longest = max((float(run.max()) for _, run in runs if len(run)), default=0.0)
+    penalty = k * longest + 1.0
+    cost: List[Dict[int, float]] = [
+        {**dict(zip(near.tolist(), run.tolist())), unassigned: penalty} if len(near) else {}
+        for near, run in runs
+    ]
+    closet_of = [-1] * len(runs)
+    load = [0] * k
+    potential = [0.0] * k
+    # moves[a][b]: (extra cable, AP) for APs in closet a that closet b can reach; stale entries are skipped.
+    moves: List[List[list]] = [[[] for _ in range(k)] for _ in range(k)]
+
+    def place(ap: int, closet: int) -> None:
+        closet_of[ap] = closet
+        load[closet] += 1
+        here = cost[ap][closet]
+        for other, run in cost[ap].items():
+            if other != closet:
+                heapq.heappush(moves[closet][other], (run - here, ap))
+
+    def cheapest_move(a: int, b: int) -> Optional[Tuple[float, int]]:
+        heap = moves[a][b]
+        while heap and closet_of[heap[0][1]] != a:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    # Fewest choices first: the augmenting searches stay short when capacity is tight.
+    for ap in sorted(range(len(runs)), key=lambda i: len(cost[i])):
+        if not cost[ap]:
+            continue
+        dist = [float("inf")] * k
+        parent: List[Optional[Tuple[int, int]]] = [None] * k  # (previous closet or -1, AP moved in)
+        queue = []
+        for b, run in cost[ap].items():
+            dist[b] = run - potential[b]
+            parent[b] = (-1, ap)
+            queue.append((dist[b], b))
+        heapq.heapify(queue)
+        done = [False] * k
+        reached = []
+        target = unassigned
+        while queue:
+            d, a = heapq.heappop(queue)
+            if done[a] or d > dist[a]:
+                continue
+            done[a] = True
+            reached.append(a)
+            if load[a] < capacity[a]:
+                target = a
+                break
+            for b in range(k):
+                if done[b]:
+                    continue
+                move = cheapest_move(a, b)
+                if move is None:
+                    continue
+                candidate = d + move[0] + potential[a] - potential[b]
+                if candidate < dist[b]:
+                    dist[b] = candidate
+                    parent[b] = (a, move[1])
+                    heapq.heappush(queue, (candidate, b))
+        for a in reached:
+            potential[a] += dist[a] - dist[target]
+        b = target
+        while True:
+            previous, moved = parent[b]
+            if previous >= 0:
+                load[previous] -= 1
+            place(moved, b)
+            if previous < 0:
+                break
+            b = previous
+    return [-1 if closet == unassigned else closet for closet in closet_of]
+
+
+def assign_aps(positions: Sequence, closets: Sequence[Closet], counts: Optional[Sequence[int]] = None,
+               max_run_m: float = MAX_RUN_M) -> Assignment:
+    """Serve every AP from a closet within ``max_run_m`` of cable, with the least cable in total.
+
+    ``counts`` repeats each position that many times, e.g. zone centroids
+    with their AP counts. APs no closet can take stay unassigned (-1).
+    """
+    positions = _as_points(positions)
+    if counts is not None:
+        positions = np.repeat(positions, counts, axis=0)
+    runs = cable_runs(positions, closets, max_run_m)
+    capacity = [c.max_aps if c.max_aps is not None else len(positions) for c in closets]
+    closet_of = _min_cost_assignment(runs, capacity)
+    run_m = tuple(
+        float(run[near == closet][0]) if closet >= 0 else 0.0
+        for closet, (near, run) in zip(closet_of, runs)
+    )
+    return Assignment(tuple(closet_of), run_m)
+
+
+def closet_switches(assignment: Assignment, closets: Sequence[Closet], ap_info: Union[APModel, dict],
+                    ap_uplink: float) -> List[ClosetSwitches]:
+    """``calculate_switches`` for the APs of each closet; closets without APs get no switch."""
+    results = []
+    for i, closet in enumerate(closets):
+        aps = assignment.aps_of(i)
+        if aps:
+            switch = calculate_switches(len(aps), ap_info, ap_uplink)
+        else:
+            switch = (None, 0, 0, 0.0)
+        longest = max((assignment.run_m[ap] for ap in aps), default=0.0)
+        results.append(ClosetSwitches(closet, len(aps), longest, *switch))
+    return results
+
+
+def _greedy_assignment(runs: List[Tuple[np.ndarray, np.ndarray]], capacity: List[int]) -> Tuple[int, float]:
+    """Nearest closet with room left, for comparison: (APs left out, total run)."""
+    load = [0] * len(capacity)
+    left_out, total = 0, 0.0
+    for near, run in runs:
+        for j in np.argsort(run):
+            if load[near[j]] < capacity[near[j]]:
+                load[near[j]] += 1
+                total += run[j]
+                break
+        else:
+            left_out += 1
+    return left_out, total
+
+
+def _benchmark(aps: int = 2000, closets: int = 30) -> None:
+    from time import perf_counter
+
+    from wisizer.engine import current_sizing
+
+    rng = np.random.default_rng(3)
+    # Five floors of 180 m x 120 m; six closets per floor, APs denser near the lobby.
+    floors = closets // 6
+    positions = np.column_stack((
+        np.clip(rng.gamma(2.0, 30.0, aps), 0, 180),
+        rng.uniform(0, 120, aps),
+        rng.integers(0, floors, aps),
+    ))
+    spots = [Closet(f"IDF {f + 1}.{c + 1}", 15 + 30 * c, 60 + rng.uniform(-20, 20), f, max_aps=70)
+             for f in range(floors) for c in range(6)]
+    start = perf_counter()
+    assignment = assign_aps(positions, spots)
+    elapsed = perf_counter() - start
+    runs = cable_runs(positions, spots)
+    left_out, greedy = _greedy_assignment(runs, [c.max_aps for c in spots])
+    print(f"{aps} APs, {len(spots)} closets of up to 70 APs: {elapsed:.2f} s, {len(assignment.unassigned)} APs "
+          f"unserved, {assignment.total_run_m / 1000:.1f} km of cable, longest run {max(assignment.run_m):.0f} m")
+    print(f"  nearest closet with room instead: {left_out} APs unserved, {greedy / 1000:.1f} km")
+    ap = current_sizing().catalog.aps["Wi-Fi 7"]["CW9172"]
+    start = perf_counter()
+    switches = closet_switches(assignment, spots, ap, ap.uplink)
+    print(f"  switches per closet: {(perf_counter() - start) * 1000:.0f} ms, "
+          f"{sum(s.switches_needed or 0 for s in switches)} switches in total")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""Grid RF coverage: how many APs a floor needs for a target signal level.
+
+The floor is rasterized into square cells (0.5 m by default). For a set of
+ceiling-mounted AP positions, the received signal in every cell follows a
+log-distance path-loss model over the 3-D distance from the AP at
+``ceiling_height`` to a client at desk height, plus a per-metre wall loss
+for the scenario:
+
+    RSSI = TX_POWER_DBM - (REFERENCE_LOSS_DB + 10 n log10(d / 1 m) + wall_loss * horizontal distance)
+
+with ``n`` and ``wall_loss`` taken from the scenario. Every AP uses the same
+power and height and the loss only grows with distance, so a cell reaches
+the target exactly when it lies within ``service_radius`` of some AP. A
+layout is scored by marking the cells inside each AP's disc
+(``covered_cells``): its APs times the cells of one disc, not every cell
+against every AP. ``rssi_map`` still evaluates the full best-server signal.
+
+``required_aps`` searches for the fewest APs on regular lattices that bring
+at least ``COVERAGE_TARGET`` of the cells to ``TARGET_RSSI_DBM``: the count
+is bracketed from the disc-packing bound, bisected, then walked down past
+counts that lay out awkwardly. This is
+the ``coverage="rf"`` mode of ``calculate_aps``, where ceiling height
+matters. The default ``"area"`` mode keeps the fixed m² per AP.
+
+    python -m wisizer.coverage    # timing and AP counts vs the area model
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.scenarios import SCENARIOS, Scenario, get_scenario
+
+RESOLUTION_M = 0.5
+FLOOR_ASPECT = 1.5  # width / depth assumed when only the area is known
+CLIENT_HEIGHT_M = 1.0
+FREQUENCY_MHZ = 5500.0  # design band: 5 GHz, channel 100-ish
+TX_POWER_DBM = 17.0  # EIRP of a capacity-oriented design, below the AP maximum
+REFERENCE_LOSS_DB = 20 * math.log10(FREQUENCY_MHZ) - 27.55  # free space at 1 m
+TARGET_RSSI_DBM = -67.0  # usual voice/video-grade design target
+COVERAGE_TARGET = 0.95
+MAX_APS = 400
+# The walk down after bisection stops after this many failing counts in a
+# row, or this fraction of the count when larger.
+SEARCH_MISSES = 3
+SEARCH_MISS_FRACTION = 0.1
+
+
+@dataclass(frozen=True, eq=False)
+class FloorGrid:
+    """Cell centres of a rasterized floor; ``mask`` marks the cells inside it.
+
+    ``width`` and ``depth`` are those of the bounding box starting at ``origin``.
+    """
+    width: float
+    depth: float
+    resolution: float
+    mask: np.ndarray  # (rows, cols) bool
+    cells: np.ndarray  # (n, 2) float32 x/y of the cells inside, metres
+    origin: Tuple[float, float] = (0.0, 0.0)
+
+    @classmethod
+    def rectangle(cls, width: float, depth: float, resolution: float = RESOLUTION_M) -> "FloorGrid":
+        cols = max(1, math.ceil(width / resolution))
+        rows = max(1, math.ceil(depth / resolution))
+        mask = np.ones((rows, cols), dtype=bool)
+        return cls(width, depth, resolution, mask, _cell_centres(mask, resolution))
+
+    @classmethod
+    def from_area(cls, area: float, aspect: float = FLOOR_ASPECT, resolution: float = RESOLUTION_M) -> "FloorGrid":
+        """A ``aspect``:1 rectangle of ``area`` m²."""
+        depth = math.sqrt(area / aspect)
+        return cls.rectangle(depth * aspect, depth, resolution)
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray, resolution: float = RESOLUTION_M) -> "FloorGrid":
+        """Cells of a (rows, cols) ``mask`` with its corner at the origin, e.g. a floor plan footprint."""
+        mask = np.asarray(mask, dtype=bool)
+        if not mask.any():
+            raise ValueError("floor mask has no cells")
+        rows, cols = mask.shape
+        return cls(cols * resolution, rows * resolution, resolution, mask, _cell_centres(mask, resolution))
+
+    @classmethod
+    def polygon(cls, vertices: Sequence[Tuple[float, float]], resolution: float = RESOLUTION_M) -> "FloorGrid":
+        """Cells whose centre lies inside the simple polygon ``vertices`` (metres, any winding)."""
+        points = np.asarray(vertices, dtype=np.float64)
+        if len(points) < 3:
+            raise ValueError("a floor polygon needs at least 3 vertices")
+        origin = points.min(axis=0)
+        width, depth = points.max(axis=0) - origin
+        cols = max(1, math.ceil(width / resolution))
+        rows = max(1, math.ceil(depth / resolution))
+        x = (np.arange(cols) + 0.5) * resolution + origin[0]
+        y = (np.arange(rows) + 0.5) * resolution + origin[1]
+        px, py = np.meshgrid(x, y)
+        mask = np.zeros((rows, cols), dtype=bool)
+        # Even-odd rule: flip every cell whose rightward ray crosses the edge.
+        for (x0, y0), (x1, y1) in zip(points, np.roll(points, -1, axis=0)):
+            if y0 == y1:
+                continue
+            crosses = (py >= min(y0, y1)) & (py < max(y0, y1))
+            mask ^= crosses & (px < x0 + (py - y0) * (x1 - x0) / (y1 - y0))
+        if not mask.any():
+            raise ValueError("floor polygon is smaller than one grid cell")
+        return cls(float(width), float(depth), resolution, mask,
+                   _cell_centres(mask, resolution, (float(origin[0]), float(origin[1]))),
+                   (float(origin[0]), float(origin[1])))
+
+    @property
+    def area(self) -> float:
+        return len(self.cells) * self.resolution ** 2
+
+    def contains(self, x: float, y: float) -> bool:
+        col = math.floor((x - self.origin[0]) / self.resolution)
+        row = math.floor((y - self.origin[1]) / self.resolution)
+        return 0 <= row < self.mask.shape[0] and 0 <= col < self.mask.shape[1] and bool(self.mask[row, col])
+
+
+def _cell_centres(mask: np.ndarray, resolution: float, origin: Tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+    rows, cols = np.nonzero(mask)
+    return np.column_stack(((cols + 0.5) * resolution + origin[0], (rows + 0.5) * resolution + origin[1])).astype(np.float32)
+
+
+def lattice_positions(grid: FloorGrid, count: int, cols: Optional[int] = None) -> np.ndarray:
+    """``count`` AP positions in rows of ``cols`` (default: near-square spacing), centred in their lattice cells.
+
+    A short last row is centred too. Positions outside an irregular floor are
+    moved to the nearest cell inside it.
+    """
+    if cols is None:
+        cols = round(math.sqrt(count * grid.width / grid.depth))
+    cols = max(1, min(count, cols))
+    rows = math.ceil(count / cols)
+    positions = []
+    for row in range(rows):
+        in_row = min(cols, count - row * cols)
+        y = grid.origin[1] + (row + 0.5) * grid.depth / rows
+        positions.extend((grid.origin[0] + (col + 0.5) * grid.width / in_row, y) for col in range(in_row))
+    positions = np.array(positions, dtype=np.float32)
+    if not grid.mask.all():
+        nearest = nearest_distances_sq(positions, grid.cells, return_index=True)[1]
+        positions = grid.cells[nearest]
+    return positions
+
+
+def best_lattice(grid: FloorGrid, count: int, ceiling_height: float, scenario_type: str,
+                 target_rssi: float = TARGET_RSSI_DBM) -> Tuple[np.ndarray, float]:
+    """The best covering of the lattices around the near-square one, with its coverage fraction."""
+    ideal = math.sqrt(count * grid.width / grid.depth)
+    best, best_fraction = None, -1.0
+    for cols in sorted({max(1, min(count, c)) for c in (math.floor(ideal) - 1, math.floor(ideal), math.ceil(ideal), math.ceil(ideal) + 1)}):
+        positions = lattice_positions(grid, count, cols)
+        fraction = coverage_fraction(grid, positions, ceiling_height, scenario_type, target_rssi)
+        if fraction > best_fraction:
+            best, best_fraction = positions, fraction
+    return best, best_fraction
+
+
+def nearest_distances_sq(points: np.ndarray, sites: np.ndarray, return_index: bool = False):
+    """Squared distance from every point to its nearest site (and that site's index)."""
+    best = np.full(len(points), np.inf, dtype=np.float32)
+    index = np.zeros(len(points), dtype=np.intp) if return_index else None
+    # One site at a time keeps memory at O(points) for any AP count.
+    for i, (x, y) in enumerate(sites):
+        d2 = (points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2
+        if return_index:
+            closer = d2 < best
+            index[closer] = i
+        np.minimum(best, d2, out=best)
+    return best, index
+
+
+def path_loss_db(horizontal_m: np.ndarray, ceiling_height: float, scenario: Scenario) -> np.ndarray:
+    drop = max(ceiling_height - CLIENT_HEIGHT_M, 0.0)
+    distance = np.sqrt(horizontal_m ** 2 + drop ** 2)
+    distance = np.maximum(distance, 1.0)  # the model starts at the 1 m reference
+    return (
+        REFERENCE_LOSS_DB
+        + 10 * scenario.path_loss_exponent * np.log10(distance)
+        + scenario.wall_loss_db_per_m * horizontal_m
+    )
+
+
+def rssi_map(grid: FloorGrid, positions: np.ndarray, ceiling_height: float, scenario_type: str) -> np.ndarray:
+    """Best-server RSSI (dBm) of every cell inside the floor, in ``grid.cells`` order."""
+    d2, _ = nearest_distances_sq(grid.cells, np.asarray(positions, dtype=np.float32))
+    return TX_POWER_DBM - path_loss_db(np.sqrt(d2), ceiling_height, get_scenario(scenario_type))
+
+
+def covered_cells(grid: FloorGrid, positions: np.ndarray, radius: float) -> int:
+    """Cells of the floor whose centre lies within ``radius`` of some position.
+
+    Each position marks the cells of its own disc, so a layout costs its APs
+    times the cells of one disc, not every cell against every AP.
+    """
+    rows, cols = grid.mask.shape
+    covered = np.zeros((rows, cols), dtype=bool)
+    radius_sq = np.float32(radius) ** 2
+    for x, y in np.asarray(positions, dtype=np.float32):
+        # Cell centres sit at origin + (index + 0.5) * resolution.
+        c0 = max(0, math.floor((x - radius - grid.origin[0]) / grid.resolution - 0.5))
+        c1 = min(cols, math.ceil((x + radius - grid.origin[0]) / grid.resolution + 0.5))
+        r0 = max(0, math.floor((y - radius - grid.origin[1]) / grid.resolution - 0.5))
+        r1 = min(rows, math.ceil((y + radius - grid.origin[1]) / grid.resolution + 0.5))
+        if c0 >= c1 or r0 >= r1:
+            continue
+        dx = ((np.arange(c0, c1) + 0.5) * grid.resolution + grid.origin[0]).astype(np.float32) - x
+        dy = ((np.arange(r0, r1) + 0.5) * grid.resolution + grid.origin[1]).astype(np.float32) - y
+        covered[r0:r1, c0:c1] |= dy[:, None] ** 2 + dx[None, :] ** 2 <= radius_sq
+    return int(np.count_nonzero(covered & grid.mask))
+
+
+def coverage_fraction(grid: FloorGrid, positions: np.ndarray, ceiling_height: float, scenario_type: str,
+                      target_rssi: float = TARGET_RSSI_DBM) -> float:
+    """Share of the floor's cells at ``target_rssi`` or better.
+
+    The signal only falls with distance, so that is the share within the
+    service radius of some AP.
+    """
+    radius = service_radius(ceiling_height, scenario_type, target_rssi)
+    return covered_cells(grid, positions, radius) / len(grid.cells)
+
+
+def service_radius(ceiling_height: float, scenario_type: str, target_rssi: float = TARGET_RSSI_DBM) -> float:
+    """Horizontal distance at which the signal drops to ``target_rssi`` (0 if it never reaches it)."""
+    scenario = get_scenario(scenario_type)
+    budget = TX_POWER_DBM - target_rssi
+
+    def loss(r: float) -> float:
+        return float(path_loss_db(np.array(r), ceiling_height, scenario))
+
+    if loss(0.0) > budget:
+        return 0.0
+    low, high = 0.0, 1.0
+    while loss(high) <= budget:
+        low, high = high, high * 2
+    for _ in range(40):
+        mid = (low + high) / 2
+        low, high = (mid, high) if loss(mid) <= budget else (low, mid)
+    return low
+
+
+def required_aps_for_grid(grid: FloorGrid, ceiling_height: float, scenario_type: str,
+                          target_rssi: float = TARGET_RSSI_DBM, target: float = COVERAGE_TARGET) -> Optional[int]:
+    """Fewest lattice-placed APs covering ``target`` of ``grid`` at ``target_rssi``, or None past MAX_APS.
+
+    Coverage mostly grows with the AP count, so the count is bracketed by
+    doubling from the disc-packing bound and then bisected, followed by a
+    short walk down past awkward counts: O(log n) layouts instead of one
+    per count.
+    """
+    radius = service_radius(ceiling_height, scenario_type, target_rssi)
+    if radius <= 0:
+        return None
+    # No layout beats perfect discs, so start from the disc-packing bound.
+    floor_count = max(1, math.floor(grid.area * target / (math.pi * radius ** 2)))
+    if floor_count > MAX_APS:
+        return None
+    tried = {}
+
+    def covers(count: int) -> bool:
+        if count not in tried:
+            tried[count] = best_lattice(grid, count, ceiling_height, scenario_type, target_rssi)[1] >= target
+        return tried[count]
+
+    low = floor_count
+    if covers(low):
+        return low
+    # Invariant from here: ``low`` APs fall short and ``high`` APs cover.
+    high = low
+    while True:
+        low, high = high, min(high * 2, MAX_APS)
+        if covers(high):
+            break
+        if high == MAX_APS:
+            return None
+    while high - low > 1:
+        middle = (low + high) // 2
+        if covers(middle):
+            high = middle
+        else:
+            low = middle
+    # Awkward counts (primes, short last rows) lay out worse than some count
+    # below them, so a miss does not rule out every smaller count: walk down
+    # until a run of counts in a row miss.
+    count, misses, patience = high - 1, 0, max(SEARCH_MISSES, round(high * SEARCH_MISS_FRACTION))
+    while count >= floor_count and misses < patience:
+        if covers(count):
+            high, misses = count, 0
+        else:
+            misses += 1
+        count -= 1
+    return high
+
+
+@lru_cache(maxsize=4096)
+def _required_aps(area: float, ceiling_height: float, scenario_type: str) -> Optional[int]:
+    return required_aps_for_grid(FloorGrid.from_area(area), ceiling_height, scenario_type)
+
+
+def required_aps(area: float, scenario_type: str, ceiling_height: float, floor: Optional[FloorGrid] = None) -> int:
+    """AP count for ``area`` m² with coverage evaluated on the grid; raises ValueError when out of reach.
+
+    ``floor`` (e.g. ``FloorPlan.grid()``) replaces the rectangle of ``area``
+    m²; such results are not cached here.
+    """
+    if floor is not None:
+        count = required_aps_for_grid(floor, ceiling_height, scenario_type)
+        area = floor.area
+    else:
+        count = _required_aps(round(float(area), 1), round(float(ceiling_height), 2), scenario_type)
+    if count is None:
+        raise ValueError(f"no layout of up to {MAX_APS} APs reaches {TARGET_RSSI_DBM:g} dBm on "
+                         f"{COVERAGE_TARGET:.0%} of {area:g} m² at {ceiling_height:g} m; "
+                         "split the site into zones or use the area coverage model")
+    return count
+
+
+def _benchmark() -> None:
+    from timeit import timeit
+
+    grid = FloorGrid.from_area(1400)
+    positions = lattice_positions(grid, 8)
+    evaluate_ms = timeit(lambda: coverage_fraction(grid, positions, 3.0, "scenario_1"), number=200) / 200 * 1000
+    solve_ms = timeit(lambda: required_aps_for_grid(grid, 3.0, "scenario_3"), number=20) / 20 * 1000
+    print(f"1400 m² at {RESOLUTION_M} m: {len(grid.cells)} cells, one 8-AP layout {evaluate_ms:.2f} ms, "
+          f"AP count search {solve_ms:.1f} ms")
+    heights = (2.4, 3.0, 4.0, 5.2)
+    print("APs for 1400 m², area model vs grid at ceiling " + " / ".join(f"{h} m" for h in heights))
+    for key, scenario in SCENARIOS.items():
+        counts = " / ".join(str(required_aps(1400, key, h)) for h in heights)
+        print(f"  {scenario.name}: {math.ceil(1400 / scenario.coverage_m2)} vs {counts}")
+
+
+if __name__ == "__main__":
+    _benchmark()
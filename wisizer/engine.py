@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Pure-Python sizing engine.
+
+Same math as the Streamlit app, without any UI, caching or API-client imports,
+so batch jobs and API workers can size sites cheaply.
+"""
+
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from data.scenarios import get_scenario
+from wisizer.catalog import APModel, Catalog, SwitchModel, current_catalog
+
+if TYPE_CHECKING:
+    from wisizer.coverage import FloorGrid
+
+CONCURRENCY = 0.7  # 70% occupancy
+THROUGHPUT_PER_USER = 5  # Mbps
+BACKGROUND_SYNC = 0.5  # Mbps
+REAL_WORLD_FACTOR = 0.35  # factor to represent real-world data rate
+SWITCH_MARGIN = 0.7  # 70% available after margin
+LARGE_SITE_APS = 5  # above this many APs for coverage, small-site models are skipped
+SMALL_SITE_ONLY_MODELS = frozenset({"MR28"})
+AREA_DECIMALS = 2  # cache keys carry areas to 0.01 m²
+COVERAGE_MODELS = ("area", "rf")  # fixed m² per AP per scenario, or wisizer.coverage's grid model
+
+
+@dataclass(frozen=True)
+class CandidateIndex:
+    """AP models of one generation sorted by Max Users, with parallel columns.
+
+    Ties keep catalog order (stable sort), so ``bisect_left`` lands on the same
+    model the old build-and-sort loop picked.
+    """
+    models: Tuple[str, ...]
+    aps: Tuple[APModel, ...]
+    max_users: Tuple[int, ...]
+    fallback: int  # largest Max Users, first in catalog order
+
+    def select(self, users_ap: float) -> int:
+        """Position of the smallest model serving ``users_ap``, else the largest."""
+        position = bisect_left(self.max_users, users_ap)
+        return position if position < len(self.max_users) else self.fallback
+
+
+def _build_candidate_index(models: Dict[str, APModel], large_site: bool) -> CandidateIndex:
+    aps = sorted(
+        (ap for name, ap in models.items() if not (large_site and name in SMALL_SITE_ONLY_MODELS)),
+        key=lambda ap: ap.max_users,
+    )
+    max_users = tuple(ap.max_users for ap in aps)
+    return CandidateIndex(
+        models=tuple(ap.name for ap in aps),
+        aps=tuple(aps),
+        max_users=max_users,
+        fallback=bisect_left(max_users, max_users[-1]) if max_users else 0,
+    )
+
+
+def quantize_area(area: float) -> float:
+    """Area rounded for use in cache keys, so unit-conversion float noise maps to one entry."""
+    return round(float(area), AREA_DECIMALS)
+
+
+def calculate_aps(area: float, users: int, scenario_type: str, wifi_generation: str, ceiling_height: float = 3.0,
+                  coverage: str = "area", floor: Optional["FloorGrid"] = None):
+    """AP count and model for one site.
+
+    ``coverage="area"`` counts coverage APs from the scenario's fixed m² per
+    AP and ignores ``ceiling_height``; ``"rf"`` uses the grid RF model in
+    ``wisizer.coverage``, which accounts for mounting height. With ``"rf"``,
+    ``floor`` (e.g. ``FloorPlan.grid()``) is the floor's actual shape instead
+    of a rectangle of ``area`` m².
+    """
+    concurrent_users = users * CONCURRENCY
+    background_devices = concurrent_users * 2
+
+    total_bandwidth = math.ceil((concurrent_users * THROUGHPUT_PER_USER) + (background_devices * BACKGROUND_SYNC))
+
+    devices_5ghz = math.ceil((concurrent_users + background_devices) * 0.7)
+    scenario_data = get_scenario(scenario_type)
+    coverage_m2 = scenario_data.coverage_m2
+
+    if coverage == "area":
+        aps_coverage = math.ceil(area / coverage_m2)
+    elif coverage == "rf":
+        # Imported here so area-only callers don't pay for NumPy.
+        from wisizer.coverage import required_aps
+        aps_coverage = required_aps(area, scenario_type, ceiling_height, floor)
+    else:
+        raise ValueError(f"unknown coverage model: {coverage!r}")
+    users_ap = math.ceil(concurrent_users / aps_coverage)
+    index = current_sizing().ap_index[wifi_generation][aps_coverage > LARGE_SITE_APS]
+    ap = index.aps[index.select(users_ap)]
+    effective_capacity = ap.effective_capacity
+    aps_capacity = math.ceil(total_bandwidth / (effective_capacity * REAL_WORLD_FACTOR)) if effective_capacity > 0 else float('inf')
+    aps_density = math.ceil(devices_5ghz / ap.max_users)
+    recommended_aps = max(aps_coverage, aps_capacity, aps_density)
+    users_per_ap = math.ceil(users / recommended_aps)
+
+    return recommended_aps, ap.name, users_per_ap, ap.uplink, ap.info
+
+
+def get_port_speed_above_capacity(ap_info: Union[APModel, dict], ap_uplink: float) -> float:
+    return current_catalog().as_ap(ap_info).port_speed_above(ap_uplink)
+
+
+def effective_port_count(switch_info: Union[SwitchModel, dict], required_speed: float) -> int:
+    """Access ports on ``switch_info`` able to run at ``required_speed``."""
+    if isinstance(switch_info, SwitchModel):
+        return switch_info.ports_at(required_speed)
+    return sum(
+        group.get("Ports", 0) for group in switch_info.get("Access", [])
+        if group.get("Speed", []) and max(group.get("Speed", [])) >= required_speed
+    )
+
+
+def _speed_tiers(catalog: Catalog) -> Tuple[float, ...]:
+    """Every required_speed calculate_switches can ask for: each AP port speed,
+    plus the 1 Gbps default for APs without port data."""
+    return tuple(sorted({1} | {
+        speed
+        for models in catalog.aps.values()
+        for ap in models.values()
+        for speed in ap.port_speeds
+    }))
+
+
+@dataclass(frozen=True, eq=False)
+class SwitchTable:
+    """SWITCH_MODELS flattened in catalog order with the per-model sizing inputs.
+
+    ``available_ports[speed]`` already has the growth margin applied, and
+    ``poe_margin`` is the budget after margin, so a selection is just a
+    division and a comparison per model.
+    """
+    options: Tuple[Tuple[str, str, dict], ...]
+    switches: Tuple[SwitchModel, ...]
+    poe_budget: Tuple[float, ...]
+    poe_margin: Tuple[float, ...]
+    available_ports: Dict[float, Tuple[int, ...]]
+
+    def ports_at(self, required_speed: float) -> Tuple[int, ...]:
+        ports = self.available_ports.get(required_speed)
+        if ports is None:
+            ports = tuple(math.floor(switch.ports_at(required_speed) * SWITCH_MARGIN) for switch in self.switches)
+        return ports
+
+    def select(self, required_speed: float, ap_power: float, total_connections: int) -> Tuple[Optional[int], Optional[int], int]:
+        """Catalog position, unit count and per-unit AP slots of the best model.
+
+        Fewest units wins; ties keep the first model in catalog order.
+        """
+        best = None
+        best_needed = None
+        best_available = 0
+        for i, (ports, poe_margin) in enumerate(zip(self.ports_at(required_speed), self.poe_margin)):
+            available = min(ports, math.floor(poe_margin / ap_power))
+            if available <= 0:
+                continue
+            needed = math.ceil(total_connections / available)
+            if best is None or needed < best_needed:
+                best, best_needed, best_available = i, needed, available
+        return best, best_needed, best_available
+
+
+def _build_switch_table(catalog: Catalog, speed_tiers: Tuple[float, ...]) -> SwitchTable:
+    switches = tuple(switch for models in catalog.switches.values() for switch in models.values())
+    poe_budget = tuple(switch.poe_budget for switch in switches)
+    return SwitchTable(
+        options=tuple((switch.family, switch.name, switch.info) for switch in switches),
+        switches=switches,
+        poe_budget=poe_budget,
+        poe_margin=tuple(budget * SWITCH_MARGIN for budget in poe_budget),
+        available_ports={
+            speed: tuple(math.floor(switch.ports_at(speed) * SWITCH_MARGIN) for switch in switches)
+            for speed in speed_tiers
+        },
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class Sizing:
+    """Lookup structures compiled from one catalog version."""
+    catalog: Catalog
+    ap_index: Dict[str, Dict[bool, CandidateIndex]]  # generation -> {large_site: index}
+    speed_tiers: Tuple[float, ...]
+    switch_table: SwitchTable
+
+
+def _build_sizing(catalog: Catalog, previous: Optional[Sizing]) -> Sizing:
+    # Unchanged generations and switch catalogs keep their compiled structures.
+    ap_index = {}
+    for generation, models in catalog.aps.items():
+        if previous is not None and previous.catalog.generation_versions.get(generation) == catalog.generation_versions[generation]:
+            ap_index[generation] = previous.ap_index[generation]
+        else:
+            ap_index[generation] = {large_site: _build_candidate_index(models, large_site) for large_site in (False, True)}
+    speed_tiers = _speed_tiers(catalog)
+    if previous is not None and previous.catalog.switch_version == catalog.switch_version and previous.speed_tiers == speed_tiers:
+        switch_table = previous.switch_table
+    else:
+        switch_table = _build_switch_table(catalog, speed_tiers)
+    return Sizing(catalog=catalog, ap_index=ap_index, speed_tiers=speed_tiers, switch_table=switch_table)
+
+
+_sizing: Optional[Sizing] = None
+
+
+def current_sizing() -> Sizing:
+    """Structures for the current catalog, rebuilt the first time a new version is seen."""
+    global _sizing
+    catalog = current_catalog()
+    sizing = _sizing
+    if sizing is None or sizing.catalog is not catalog:
+        sizing = _sizing = _build_sizing(catalog, sizing)
+    return sizing
+
+
+# The catalog as loaded at import. Long-running code should read
+# current_catalog().version / current_sizing() so it follows reloads.
+_initial = current_sizing()
+CATALOG_VERSION = _initial.catalog.version
+AP_INDEX = _initial.ap_index
+SPEED_TIERS = _initial.speed_tiers
+SWITCH_TABLE = _initial.switch_table
+
+
+def calculate_switches(num_aps: int, ap_info: Union[APModel, dict], ap_uplink: float) -> Tuple[Optional[tuple], Optional[int], Optional[int], Optional[float]]:
+    """Pick the access switch model needing the fewest units for ``num_aps``.
+
+    Returns ``(None, None, None, None)`` when the AP has no Power value or no
+    switch in the catalog can serve it; callers decide how to surface that.
+    """
+    sizing = current_sizing()
+    ap = sizing.catalog.as_ap(ap_info)
+    ap_power = ap.power
+    if not ap_power:
+        return None, None, None, None
+    total_ap_connections = num_aps * ap.total_ports
+    required_speed = ap.port_speed_above(ap_uplink / 1000)
+    switch_table = sizing.switch_table
+    best, switches_needed, available = switch_table.select(required_speed, ap_power, total_ap_connections)
+    if best is None:
+        return None, None, None, None
+    unused_ports = (available * switches_needed) - total_ap_connections
+    total_power_available = switches_needed * switch_table.poe_margin[best]
+    used_power = num_aps * ap_power
+    unused_power = total_power_available - used_power
+    return switch_table.options[best], switches_needed, unused_ports, unused_power
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Wall attenuation read from an uploaded floor plan image.
+
+The scale reference is the real width of the image in metres. The plan is
+reduced to the coverage grid (``RESOLUTION_M`` cells) by summing "ink", the
+darkness below ``WHITE_LEVEL``, per cell. Ink per cell divided by the
+cell's pixel count and multiplied by the cell size approximates the
+thickness of the lines drawn through it. A ``WALL_THICKNESS_M`` line is
+one full wall of ``WALL_LOSS_DB``; thinner ink (text, dimension lines)
+attenuates in proportion. That gives a per-cell attenuation grid in dB.
+
+For sizing, the grid is folded into the per-metre wall loss of the RF model
+in ``wisizer.coverage``. By the Cauchy-Crofton formula, a random straight
+path crosses ``(2 / pi) * wall length per m²`` walls per metre, so
+
+    wall_loss_db_per_m = (2 / pi) * mean cell attenuation / cell size
+
+over the building footprint (the rows and columns spanned by solid walls).
+``FloorPlan.scenario`` wraps this in a ``Scenario`` for ``calculate_aps``, and
+``FloorPlan.grid()`` passes the footprint's shape as its ``floor``.
+
+The image is decoded in horizontal strips of at most ``STRIP_BYTES``:
+
+- BMP, PGM/PPM and uncompressed TIFF are read row by row straight from the
+  file.
+- JPEG is decoded with DCT downscaling (``Image.draft``) while keeping
+  at least ``SAMPLES_PER_CELL`` pixels across a cell.
+- Other formats, such as PNG, have no row access. They are decoded whole up
+  to ``MAX_DECODED_PIXELS``; larger ones are refused.
+
+Pillow warns about images over ``Image.MAX_IMAGE_PIXELS`` (about 89
+megapixels) and refuses those over twice that. ``read_floor_plan`` silences
+the warning for plans, which are streamed, and turns the refusal into a
+``ValueError``; Pillow's global limit is left as it is.
+
+Results are cached by the SHA-256 of the image bytes, scale and resolution,
+in memory and as ``data/floorplans/*.npz``. The disk cache keeps the most
+recently used files up to ``DISK_CACHE_BYTES``.
+
+    python -m wisizer.floorplan    # 100-megapixel synthetic plan
+"""
+
+import hashlib
+import io
+import math
+import os
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from data.scenarios import SCENARIOS, Scenario
+from wisizer.coverage import RESOLUTION_M, FloorGrid
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "floorplans")
+
+WHITE_LEVEL = 200  # grey levels at or above this are paper (light fills and hatching included)
+WALL_THICKNESS_M = 0.1  # ink this thick across a cell is one full wall
+WALL_LOSS_DB = 4.0  # one interior wall (drywall, glass) at 5 GHz
+SAMPLES_PER_CELL = 16  # JPEG downscaling keeps at least this many pixels across a cell
+STRIP_BYTES = 4 << 20
+MAX_DECODED_PIXELS = 40_000_000
+HASH_CHUNK_BYTES = 1 << 20
+MEMORY_CACHE_ENTRIES = 16
+DISK_CACHE_BYTES = 256 << 20
+
+Source = Union[str, os.PathLike, bytes, BinaryIO]
+
+
+@dataclass(frozen=True, eq=False)
+class FloorPlan:
+    """Per-cell wall attenuation of a plan; row 0 is the top of the image."""
+    digest: str  # SHA-256 of the image bytes
+    width: float  # metres
+    depth: float
+    resolution: float
+    attenuation: np.ndarray  # (rows, cols) float32 dB
+    mask: np.ndarray  # (rows, cols) bool, building footprint
+
+    @property
+    def key(self) -> str:
+        """Content hash, scale and resolution: identifies the plan in caches."""
+        return plan_key(self.digest, self.width, self.resolution)
+
+    @property
+    def area(self) -> float:
+        return float(np.count_nonzero(self.mask)) * self.resolution ** 2
+
+    @property
+    def wall_loss_db_per_m(self) -> float:
+        mean_db = float(self.attenuation[self.mask].mean()) if self.mask.any() else 0.0
+        return 2 / math.pi * mean_db / self.resolution
+
+    @property
+    def scenario(self) -> Scenario:
+        """A scenario with this plan's wall loss; its area per AP is interpolated between the built-in ones."""
+        loss = round(self.wall_loss_db_per_m, 3)
+        calibrated = sorted((s.wall_loss_db_per_m, s.coverage_m2) for s in SCENARIOS.values())
+        coverage_m2 = round(float(np.interp(loss, [c[0] for c in calibrated], [c[1] for c in calibrated])))
+        return Scenario(
+            name="Floor plan",
+            description=f"{self.area:.0f} m² plan, {loss:.2f} dB/m wall loss",
+            coverage_m2=coverage_m2,
+            image_path="",
+            path_loss_exponent=3.0,
+            wall_loss_db_per_m=loss,
+        )
+
+    def grid(self) -> FloorGrid:
+        """The footprint as a coverage grid, y growing down the image."""
+        return FloorGrid.from_mask(self.mask, self.resolution)
+
+
+def plan_key(digest: str, width_m: float, resolution: float) -> str:
+    return f"{digest}-{width_m:g}m-{resolution:g}"
+
+
+def content_hash(source: Source) -> str:
+    """SHA-256 of the image bytes, read in chunks."""
+    digest = hashlib.sha256()
+    if isinstance(source, bytes):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+def _raw_rows(image: Image.Image) -> Optional[list]:
+    """(top, height, offset, rawmode, stride, orientation) per tile when every tile is uncompressed full-width rows."""
+    width = image.size[0]
+    rows = []
+    for tile in image.tile:
+        codec, (x0, y0, x1, y1), offset, args = tile[:4]
+        if codec != "raw" or x0 != 0 or x1 != width:
+            return None
+        args = (args,) if isinstance(args, str) else tuple(args)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        if stride <= 0:
+            stride = len(Image.new(image.mode, (width, 1)).tobytes("raw", rawmode))
+        rows.append((y0, y1 - y0, offset, rawmode, stride, orientation))
+    return sorted(rows)
+
+
+def _grey(strip: Image.Image, image: Image.Image) -> np.ndarray:
+    if strip.mode == "P" and image.palette is not None:
+        palette = image.palette  # still raw (e.g. BMP's BGRX) until the image is loaded
+        strip.putpalette(palette.palette, palette.rawmode or palette.mode)
+    return np.asarray(strip.convert("L"))
+
+
+def _strips(image: Image.Image) -> Iterator[Tuple[int, np.ndarray]]:
+    """(top row, uint8 grey rows) from the top of ``image`` down."""
+    tiles = None if image.format == "JPEG" else _raw_rows(image)
+    if tiles is not None:
+        width = image.size[0]
+        for top, tile_height, offset, rawmode, stride, orientation in tiles:
+            step = max(1, STRIP_BYTES // stride)
+            for start in range(0, tile_height, step):
+                count = min(step, tile_height - start)
+                # Bottom-up files (BMP) store the strip's last row first.
+                first = start if orientation > 0 else tile_height - start - count
+                image.fp.seek(offset + first * stride)
+                data = image.fp.read(count * stride)
+                if len(data) < count * stride:
+                    raise ValueError("floor plan image is truncated")
+                strip = Image.frombuffer(image.mode, (width, count), data, "raw", rawmode, stride, orientation)
+                yield top + start, _grey(strip, image)
+        return
+    width, height = image.size
+    if width * height > MAX_DECODED_PIXELS:
+        raise ValueError(f"{image.format} plans over {MAX_DECODED_PIXELS / 1e6:.0f} megapixels cannot be streamed; "
+                         "export the plan as JPEG, BMP or uncompressed TIFF")
+    grey = np.asarray(image.convert("L"))
+    step = max(1, STRIP_BYTES // max(1, width))
+    for start in range(0, grey.shape[0], step):
+        yield start, grey[start:start + step]
+
+
+def _cell_index(pixels: int, metres_per_pixel: float, resolution: float, cells: int) -> np.ndarray:
+    """Cell index of every pixel along one axis, clipped to the grid."""
+    return np.minimum((np.arange(pixels) * metres_per_pixel / resolution).astype(np.intp), cells - 1)
+
+
+def _footprint(attenuation: np.ndarray) -> np.ndarray:
+    """Cells between the outermost solid walls, both along their row and their column."""
+    solid = attenuation >= WALL_LOSS_DB / 2
+    if not solid.any():
+        return np.ones(attenuation.shape, dtype=bool)
+
+    def span(walls: np.ndarray) -> np.ndarray:
+        any_wall = walls.any(axis=1)
+        first = np.where(any_wall, walls.argmax(axis=1), walls.shape[1])
+        last = np.where(any_wall, walls.shape[1] - 1 - walls[:, ::-1].argmax(axis=1), -1)
+        index = np.arange(walls.shape[1])
+        return (index >= first[:, None]) & (index <= last[:, None])
+
+    return span(solid) & span(solid.T).T
+
+
+def read_floor_plan(source: Source, width_m: float, resolution: float = RESOLUTION_M,
+                    digest: Optional[str] = None) -> FloorPlan:
+    """Build the attenuation grid from the image, uncached."""
+    if width_m <= 0:
+        raise ValueError("the plan width must be positive")
+    if digest is None:
+        digest = content_hash(source)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        with warnings.catch_warnings():
+            # Plans are streamed, so exports above Pillow's warning size are expected.
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(source)
+    except Image.DecompressionBombError as e:
+        raise ValueError(f"floor plan image is too large: {e}")
+    with image:
+        if image.format == "JPEG":
+            scale = max(1, int(resolution / (width_m / image.size[0]) / SAMPLES_PER_CELL))
+            image.draft("L", (math.ceil(image.size[0] / scale), math.ceil(image.size[1] / scale)))
+        width, height = image.size
+        metres_per_pixel = width_m / width
+        depth_m = height * metres_per_pixel
+        cols = max(1, math.ceil(width_m / resolution - 1e-9))
+        rows = max(1, math.ceil(depth_m / resolution - 1e-9))
+        col_of = _cell_index(width, metres_per_pixel, resolution, cols)
+        row_of = _cell_index(height, metres_per_pixel, resolution, rows)
+        col_breaks = np.flatnonzero(np.diff(col_of, prepend=-1))
+        ink = np.zeros((rows, cols), dtype=np.float64)
+        for top, grey in _strips(image):
+            darkness = WHITE_LEVEL - np.minimum(grey, WHITE_LEVEL)  # stays uint8
+            per_cell = np.add.reduceat(darkness, col_breaks, axis=1, dtype=np.uint32)
+            strip_rows = row_of[top:top + len(grey)]
+            row_breaks = np.flatnonzero(np.diff(strip_rows, prepend=-1))
+            ink[strip_rows[row_breaks]] += np.add.reduceat(per_cell, row_breaks, axis=0)
+    pixels = np.outer(np.bincount(row_of, minlength=rows), np.bincount(col_of, minlength=cols))
+    thickness = ink / WHITE_LEVEL / np.maximum(pixels, 1) * resolution
+    attenuation = (WALL_LOSS_DB * np.minimum(thickness / WALL_THICKNESS_M, 1.0)).astype(np.float32)
+    return FloorPlan(digest, float(width_m), float(depth_m), resolution, attenuation, _footprint(attenuation))
+
+
+_memory: "OrderedDict[str, FloorPlan]" = OrderedDict()
+
+
+def _evict(directory: str, max_bytes: int) -> None:
+    """Delete the least recently used cached plans until the rest fit in ``max_bytes``."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".npz"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def load_floor_plan(source: Source, width_m: float, resolution: float = RESOLUTION_M,
+                    directory: Optional[str] = DEFAULT_DIR) -> FloorPlan:
+    """``read_floor_plan`` behind the content-hash caches; ``directory=None`` keeps it in memory only."""
+    digest = content_hash(source)
+    key = plan_key(digest, width_m, resolution)
+    plan = _memory.get(key)
+    if plan is not None:
+        _memory.move_to_end(key)
+        return plan
+    path = os.path.join(directory, f"{key}.npz") if directory else None
+    if path is not None and os.path.exists(path):
+        with np.load(path) as stored:
+            plan = FloorPlan(digest, float(width_m), float(stored["depth"]), resolution,
+                             stored["attenuation"], stored["mask"])
+        os.utime(path)  # mtime orders the files for eviction
+    else:
+        plan = read_floor_plan(source, width_m, resolution, digest)
+        if path is not None:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, depth=plan.depth, attenuation=plan.attenuation, mask=plan.mask)
+            os.replace(tmp_path, path)
+            _evict(directory, DISK_CACHE_BYTES)
+    _memory[key] = plan
+    while len(_memory) > MEMORY_CACHE_ENTRIES:
+        _memory.popitem(last=False)
+    return plan
+
+
+def _write_synthetic_plan(path: str, width_px: int, height_px: int, metres_per_pixel: float,
+                          room_m: float = 4.0, wall_m: float = 0.12) -> None:
+    """A grid of ``room_m`` rooms as a binary PGM, written in strips."""
+    room, wall = round(room_m / metres_per_pixel), max(1, round(wall_m / metres_per_pixel))
+    columns = np.full(width_px, 255, dtype=np.uint8)
+    columns[(np.arange(width_px) % room) < wall] = 0
+    columns[-wall:] = 0
+    with open(path, "wb") as f:
+        f.write(f"P5 {width_px} {height_px} 255\n".encode("ascii"))
+        for start in range(0, height_px, 1000):
+            y = np.arange(start, min(start + 1000, height_px))
+            strip = np.tile(columns, (len(y), 1))
+            strip[((y % room) < wall) | (y >= height_px - wall)] = 0
+            f.write(strip.tobytes())
+
+
+def _benchmark() -> None:
+    import resource
+    import tempfile
+    from time import perf_counter
+
+    from wisizer.engine import calculate_aps
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plan.pgm")
+        _write_synthetic_plan(path, 10000, 10000, 0.008)  # 80 m x 80 m at 8 mm per pixel
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = perf_counter()
+        plan = load_floor_plan(path, 80.0, directory=tmp)
+        first_s = perf_counter() - start
+        peak_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024
+        _memory.clear()
+        start = perf_counter()
+        load_floor_plan(path, 80.0, directory=tmp)
+        disk_s = perf_counter() - start
+        start = perf_counter()
+        load_floor_plan(path, 80.0, directory=tmp)
+        memory_s = perf_counter() - start
+    print(f"100 MP plan ({os.path.basename(path)}, 100 MB): {first_s:.2f} s, peak RSS +{peak_mb:.0f} MB; "
+          f"cached: {disk_s * 1000:.0f} ms from disk (hash included), {memory_s * 1000:.0f} ms in memory")
+    print(f"{plan.area:.0f} m² footprint, {plan.wall_loss_db_per_m:.2f} dB/m wall loss "
+          f"(4 m rooms at {WALL_LOSS_DB:g} dB per wall: {2 / math.pi * 2 / 4 * WALL_LOSS_DB:.2f} dB/m expected)")
+    scenario = plan.scenario
+    print(f"  200 users at 3 m: {calculate_aps(plan.area, 200, scenario, 'Wi-Fi 6', 3.0, coverage='rf', floor=plan.grid())[0]} APs "
+          f"(area model {calculate_aps(plan.area, 200, scenario, 'Wi-Fi 6')[0]})")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Closed-loop load generator for the sizing API.
+
+Each connection is a separate process holding one keep-alive connection and
+sending the next request as soon as the previous answer arrives. Sites are
+drawn at random from the app's input ranges. Prints throughput and latency
+percentiles:
+
+    python -m wisizer.api --workers 4 &
+    python -m wisizer.loadgen --connections 4 --requests 20000
+    python -m wisizer.loadgen --batch 5000 --requests 20
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from data.scenarios import SCENARIOS
+
+WIFI_GENERATIONS = ("Wi-Fi 6", "Wi-Fi 6E", "Wi-Fi 7")
+
+
+def random_site(rng: random.Random) -> dict:
+    return {
+        "users": rng.randint(1, 500),
+        "area": round(rng.uniform(40, 1400), 1),
+        "scenario": rng.choice(list(SCENARIOS)),
+        "wifi_generation": rng.choice(WIFI_GENERATIONS),
+    }
+
+
+def _run_connection(url: str, requests: int, batch: int, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    path = "/v1/size/batch" if batch else "/v1/size"
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    for _ in range(requests):
+        payload = {"sites": [random_site(rng) for _ in range(batch)]} if batch else random_site(rng)
+        body = json.dumps(payload).encode("utf-8")
+        start = time.perf_counter()
+        connection.request("POST", path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status} from {path}")
+    connection.close()
+    return latencies
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m wisizer.loadgen", description="Measure sizing API latency.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--connections", type=int, default=4, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=10000, help="requests in total")
+    parser.add_argument("--batch", type=int, default=0, help="sites per batch request (default: single-site requests)")
+    parser.add_argument("--warmup", type=int, default=200, help="requests per connection excluded from the stats")
+    args = parser.parse_args(argv)
+    if args.connections < 1 or args.requests < 1:
+        parser.error("--connections and --requests must be at least 1")
+
+    per_connection = max(1, args.requests // args.connections)
+    warmup = 0 if args.batch else args.warmup
+    with ProcessPoolExecutor(max_workers=args.connections) as pool:
+        start = time.perf_counter()
+        futures = [
+            pool.submit(_run_connection, args.url, per_connection + warmup, args.batch, seed)
+            for seed in range(args.connections)
+        ]
+        results = [future.result()[warmup:] for future in futures]
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    sites = len(latencies) * (args.batch or 1)
+    print(f"{len(latencies)} requests ({sites} sites) over {args.connections} connection(s) "
+          f"in {elapsed:.2f} s: {len(latencies) / elapsed:.0f} req/s, {sites / elapsed:.0f} sites/s")
+    print("latency ms: " + ", ".join(
+        f"p{int(q * 100)} {percentile(latencies, q) * 1000:.2f}" for q in (0.5, 0.9, 0.99)
+    ) + f", max {latencies[-1] * 1000:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Suggested AP positions on a rectangular or polygonal floor.
+
+The count comes from ``calculate_aps``; this module decides where those APs
+go. A cell counts as covered when it is within the service radius of some
+AP, i.e. the distance at which the RF model of ``wisizer.coverage`` falls to
+the target RSSI.
+
+1. Greedy: candidate spots on a coarse sub-grid of the floor are picked one
+   at a time by how many still-uncovered cells they add (lazy evaluation:
+   a candidate's gain can only shrink, so stale gains are re-checked only
+   when they reach the top of the heap). Once everything is covered, the
+   remaining APs go to the candidates farthest from any placed AP.
+2. Local search: each AP tries short moves in eight directions, with the
+   step halving down to the grid resolution. A move is scored only on the
+   cells inside the old and new discs, using per-cell AP counts, so it never
+   touches the rest of the floor.
+
+The local search also runs from the best regular lattice, which is hard to
+beat on plain rectangles, and the better of the two layouts is returned.
+When that layout already covers the whole floor (capacity needs more APs
+than coverage), Lloyd (k-means) steps spread the APs evenly.
+Both steps find the cells around a point through ``SpatialHash``, a uniform
+bucket grid with the service radius as its bucket size.
+
+    python -m wisizer.placement    # layout quality and timing on a 5,000 m² floor
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from wisizer.coverage import (
+    TARGET_RSSI_DBM, FloorGrid, best_lattice, coverage_fraction, nearest_distances_sq, service_radius,
+)
+from wisizer.engine import calculate_aps
+
+CANDIDATE_SPACING = 0.25  # greedy candidates every quarter of the service radius
+MAX_ROUNDS = 50
+LLOYD_ITERATIONS = 20
+
+_MOVES = np.array([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)], dtype=np.float64)
+_MOVES[4:] /= math.sqrt(2)
+
+
+class SpatialHash:
+    """Points bucketed on a uniform grid, stored CSR-style so a query is a few slices."""
+
+    def __init__(self, points: np.ndarray, bucket_size: float):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.bucket_size = bucket_size
+        self.low = self.points.min(axis=0)
+        cells = np.floor((self.points - self.low) / bucket_size).astype(np.int64)
+        self.shape = tuple(cells.max(axis=0) + 1)
+        keys = cells[:, 0] * self.shape[1] + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.starts = np.searchsorted(keys[self.order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def query(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Indices of the points within ``radius`` of (x, y)."""
+        bx0, by0 = np.floor((np.array([x, y]) - radius - self.low) / self.bucket_size).astype(int)
+        bx1, by1 = np.floor((np.array([x, y]) + radius - self.low) / self.bucket_size).astype(int)
+        bx0, by0 = max(bx0, 0), max(by0, 0)
+        bx1, by1 = min(bx1, self.shape[0] - 1), min(by1, self.shape[1] - 1)
+        if bx0 > bx1 or by0 > by1:
+            return np.empty(0, dtype=np.intp)
+        # Buckets of one x column are contiguous, so each column is one slice.
+        slices = [
+            self.order[self.starts[bx * self.shape[1] + by0]:self.starts[bx * self.shape[1] + by1 + 1]]
+            for bx in range(bx0, bx1 + 1)
+        ]
+        candidates = np.concatenate(slices)
+        points = self.points[candidates]
+        inside = (points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2 <= radius * radius
+        return candidates[inside]
+
+
+@dataclass(frozen=True)
+class Placement:
+    positions: np.ndarray  # (count, 2) metres, in the floor's coordinates
+    radius: float  # service radius used, metres
+    coverage: float  # share of cells at or above the target RSSI
+
+    def coordinates(self) -> list:
+        return [(round(float(x), 2), round(float(y), 2)) for x, y in self.positions]
+
+
+def _greedy(grid: FloorGrid, cells: SpatialHash, count: int, radius: float) -> np.ndarray:
+    spacing = max(grid.resolution, radius * CANDIDATE_SPACING)
+    stride = max(1, round(spacing / grid.resolution))
+    rows, cols = np.nonzero(grid.mask)
+    keep = (rows % stride == stride // 2) & (cols % stride == stride // 2)
+    candidates = grid.cells[keep] if keep.any() else grid.cells
+    discs = [cells.query(x, y, radius) for x, y in candidates]
+
+    covered = np.zeros(len(grid.cells), dtype=bool)
+    heap = [(-len(disc), i) for i, disc in enumerate(discs)]
+    heapq.heapify(heap)
+    chosen = []
+    while heap and len(chosen) < count:
+        negative_gain, i = heapq.heappop(heap)
+        gain = int(np.count_nonzero(~covered[discs[i]]))
+        if gain == 0:
+            break
+        if heap and gain < -heap[0][0] and gain != -negative_gain:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        covered[discs[i]] = True
+        chosen.append(i)
+
+    positions = [candidates[i] for i in chosen]
+    if len(positions) < count:
+        # Fully covered: spread the rest (capacity APs) as far apart as possible.
+        nearest = np.full(len(candidates), np.inf)
+        for x, y in positions:
+            np.minimum(nearest, (candidates[:, 0] - x) ** 2 + (candidates[:, 1] - y) ** 2, out=nearest)
+        while len(positions) < count:
+            i = int(np.argmax(nearest)) if positions else len(candidates) // 2
+            positions.append(candidates[i])
+            x, y = candidates[i]
+            np.minimum(nearest, (candidates[:, 0] - x) ** 2 + (candidates[:, 1] - y) ** 2, out=nearest)
+    return np.array(positions, dtype=np.float64)
+
+
+def _refine(grid: FloorGrid, cells: SpatialHash, positions: np.ndarray, radius: float) -> np.ndarray:
+    covers = np.zeros(len(grid.cells), dtype=np.int32)
+    discs = [cells.query(x, y, radius) for x, y in positions]
+    for disc in discs:
+        covers[disc] += 1
+    step = radius / 2
+    rounds = 0
+    while step >= grid.resolution and rounds < MAX_ROUNDS:
+        rounds += 1
+        improved = False
+        for i in range(len(positions)):
+            old = discs[i]
+            covers[old] -= 1  # score moves as if AP i were absent
+            base = np.count_nonzero(covers[old] == 0)
+            best_gain, best_position, best_disc = 0, None, None
+            for dx, dy in _MOVES * step:
+                x, y = positions[i, 0] + dx, positions[i, 1] + dy
+                if not grid.contains(x, y):
+                    continue
+                disc = cells.query(x, y, radius)
+                gain = np.count_nonzero(covers[disc] == 0) - base
+                if gain > best_gain:
+                    best_gain, best_position, best_disc = gain, (x, y), disc
+            if best_position is not None:
+                positions[i] = best_position
+                discs[i] = best_disc
+                improved = True
+            covers[discs[i]] += 1
+        if not improved:
+            step /= 2
+    return positions
+
+
+def _balance(grid: FloorGrid, positions: np.ndarray, iterations: int = LLOYD_ITERATIONS) -> np.ndarray:
+    """Lloyd (k-means) steps over the cells: each AP moves to the centroid of the cells nearest to it."""
+    for _ in range(iterations):
+        _, nearest = nearest_distances_sq(grid.cells, positions.astype(np.float32), return_index=True)
+        counts = np.bincount(nearest, minlength=len(positions))
+        sums = np.column_stack([np.bincount(nearest, weights=grid.cells[:, axis], minlength=len(positions)) for axis in (0, 1)])
+        moved = positions.copy()
+        has_cells = counts > 0
+        moved[has_cells] = sums[has_cells] / counts[has_cells, None]
+        # Centroids of a concave floor can fall outside it; those APs stay put.
+        inside = np.array([grid.contains(x, y) for x, y in moved])
+        moved[~inside] = positions[~inside]
+        if np.allclose(moved, positions, atol=grid.resolution / 10):
+            return moved
+        positions = moved
+    return positions
+
+
+def place_aps(grid: FloorGrid, count: int, ceiling_height: float, scenario_type: str,
+              target_rssi: float = TARGET_RSSI_DBM) -> Placement:
+    """Positions for ``count`` APs on ``grid`` that maximize the cells at ``target_rssi``."""
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    radius = service_radius(ceiling_height, scenario_type, target_rssi)
+    if radius <= 0:
+        raise ValueError(f"APs at {ceiling_height:g} m never reach {target_rssi:g} dBm")
+    cells = SpatialHash(grid.cells, radius)
+    best = None
+    for start in (_greedy(grid, cells, count, radius), best_lattice(grid, count, ceiling_height, scenario_type, target_rssi)[0]):
+        positions = _refine(grid, cells, np.array(start, dtype=np.float64), radius)
+        fraction = coverage_fraction(grid, positions, ceiling_height, scenario_type, target_rssi)
+        if best is None or fraction > best.coverage:
+            best = Placement(positions, radius, fraction)
+    if best.coverage == 1.0 and count > 1:
+        # More APs than coverage needs (capacity): spread them evenly if that keeps full coverage.
+        positions = _balance(grid, best.positions.copy())
+        fraction = coverage_fraction(grid, positions, ceiling_height, scenario_type, target_rssi)
+        if fraction == 1.0:
+            best = Placement(positions, radius, fraction)
+    return best
+
+
+def suggest_positions(users: int, scenario_type: str, wifi_generation: str, ceiling_height: float = 3.0,
+                      area: Optional[float] = None, vertices: Optional[Sequence[Tuple[float, float]]] = None,
+                      coverage: str = "area") -> Placement:
+    """Size the floor with ``calculate_aps`` and place that many APs.
+
+    Give either ``vertices`` (floor outline in metres) or ``area`` (m², laid
+    out as a 1.5:1 rectangle).
+    """
+    if vertices is not None:
+        grid = FloorGrid.polygon(vertices)
+    elif area is not None:
+        grid = FloorGrid.from_area(area)
+    else:
+        raise ValueError("give the floor as area or vertices")
+    count = calculate_aps(grid.area, users, scenario_type, wifi_generation, ceiling_height, coverage=coverage)[0]
+    return place_aps(grid, count, ceiling_height, scenario_type)
+
+
+def _benchmark() -> None:
+    from time import perf_counter
+
+    from wisizer.coverage import required_aps_for_grid
+
+    grid = FloorGrid.rectangle(100, 50)
+    for scenario, ceiling in (("scenario_3", 3.0), ("scenario_2", 5.2)):
+        # Tight counts show the layout quality; 50 APs shows the time bound.
+        tight = required_aps_for_grid(grid, ceiling, scenario) - 2
+        for count in (tight, 50):
+            start = perf_counter()
+            placement = place_aps(grid, count, ceiling, scenario)
+            elapsed = perf_counter() - start
+            _, lattice = best_lattice(grid, count, ceiling, scenario)
+            print(f"{count} APs, 5000 m², {scenario} at {ceiling} m: {elapsed:.2f} s, "
+                  f"coverage {placement.coverage:.1%} (regular lattice {lattice:.1%})")
+    outline = [(0, 0), (80, 0), (80, 30), (30, 30), (30, 70), (0, 70)]
+    start = perf_counter()
+    placement = suggest_positions(300, "scenario_2", "Wi-Fi 6", vertices=outline)
+    print(f"L-shaped {FloorGrid.polygon(outline).area:.0f} m², 300 users: {len(placement.positions)} APs in "
+          f"{perf_counter() - start:.2f} s, coverage {placement.coverage:.1%}")
+
+
+if __name__ == "__main__":
+    _benchmark()
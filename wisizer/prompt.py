@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""AI explanation prompt.
+
+The AP catalog goes into the prompt as a compact per-generation table
+(model, streams, ports, PoE, max users), built once per catalog version,
+instead of the full JSON with datasheet URLs and license SKUs. The static part (role,
+rules, catalog) leads the prompt so the provider's prefix cache can reuse it
+across requests for the same generation.
+
+    python -m wisizer.prompt    # token report, full JSON vs compact table
+"""
+
+import json
+from functools import lru_cache
+from typing import Dict
+
+from wisizer.catalog import current_catalog
+
+
+def _port_config(info: dict) -> str:
+    groups = [
+        f"{group.get('Ports', 0)} x {'/'.join(str(s) for s in group.get('Speed', []))} Gbps"
+        for group in info.get("Port", [])
+    ]
+    return " + ".join(groups) or "N/A"
+
+
+def _catalog_table(models: dict) -> str:
+    standards = sorted({info.get("Wi-Fi Standard", "") for info in models.values()})
+    lines = [
+        f"Available AP models ({', '.join(standards)}):",
+        "Model | Spatial Streams | Ports | PoE Type | Power (W) | Max Users",
+    ]
+    for model, info in models.items():
+        lines.append(
+            f"{model} | {info.get('Spatial Streams')} | {_port_config(info)} | "
+            f"{info.get('PoE Type')} | {info.get('Power')} | {info.get('Max Users')}"
+        )
+    return "\n".join(lines)
+
+
+_INSTRUCTIONS = """You're a Cisco Networking Expert helping to explain a Meraki wireless network to a partner.
+The given scenario is a traditional office environment.
+Follow these instructions strictly to answer:
+Provide a concise, direct, and technical explanation without any conversational language or follow-up questions.
+Don't mention that an certain AP "can support up to XX users" and its capacity (Mbps).
+Don't need to explain the scenario requirements, like "supporting 50 users in a 100 m2 area", the user already knows that.
+Don't present redundant information.
+Use the table below when comparing AP models."""
+
+@lru_cache(maxsize=64)
+def _prompt_prefix(wifi_generation: str, generation_version: str) -> str:
+    models = current_catalog().ap_models[wifi_generation]
+    return f"{_INSTRUCTIONS}\n\n{_catalog_table(models)}"
+
+
+def prompt_prefix(wifi_generation: str) -> str:
+    """Static prompt prefix, identical for every request of that generation and catalog version."""
+    return _prompt_prefix(wifi_generation, current_catalog().generation_versions[wifi_generation])
+
+
+def build_ai_prompt(wifi_generation: str, ap_model: str, switches_needed: int, switch_model: str, switch_type: str, uplink_ports: int, uplink_speed: str, users: int, area: float, recommended_aps: int, total_high_speed_ports: int, unused_ports: int, unused_high_speed_ports: int, total_poebudget: int, unused_power: int) -> str:
+    switch_text = ""
+    if switch_model != "N/A":
+        switch_text = f"""
+To add more context, for the access layer, we're suggesting {switches_needed} unit(s) of switch model {switch_model}. This is a {switch_type} capable model and has {uplink_ports} uplinks ports at {uplink_speed} Gbps.
+- Explain why {switches_needed} unit(s) of switch model {switch_model} was chosen. Mention whether it is an L2 or L3 switch, detail its uplink port configuration (number and speeds), and specify that after applying a 30% growth margin, there are {unused_ports} unused ports and {unused_power} W of unused PoE budget to connect other devices or future growth."""
+    return f"""{prompt_prefix(wifi_generation)}
+
+We're recommending {recommended_aps} APs model {ap_model} to support {users} users in an area of {area} m².
+- Explain why the AP model {ap_model} was selected, mention if it's for a low or high user density, emphasize its hardware features such as spatial streams, port configuration, and PoE type.{switch_text}
+- Finish with a very brief and direct conclusion without being redundant and compare the AP model with an upper or down (if the case) AP model."""
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Not installed, or the encoding file can't be fetched offline.
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens for gpt-4o-mini when tiktoken is usable, else a ~4 chars/token estimate."""
+    encoder = _encoder()
+    if encoder is None:
+        return round(len(text) / 4)
+    return len(encoder.encode(text))
+
+
+def token_report() -> Dict[str, Dict[str, int]]:
+    """Catalog tokens per generation: full JSON dump vs compact table."""
+    return {
+        generation: {
+            "json": count_tokens(json.dumps(models, indent=2)),
+            "table": count_tokens(_catalog_table(models)),
+        }
+        for generation, models in current_catalog().ap_models.items()
+    }
+
+
+if __name__ == "__main__":
+    if _encoder() is None:
+        print("tiktoken unavailable; counts estimated at ~4 characters per token")
+    for generation, counts in token_report().items():
+        saved = 1 - counts["table"] / counts["json"]
+        print(f"{generation}: {counts['json']} -> {counts['table']} catalog tokens ({saved:.0%} fewer)")
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""HTML for the result cards.
+
+A card depends only on the catalog entry, the quantities and the catalog
+version, so each one is built once from a template with the static parts
+(colors, links, row styling) filled in at import and kept in an LRU cache
+keyed by ``(model, qty, catalog_version)``. Reruns reuse the rendered string.
+The version is that of the part of the catalog the card reads (one AP
+generation, the switch catalog), so a catalog reload only invalidates the
+cards it actually changes.
+
+    python -m wisizer.render    # per-rerun render time, uncached vs cached
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+from wisizer.bom import ITEMS as BOM_ITEMS, BomLine, bom_lines
+from wisizer.catalog import SwitchModel, current_catalog
+
+BG_COLOR = "#F4F4F4"
+TEXT_COLOR = "#27AE60"
+
+_CACHE_SIZE = 1024
+
+_CARD = f"""
+    <div style="background-color: {{bg_color}}; padding: 20px; border-radius: 10px; margin-top: 20px">
+        <h2 style="color: {TEXT_COLOR}; text-align: center;">{{title}}</h2>
+        {{content}}
+    </div>
+    """
+
+_AP_TABLE = f"""
+    <table style="width: 100%; border-collapse: collapse;">
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Antenna Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">Omnidirectional Indoor</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Wi-Fi Standard:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{standard}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Spatial Streams:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{streams}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{poe_type}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Port Speed:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{port_speeds}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{sku}}</td>
+      </tr>
+    </table>
+    <div style="text-align: center; margin-top: 20px;">
+        <a href="{{datasheet}}" target="_blank" style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">Datasheet</a>
+        <a href="{{install_guide}}" target="_blank" style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Installation Guide</a>
+    </div>
+    """
+
+_SWITCH_TABLE = f"""
+    <div style="margin-bottom: 20px;">
+      <p style="font-size: 20px; text-align: center;">
+        Based on your AP requirements, you will need <strong>{{quantity}}</strong> {{unit}}.
+      </p>
+    </div>
+    
+    <table style="width: 100%; border-collapse: collapse;">
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Access Ports:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{port_config}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">Uplinks:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{uplink_ports}} x {{uplink_speed}} Gbps</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Type:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{poe_type}}</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">PoE Budget:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{poe_budget}} W</td>
+      </tr>
+      <tr>
+        <td style="font-weight: bold; width: 30%; padding: 10px; text-align: left;">SKU:</td>
+        <td style="width: 70%; padding: 10px; text-align: left;">{{sku}}</td>
+      </tr>
+    </table>
+    <div style="text-align: center; margin-top: 20px;">
+        <a href="{{datasheet}}" target="_blank" 
+           style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">
+           Datasheet
+        </a>
+        <a href="{{install_guide}}" target="_blank" 
+           style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
+           Installation Guide
+        </a>
+    </div>
+    """
+
+_BOM_LINE = """<tr style="text-align:center;">
+<td style="padding: 10px;">{item}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{quantity}</td>
+<td style="padding: 10px; border-left: 1px solid #ccc;">{part_number}</td>
+</tr>"""
+
+_BOM_TABLE = f"""<table style="width: 100%; border-collapse: collapse;">
+<tr style="text-align:center;">
+<th style="padding: 10px;">Item</th>
+<th style="padding: 10px; border-left: 1px solid #ccc;">Quantity</th>
+<th style="padding: 10px; border-left: 1px solid #ccc;">Part Number</th>
+</tr>
+{{lines}}
+</table>
+<div style="text-align: center; margin-top: 10px; margin-bottom: 30px;">
+  <p style="font-size: 0.9rem; color: #555;">
+    *Choose the most appropriate license tier and duration (x = 1, 3, 5, 7, 10 years).<br>
+    <u>Ensure that all hardware is certified and approved for use at your location!</u>
+  </p>
+</div>
+<div style="text-align: center; margin-top: 10px;">
+  <a href="https://documentation.meraki.com/General_Administration/Licensing/Meraki_MR_License_Guide"
+     target="_blank"
+     style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px;
+            text-decoration: none; border-radius: 5px; margin-right: 10px;">
+    AP License Guide
+  </a>
+  <a href="https://documentation.meraki.com/General_Administration/Licensing/Subscription_-_MS_Licensing"
+     target="_blank"
+     style="background-color: {TEXT_COLOR}; color: white; padding: 10px 20px;
+            text-decoration: none; border-radius: 5px; margin-right: 10px;">
+    Switch License Guide
+  </a>
+</div>"""
+
+
+def result_card(title: str, content_html: str, bg_color: str = BG_COLOR) -> str:
+    return _CARD.format(bg_color=bg_color, title=title, content=content_html)
+
+
+def format_port_config(switch: SwitchModel) -> str:
+    return " + ".join(
+        f"{group.ports} x {'/'.join(str(s) for s in group.speeds)} Gbps"
+        for group in switch.access
+        if group.ports is not None and group.speeds
+    )
+
+
+def _bom_line(line: BomLine) -> str:
+    if line.license:
+        part_number = f"{' <i>or</i> '.join(line.part_numbers)}*"
+    else:
+        part_number = line.part_numbers[0] if line.part_numbers else "N/A"
+    return _BOM_LINE.format(item=line.item, quantity=line.quantity, part_number=part_number)
+
+
+def ap_card(wifi_generation: str, ap_model: str) -> str:
+    """Recommended-AP card."""
+    return _ap_card(wifi_generation, ap_model, current_catalog().generation_versions[wifi_generation])
+
+
+def switch_card(family: str, switch_model: str, switches_needed: int) -> str:
+    """Recommended-switch card for ``switches_needed`` units."""
+    return _switch_card(family, switch_model, switches_needed, current_catalog().switch_version)
+
+
+def bom_card(wifi_generation: str, ap_model: str, recommended_aps: int,
+             family: Optional[str] = None, switch_model: Optional[str] = None, switches_needed: int = 0) -> str:
+    """Bill of materials; the switch lines are left out when ``switch_model`` is None."""
+    catalog = current_catalog()
+    return _bom_card(wifi_generation, ap_model, recommended_aps, family, switch_model, switches_needed,
+                     catalog.generation_versions[wifi_generation], catalog.switch_version)
+
+
+def bom_lines_card(lines: List[BomLine]) -> str:
+    """BoM card for prepared lines, e.g. a building's merged BoM. Not cached."""
+    return result_card("Bill of Materials (BoM)", _BOM_TABLE.format(lines="\n".join(_bom_line(line) for line in lines)))
+
+
+# The version arguments are only part of the cache key.
+@lru_cache(maxsize=_CACHE_SIZE)
+def _ap_card(wifi_generation: str, ap_model: str, catalog_version: str) -> str:
+    ap = current_catalog().aps[wifi_generation][ap_model]
+    port_speed_list = [speed for group in ap.ports for speed in group.speeds]
+    speeds_str = "/".join(str(s) for s in port_speed_list) if port_speed_list else "N/A"
+    table = _AP_TABLE.format(
+        standard=ap.standard,
+        streams=ap.spatial_streams,
+        poe_type=ap.poe_type,
+        port_speeds=f"{ap.total_ports} x {speeds_str} Gbps" if speeds_str != "N/A" else "N/A",
+        sku=ap.sku,
+        datasheet=ap.datasheet,
+        install_guide=ap.installation_guide,
+    )
+    return result_card(f"Recommended AP Model: <u>{ap_model}</u>", table)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _switch_card(family: str, switch_model: str, switches_needed: int, catalog_version: str) -> str:
+    switch = current_catalog().switches[family][switch_model]
+    if switch.uplinks:
+        uplink_speed = " / ".join("/".join(str(s) for s in group.speeds) for group in switch.uplinks)
+    else:
+        uplink_speed = "N/A"
+    content = _SWITCH_TABLE.format(
+        quantity=switches_needed,
+        unit="unit" if switches_needed == 1 else "units",
+        port_config=format_port_config(switch),
+        uplink_ports=switch.uplink_ports,
+        uplink_speed=uplink_speed,
+        poe_type=switch.poe_type,
+        poe_budget=switch.poe_budget,
+        sku=switch.sku,
+        datasheet=switch.datasheet,
+        install_guide=switch.installation_guide,
+    )
+    return result_card(f"Recommended Access Switch: <u>{switch_model}</u>", content)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _bom_card(wifi_generation: str, ap_model: str, recommended_aps: int, family: Optional[str],
+              switch_model: Optional[str], switches_needed: int, ap_version: str, switch_version: str) -> str:
+    lines = {line.item: _bom_line(line)
+             for line in bom_lines(wifi_generation, ap_model, recommended_aps, family, switch_model, switches_needed)}
+    rows = "\n".join(lines.get(item, "") for item in BOM_ITEMS)
+    return result_card("Bill of Materials (BoM)", _BOM_TABLE.format(lines=rows))
+
+
+def cache_clear() -> None:
+    for card in (_ap_card, _switch_card, _bom_card):
+        card.cache_clear()
+
+
+def _benchmark(reruns: int = 2000) -> None:
+    from timeit import timeit
+
+    from data.scenarios import SCENARIOS
+    from wisizer.engine import calculate_aps, calculate_switches
+
+    # One typical result page per scenario and generation.
+    pages = []
+    for scenario in SCENARIOS:
+        for generation in current_catalog().aps:
+            aps, ap_model, _, uplink, info = calculate_aps(1500.0, 200, scenario, generation)
+            option, needed, _, _ = calculate_switches(aps, info, uplink)
+            family, switch_model = (option[0], option[1]) if option else (None, None)
+            pages.append((generation, ap_model, aps, family, switch_model, needed or 0))
+
+    def rerun():
+        for generation, ap_model, aps, family, switch_model, needed in pages:
+            ap_card(generation, ap_model)
+            if switch_model is not None:
+                switch_card(family, switch_model, needed)
+            bom_card(generation, ap_model, aps, family, switch_model, needed)
+
+    def uncached():
+        cache_clear()
+        rerun()
+
+    cold = timeit(uncached, number=reruns) / reruns / len(pages)
+    cache_clear()
+    rerun()
+    warm = timeit(rerun, number=reruns) / reruns / len(pages)
+    print(f"{len(pages)} result pages, {reruns} reruns each")
+    print(f"built every rerun: {cold * 1e6:.1f} µs/rerun")
+    print(f"cached:            {warm * 1e6:.1f} µs/rerun ({cold / warm:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Precomputed sizing results for the whole sidebar input domain.
+
+The UI only offers users 1-500 and areas 40-1400 m² in steps of 20 for each
+scenario and Wi-Fi generation, so every answer can be computed offline:
+
+    python -m wisizer.table build    # writes data/tables/*-<catalog version>.npy
+
+Two arrays are written: site results indexed by (generation, scenario, area
+step, users) and switch results indexed by (AP model, AP count). The app
+memory-maps them, so all worker processes share one copy from the page cache
+and a lookup is plain indexing. File names carry the catalog version; a table
+built from other catalogs is simply not found. ``SizingTable.load_or_build``
+builds the missing table on first use (about half a second) and replaces the
+files of older versions, so a deployment needs no build step. Anything off
+the grid (ft inputs, other areas, unknown labels) returns None and the caller
+falls back to the live engine.
+"""
+
+import glob
+import logging
+import os
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from data.scenarios import SCENARIOS
+from wisizer.catalog import Catalog, current_catalog
+from wisizer.engine import calculate_aps, calculate_switches, current_sizing
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tables")
+
+USERS_MIN, USERS_MAX = 1, 500
+AREA_MIN, AREA_MAX, AREA_STEP = 40, 1400, 20
+AREAS = range(AREA_MIN, AREA_MAX + 1, AREA_STEP)
+
+logger = logging.getLogger(__name__)
+
+SITE_DTYPE = np.dtype([
+    ("recommended_aps", "<u2"),
+    ("model_index", "<u2"),
+    ("users_per_ap", "<u2"),
+    ("ap_uplink", "<u4"),
+])
+SWITCH_DTYPE = np.dtype([
+    ("switch_index", "<i2"),  # position in SWITCH_TABLE.options, -1 when nothing fits
+    ("switches_needed", "<u2"),
+    ("unused_ports", "<i4"),
+    ("unused_power", "<f8"),
+])
+
+SCENARIO_KEYS: List[str] = list(SCENARIOS)
+_SCENARIO_CODES = {key: i for i, key in enumerate(SCENARIO_KEYS)}
+
+
+def model_keys(catalog: Catalog) -> List[Tuple[str, str]]:
+    """(generation, model) in catalog order; ``model_index`` values point here."""
+    return [(generation, model) for generation, models in catalog.aps.items() for model in models]
+
+
+def table_paths(directory: str, version: str) -> Tuple[str, str]:
+    return (
+        os.path.join(directory, f"sizing_sites-{version}.npy"),
+        os.path.join(directory, f"sizing_switches-{version}.npy"),
+    )
+
+
+def build_sites(catalog: Catalog) -> np.ndarray:
+    generations = list(catalog.aps)
+    codes = {key: i for i, key in enumerate(model_keys(catalog))}
+    sites = np.zeros((len(generations), len(SCENARIO_KEYS), len(AREAS), USERS_MAX - USERS_MIN + 1), dtype=SITE_DTYPE)
+    for g, generation in enumerate(generations):
+        for s, scenario in enumerate(SCENARIO_KEYS):
+            for a, area in enumerate(AREAS):
+                row = sites[g, s, a]
+                for u, users in enumerate(range(USERS_MIN, USERS_MAX + 1)):
+                    recommended_aps, ap_model, users_per_ap, ap_uplink, _ = calculate_aps(float(area), users, scenario, generation)
+                    row[u] = (recommended_aps, codes[(generation, ap_model)], users_per_ap, ap_uplink)
+    return sites
+
+
+def build_switches(catalog: Catalog, sites: np.ndarray) -> np.ndarray:
+    """Switch results for every AP model up to the largest AP count in ``sites``."""
+    keys = model_keys(catalog)
+    max_aps = int(sites["recommended_aps"].max())
+    switches = np.zeros((len(keys), max_aps + 1), dtype=SWITCH_DTYPE)
+    switches["switch_index"] = -1
+    positions = {option[:2]: i for i, option in enumerate(current_sizing().switch_table.options)}
+    for model_index, (generation, model) in enumerate(keys):
+        ap = catalog.aps[generation][model]
+        for num_aps in range(max_aps + 1):
+            option, needed, unused_ports, unused_power = calculate_switches(num_aps, ap, ap.uplink)
+            if option is not None:
+                switches[model_index, num_aps] = (positions[option[:2]], needed, unused_ports, unused_power)
+    return switches
+
+
+def save(directory: str, version: str, sites: np.ndarray, switches: np.ndarray) -> Tuple[str, str]:
+    """Write both tables for ``version`` atomically and remove those of other versions."""
+    os.makedirs(directory, exist_ok=True)
+    paths = table_paths(directory, version)
+    for path, array in zip(paths, (sites, switches)):
+        # Per-process temporary name: several app processes may build at once.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    for path in glob.glob(os.path.join(directory, "sizing_*-*.npy")):
+        if path not in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return paths
+
+
+def build(directory: str = DEFAULT_DIR) -> Tuple[str, str]:
+    catalog = current_catalog()
+    sites = build_sites(catalog)
+    return save(directory, catalog.version, sites, build_switches(catalog, sites))
+
+
+class SizingTable:
+    """Read-only lookups over the memory-mapped tables of one catalog version."""
+
+    def __init__(self, catalog: Catalog, sites: np.ndarray, switches: np.ndarray):
+        self.catalog = catalog
+        self.sites = sites
+        self.switches = switches
+        self.model_keys = model_keys(catalog)
+        self._generation_codes = {generation: i for i, generation in enumerate(catalog.aps)}
+        self._model_codes = {key: i for i, key in enumerate(self.model_keys)}
+        self._switch_options = current_sizing().switch_table.options
+
+    @classmethod
+    def load(cls, catalog: Optional[Catalog] = None, directory: str = DEFAULT_DIR) -> Optional["SizingTable"]:
+        """Tables for ``catalog`` (default: the current one), or None if they have not been built."""
+        catalog = catalog or current_catalog()
+        sites_path, switches_path = table_paths(directory, catalog.version)
+        try:
+            sites = np.load(sites_path, mmap_mode="r")
+            switches = np.load(switches_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if sites.dtype != SITE_DTYPE or switches.dtype != SWITCH_DTYPE:
+            return None  # written with an older layout; rebuilt by load_or_build
+        return cls(catalog, sites, switches)
+
+    @classmethod
+    def load_or_build(cls, directory: str = DEFAULT_DIR) -> "SizingTable":
+        """Tables for the current catalog, built and saved on first use.
+
+        When ``directory`` is not writable the built table is kept in memory.
+        """
+        catalog = current_catalog()
+        table = cls.load(catalog, directory)
+        if table is not None:
+            return table
+        sites = build_sites(catalog)
+        switches = build_switches(catalog, sites)
+        try:
+            save(directory, catalog.version, sites, switches)
+        except OSError as e:
+            logger.warning("Could not save the sizing table for catalog %s: %s", catalog.version, e)
+            return cls(catalog, sites, switches)
+        return cls.load(catalog, directory) or cls(catalog, sites, switches)
+
+    def aps(self, area: float, users: int, scenario_type: str, wifi_generation: str) -> Optional[tuple]:
+        """``calculate_aps`` result for an on-grid input, else None."""
+        g = self._generation_codes.get(wifi_generation)
+        s = _SCENARIO_CODES.get(scenario_type)
+        step, remainder = divmod(area - AREA_MIN, AREA_STEP)
+        if g is None or s is None or remainder or not 0 <= step < len(AREAS) or not USERS_MIN <= users <= USERS_MAX:
+            return None
+        recommended_aps, model_index, users_per_ap, ap_uplink = self.sites.item(g, s, int(step), int(users) - USERS_MIN)
+        generation, model = self.model_keys[model_index]
+        return recommended_aps, model, users_per_ap, ap_uplink, self.catalog.ap_models[generation][model]
+
+    def switches_for(self, num_aps: int, wifi_generation: str, ap_model: str, ap_uplink: float) -> Optional[tuple]:
+        """``calculate_switches`` result for a catalog AP at its own uplink, else None."""
+        model_index = self._model_codes.get((wifi_generation, ap_model))
+        if model_index is None or not 0 <= num_aps < self.switches.shape[1]:
+            return None
+        # Rows are built at the model's own uplink, which is what calculate_aps reports.
+        if ap_uplink != self.catalog.aps[wifi_generation][ap_model].uplink:
+            return None
+        switch_index, needed, unused_ports, unused_power = self.switches.item(model_index, int(num_aps))
+        if switch_index < 0:
+            return None, None, None, None
+        return self._switch_options[switch_index], needed, unused_ports, unused_power
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["build"]:
+        sys.exit("usage: python -m wisizer.table build")
+    for path in build():
+        print(f"wrote {path} ({os.path.getsize(path) / 1024:.0f} KiB)")